@@ -1,22 +1,70 @@
 from .commitfetch import\
+	AsyncGitHubTransport,\
 	Commit,\
+	CommitStore,\
+	FetchCheckpoint,\
 	GitHubCredRepository,\
+	GitHubTransport,\
 	GitHubUser,\
+	GitHubUserCache,\
 	GitHubUserRepository,\
 	RepoIdentity,\
+	RequestMetrics,\
+	RequestObserver,\
+	ResponseCache,\
+	convert_commit_reprs_to_jsonl,\
+	get_commit,\
+	get_local_repo_commits,\
+	get_multi_repo_commits,\
+	get_repo_commit_page_count,\
 	get_repo_commits,\
+	get_repo_commits_async,\
+	index_commit_reprs,\
 	read_commit_reprs,\
+	read_commit_reprs_parallel,\
+	read_commit_table,\
+	read_commits_jsonl,\
+	read_commits_parquet,\
 	read_github_credentials,\
-	write_commit_reprs
+	read_github_users_jsonl,\
+	read_newest_commit,\
+	write_commit_reprs,\
+	write_commits_jsonl,\
+	write_commits_parquet,\
+	write_github_users_jsonl
 
 __all__ = [
+	AsyncGitHubTransport.__name__,
 	Commit.__name__,
+	CommitStore.__name__,
+	FetchCheckpoint.__name__,
 	GitHubCredRepository.__name__,
+	GitHubTransport.__name__,
 	GitHubUser.__name__,
+	GitHubUserCache.__name__,
 	GitHubUserRepository.__name__,
 	RepoIdentity.__name__,
+	RequestMetrics.__name__,
+	RequestObserver.__name__,
+	ResponseCache.__name__,
+	convert_commit_reprs_to_jsonl.__name__,
+	get_commit.__name__,
+	get_local_repo_commits.__name__,
+	get_multi_repo_commits.__name__,
+	get_repo_commit_page_count.__name__,
 	get_repo_commits.__name__,
+	get_repo_commits_async.__name__,
+	index_commit_reprs.__name__,
 	read_commit_reprs.__name__,
+	read_commit_reprs_parallel.__name__,
+	read_commit_table.__name__,
+	read_commits_jsonl.__name__,
+	read_commits_parquet.__name__,
 	read_github_credentials.__name__,
-	write_commit_reprs.__name__
+	read_github_users_jsonl.__name__,
+	read_newest_commit.__name__,
+	write_commit_reprs.__name__,
+	write_commits_jsonl.__name__,
+	write_commits_parquet.__name__,
+	write_github_users_jsonl.__name__
 ]
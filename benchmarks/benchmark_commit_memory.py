@@ -0,0 +1,112 @@
+"""
+This benchmark measures the memory used by Commit instances. It creates
+commits like get_repo_commits does: every commit is made from its own decoded
+JSON payload, so its strings are not initially shared with the other commits.
+It compares the current Commit class to a replica of its former layout, which
+had an instance dictionary, a RepoIdentity per commit, unshared file paths and
+a datetime moment.
+"""
+
+
+from argparse import\
+	ArgumentParser
+from datetime import\
+	datetime
+import json
+from pathlib import\
+	Path
+import tracemalloc
+
+# syspathmodif is a dependency of repr_rw.
+from syspathmodif import\
+	sp_append,\
+	sp_remove
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+sp_append(_REPO_ROOT)
+from commitfetch import\
+	Commit,\
+	GitHubUser,\
+	GitHubUserRepository
+sp_remove(_REPO_ROOT)
+
+
+_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+_SLASH = "/"
+
+
+class _FormerRepoIdentity:
+
+	def __init__(self, owner, name):
+		self._owner = owner
+		self._name = name
+
+
+class _FormerCommit:
+
+	def __init__(self, sha, message, repository, moment, author, files):
+		self._sha = sha
+		self._message = message
+		self._author = author
+		self._repository = _FormerRepoIdentity(*repository.split(_SLASH))
+		self._moment = datetime.strptime(moment, _DATETIME_FORMAT)
+		self._files = tuple(files)
+
+
+def make_arg_parser():
+	parser = ArgumentParser(description=__doc__)
+	parser.add_argument("-n", "--commit-count", type=int, default=100000,
+		help="The number of commits to create. Defaults to 100000.")
+	parser.add_argument("-f", "--file-count", type=int, default=5,
+		help="The number of files per commit. Defaults to 5.")
+
+	return parser
+
+
+def make_payloads(commit_count, file_count):
+	for i in range(commit_count):
+		yield json.dumps({
+			"sha": f"{i:040x}",
+			"message": f"Commit number {i}",
+			"repository": "owner/repository",
+			"moment": f"2020-01-{i % 28 + 1:02d}T12:{i % 60:02d}:00Z",
+			"files": [f"src/module_{(i + j) % 200}.py"
+				for j in range(file_count)]
+		})
+
+
+def measure_bytes_per_commit(commit_class, payloads):
+	user_repo = GitHubUserRepository()
+	author = GitHubUser(1, "octocat", "The Octocat")
+	user_repo.register_user(author)
+
+	tracemalloc.start()
+	commits = list()
+
+	for payload in payloads:
+		commit_data = json.loads(payload)
+		commits.append(commit_class(commit_data["sha"],
+			commit_data["message"], commit_data["repository"],
+			commit_data["moment"], user_repo.get_user("octocat"),
+			commit_data["files"]))
+
+	allocated_size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	return allocated_size / len(commits)
+
+
+parser = make_arg_parser()
+args = parser.parse_args()
+commit_count = args.commit_count
+file_count = args.file_count
+
+payloads = list(make_payloads(commit_count, file_count))
+
+former_size = measure_bytes_per_commit(_FormerCommit, payloads)
+current_size = measure_bytes_per_commit(Commit, payloads)
+
+print(f"{commit_count} commits with {file_count} files each")
+print(f"Former layout: {former_size:.0f} bytes per commit")
+print(f"Current layout: {current_size:.0f} bytes per commit")
+print(f"Saving: {1 - current_size / former_size:.0%}")
@@ -0,0 +1,124 @@
+"""
+This benchmark measures get_repo_commits against a local mock of the GitHub
+API, which requires no network access. It reports the number of commits
+obtained per second, the number of requests sent per commit and the peak
+memory allocated during the iteration. The latency, the rate limit and the
+size of the synthetic repository are configurable.
+
+The peak memory is measured in a second iteration, because tracing the
+allocations slows down the first one.
+"""
+
+
+from argparse import\
+	ArgumentParser
+import json
+from pathlib import\
+	Path
+from time import\
+	perf_counter
+import tracemalloc
+
+from mock_github_api import\
+	MockGitHubApiServer
+
+# syspathmodif is a dependency of repr_rw.
+from syspathmodif import\
+	sp_append,\
+	sp_remove
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+sp_append(_REPO_ROOT)
+from commitfetch import\
+	GitHubTransport,\
+	get_repo_commits
+sp_remove(_REPO_ROOT)
+
+
+_REPOSITORY = "octocat/benchmark"
+
+
+def make_arg_parser():
+	parser = ArgumentParser(description=__doc__)
+	parser.add_argument("-n", "--commit-count", type=int, default=1000,
+		help="The number of commits in the repository. Defaults to 1000.")
+	parser.add_argument("-f", "--file-count", type=int, default=5,
+		help="The number of files per commit. Defaults to 5.")
+	parser.add_argument("-a", "--author-count", type=int, default=20,
+		help="The number of distinct authors. Defaults to 20.")
+	parser.add_argument("-l", "--latency", type=float, default=0,
+		help="The server's latency in milliseconds. Defaults to 0.")
+	parser.add_argument("-p", "--per-page", type=int, default=100,
+		help="The number of commits per page. Defaults to 100.")
+	parser.add_argument("-w", "--max-workers", type=int, default=1,
+		help="The maximum number of concurrent requests. Defaults to 1.")
+	parser.add_argument("-r", "--rate-limit", type=int, default=None,
+		help="The number of requests allowed per credential in each rate "
+		+ "limit window. Defaults to no limit.")
+	parser.add_argument("-W", "--rate-limit-window", type=float, default=60,
+		help="The duration of the rate limit window in seconds. Defaults to "
+		+ "60.")
+	parser.add_argument("-c", "--credential-count", type=int, default=1,
+		help="The number of credentials. Defaults to 1.")
+	parser.add_argument("--no-files", action="store_true",
+		help="Do not obtain the files changed by the commits.")
+	parser.add_argument("-g", "--graphql", action="store_true",
+		help="List the commits through the GraphQL API.")
+	parser.add_argument("-o", "--output", type=Path, default=None,
+		help="A JSON file where the results will be written.")
+
+	return parser
+
+
+def iterate_commits(api_url, credentials, args):
+	with GitHubTransport(pool_size=max(args.max_workers, 1),
+			api_url=api_url) as transport:
+		commit_count = 0
+
+		for _ in get_repo_commits(_REPOSITORY, credentials, True, transport,
+				max_workers=args.max_workers, per_page=args.per_page,
+				use_graphql=args.graphql, include_files=not args.no_files):
+			commit_count += 1
+
+	return commit_count
+
+
+parser = make_arg_parser()
+args = parser.parse_args()
+
+credentials = [(f"user{i}", f"token{i}")
+	for i in range(args.credential_count)]
+
+with MockGitHubApiServer(commit_count=args.commit_count,
+		files_per_commit=args.file_count, author_count=args.author_count,
+		latency=args.latency / 1000, rate_limit=args.rate_limit,
+		rate_limit_window=args.rate_limit_window)\
+		as server:
+	start = perf_counter()
+	commit_count = iterate_commits(server.api_url, credentials, args)
+	elapsed_time = perf_counter() - start
+	request_counts = server.get_request_counts()
+
+	tracemalloc.start()
+	iterate_commits(server.api_url, credentials, args)
+	_, peak_memory = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+request_count = sum(request_counts.values())
+results = {
+	"commits": commit_count,
+	"seconds": elapsed_time,
+	"commits_per_second": commit_count / elapsed_time,
+	"requests": request_counts,
+	"requests_per_commit": request_count / max(commit_count, 1),
+	"peak_memory_bytes": peak_memory
+}
+
+print(f"{commit_count} commits in {elapsed_time:.2f} s: "
+	+ f"{results['commits_per_second']:.0f} commits/s")
+print(f"Requests: {request_count} "
+	+ f"({results['requests_per_commit']:.3f} per commit) {request_counts}")
+print(f"Peak memory: {peak_memory / 2**20:.1f} MiB")
+
+if args.output is not None:
+	args.output.write_text(json.dumps(results, indent=2))
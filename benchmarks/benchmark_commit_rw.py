@@ -0,0 +1,161 @@
+"""
+This benchmark measures the throughput of the functions that write and read
+commit representations. It writes synthetic commits to a temporary file, with
+and without a SHA index, reads them sequentially and in parallel, and looks up
+random commits by SHA. It reports commits per second and mebibytes per second
+for each operation.
+
+With option --compression, the file is compressed with gzip or Zstandard. The
+throughput is then expressed in uncompressed mebibytes per second, and the
+operations that require a SHA index are not measured.
+"""
+
+
+from argparse import\
+	ArgumentParser
+from datetime import\
+	datetime,\
+	timedelta
+import json
+from pathlib import\
+	Path
+from random import\
+	Random
+from tempfile import\
+	TemporaryDirectory
+from time import\
+	perf_counter
+
+# syspathmodif is a dependency of repr_rw.
+from syspathmodif import\
+	sp_append,\
+	sp_remove
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+sp_append(_REPO_ROOT)
+from commitfetch import\
+	Commit,\
+	GitHubUser,\
+	RepoIdentity,\
+	get_commit,\
+	read_commit_reprs,\
+	read_commit_reprs_parallel,\
+	write_commit_reprs
+sp_remove(_REPO_ROOT)
+
+
+_COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+_FIRST_MOMENT = datetime(2020, 1, 1)
+
+
+def make_arg_parser():
+	parser = ArgumentParser(description=__doc__)
+	parser.add_argument("-n", "--commit-count", type=int, default=100000,
+		help="The number of commits to write. Defaults to 100000.")
+	parser.add_argument("-f", "--file-count", type=int, default=5,
+		help="The number of files per commit. Defaults to 5.")
+	parser.add_argument("-l", "--lookup-count", type=int, default=1000,
+		help="The number of lookups by SHA. Defaults to 1000.")
+	parser.add_argument("-w", "--max-workers", type=int, default=None,
+		help="The number of processes that read in parallel. Defaults to "
+		+ "the number of processors.")
+	parser.add_argument("-c", "--compression", default="none",
+		choices=_COMPRESSION_SUFFIXES.keys(),
+		help="The compression of the file. Defaults to none.")
+	parser.add_argument("-L", "--compression-level", type=int, default=None,
+		help="The compression level. Defaults to the format's default.")
+	parser.add_argument("-o", "--output", type=Path, default=None,
+		help="A JSON file where the results will be written.")
+
+	return parser
+
+
+def make_commits(commit_count, file_count):
+	repository = RepoIdentity.from_full_name("octocat/benchmark")
+	authors = [GitHubUser(i + 1, f"user{i}", f"User {i}") for i in range(20)]
+
+	for i in range(commit_count):
+		yield Commit(f"{i:040x}", f"Commit {i}\n\nSynthetic commit.",
+			repository, _FIRST_MOMENT + timedelta(minutes=i), authors[i % 20],
+			[f"src/package_{i % 10}/module_{j}.py" for j in range(file_count)])
+
+
+def measure(operation, commit_count, byte_count):
+	start = perf_counter()
+	operation()
+	elapsed_time = perf_counter() - start
+
+	return {
+		"seconds": elapsed_time,
+		"commits_per_second": commit_count / elapsed_time,
+		"mib_per_second": byte_count / elapsed_time / 2**20
+	}
+
+
+def read_all(commits):
+	for _ in commits:
+		pass
+
+
+parser = make_arg_parser()
+args = parser.parse_args()
+commit_count = args.commit_count
+lookup_count = args.lookup_count
+
+commits = list(make_commits(commit_count, args.file_count))
+shas = [commit.sha for commit in Random(0).choices(commits, k=lookup_count)]
+results = dict()
+
+is_compressed = args.compression != "none"
+compression_level = args.compression_level
+
+with TemporaryDirectory() as temp_dir:
+	commit_file = Path(temp_dir)\
+		/ ("commits.txt" + _COMPRESSION_SUFFIXES[args.compression])
+	indexed_file = Path(temp_dir) / "indexed_commits.txt"
+
+	write_commit_reprs(indexed_file, commits)
+	file_size = indexed_file.stat().st_size
+	mean_repr_size = file_size / commit_count
+
+	results["write"] = measure(
+		lambda: write_commit_reprs(commit_file, commits,
+			compression_level=compression_level),
+		commit_count, file_size)
+	stored_size = commit_file.stat().st_size
+
+	if not is_compressed:
+		results["write_with_index"] = measure(
+			lambda: write_commit_reprs(indexed_file, commits, True),
+			commit_count, file_size)
+
+	results["read"] = measure(
+		lambda: read_all(read_commit_reprs(commit_file)),
+		commit_count, file_size)
+	results["read_parallel"] = measure(
+		lambda: read_all(read_commit_reprs_parallel(
+			commit_file, args.max_workers)),
+		commit_count, file_size)
+
+	if not is_compressed:
+		results["get_commit"] = measure(
+			lambda: [get_commit(indexed_file, sha) for sha in shas],
+			lookup_count, lookup_count * mean_repr_size)
+
+print(f"{commit_count} commits, {file_size / 2**20:.1f} MiB")
+
+if is_compressed:
+	results["stored_bytes"] = stored_size
+	print(f"{args.compression}: {stored_size / 2**20:.1f} MiB, "
+		+ f"ratio {file_size / stored_size:.1f}")
+
+for operation, result in results.items():
+	if not isinstance(result, dict):
+		continue
+
+	print(f"{operation}: {result['commits_per_second']:.0f} commits/s, "
+		+ f"{result['mib_per_second']:.1f} MiB/s")
+
+if args.output is not None:
+	args.output.write_text(json.dumps(results, indent=2))
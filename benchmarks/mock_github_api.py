@@ -0,0 +1,489 @@
+"""
+This module provides a local stand-in for the GitHub API endpoints that
+commitfetch uses: the commit lists, the commits and the users of the REST API
+and the commit history query of the GraphQL API. It serves synthetic
+repositories of a configurable size, without network access. Any repository
+name is accepted, and all the repositories have the same commits.
+
+The server runs in a separate process so that it does not compete with the
+benchmarked code for the interpreter. It can delay its responses and enforce
+a rate limit per credential like the GitHub API. The REST API and the GraphQL
+API have distinct rate limits. Path /_stats provides the number of requests
+received for each endpoint.
+"""
+
+
+from base64 import\
+	b64decode
+from datetime import\
+	datetime,\
+	timedelta
+from http.server import\
+	BaseHTTPRequestHandler,\
+	ThreadingHTTPServer
+import json
+from multiprocessing import\
+	Process,\
+	Queue
+from threading import\
+	RLock
+from time import\
+	sleep,\
+	time
+from urllib.parse import\
+	parse_qs,\
+	urlsplit
+from urllib.request import\
+	urlopen
+
+
+_ENCODING_UTF8 = "utf-8"
+
+_FIRST_MOMENT = datetime(2020, 1, 1)
+_MOMENT_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Like the GitHub API, a commit response lists at most this number of files.
+_FILES_PER_PAGE = 300
+
+_HOST = "127.0.0.1"
+
+_PATH_GRAPHQL = "/graphql"
+_PATH_STATS = "/_stats"
+
+_REQUEST_KIND_COMMIT = "commit"
+_REQUEST_KIND_COMMIT_LIST = "commit_list"
+_REQUEST_KIND_GRAPHQL = "graphql"
+_REQUEST_KIND_USER = "user"
+
+
+def _make_error_data(message, status):
+	return {
+		"message": message,
+		"documentation_url": "https://docs.github.com/rest",
+		"status": str(status)
+	}
+
+
+def _make_moment(commit_num):
+	return _FIRST_MOMENT + timedelta(minutes=commit_num)
+
+
+class _MockApiHandler(BaseHTTPRequestHandler):
+
+	# Persistent connections like the GitHub API
+	protocol_version = "HTTP/1.1"
+	# The headers and the content are written separately.
+	disable_nagle_algorithm = True
+
+	def do_GET(self):
+		url_parts = urlsplit(self.path)
+		path_parts = url_parts.path.strip("/").split("/")
+		query = {name: values[0]
+			for name, values in parse_qs(url_parts.query).items()}
+		mock_api = self.server.mock_api
+
+		if url_parts.path == _PATH_STATS:
+			self._send_json(200, mock_api.get_request_counts(), None)
+			return
+
+		if len(path_parts) == 4 and path_parts[0] == "repos"\
+				and path_parts[3] == "commits":
+			request_kind = _REQUEST_KIND_COMMIT_LIST
+		elif len(path_parts) == 5 and path_parts[0] == "repos"\
+				and path_parts[3] == "commits":
+			request_kind = _REQUEST_KIND_COMMIT
+		elif len(path_parts) == 2 and path_parts[0] == "users":
+			request_kind = _REQUEST_KIND_USER
+		else:
+			self._send_json(404, _make_error_data("Not Found", 404), None)
+			return
+
+		rate_limit_headers = mock_api.count_request(
+			request_kind, self._get_login())
+
+		if mock_api.latency > 0:
+			sleep(mock_api.latency)
+
+		if rate_limit_headers is None:
+			self._send_json(403,
+				_make_error_data("API rate limit exceeded for user.", 403),
+				mock_api.get_rate_limit_headers(
+					request_kind, self._get_login()))
+			return
+
+		headers = dict(rate_limit_headers)
+
+		if request_kind != _REQUEST_KIND_USER:
+			full_name = path_parts[1] + "/" + path_parts[2]
+
+		if request_kind == _REQUEST_KIND_COMMIT_LIST:
+			data, link = mock_api.make_commit_list(full_name,
+				url_parts.path, int(query.get("per_page", 30)),
+				int(query.get("page", 1)), query.get("since"),
+				query.get("sha"))
+		elif request_kind == _REQUEST_KIND_COMMIT:
+			data, link = mock_api.make_commit(full_name, url_parts.path,
+				path_parts[4], int(query.get("page", 1)))
+		else:
+			data, link = mock_api.make_user(path_parts[1]), None
+
+		if data is None:
+			self._send_json(404, _make_error_data("Not Found", 404), headers)
+			return
+
+		if link is not None:
+			headers["Link"] = link
+
+		self._send_json(200, data, headers)
+
+	def do_POST(self):
+		content = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+		mock_api = self.server.mock_api
+
+		if urlsplit(self.path).path != _PATH_GRAPHQL:
+			self._send_json(404, _make_error_data("Not Found", 404), None)
+			return
+
+		variables = json.loads(content).get("variables", dict())
+		rate_limit_headers = mock_api.count_request(
+			_REQUEST_KIND_GRAPHQL, self._get_login())
+
+		if mock_api.latency > 0:
+			sleep(mock_api.latency)
+
+		# Like the GitHub API, the GraphQL API reports an exceeded rate limit
+		# with status 200.
+		if rate_limit_headers is None:
+			self._send_json(200, {"errors": [{
+					"type": "RATE_LIMITED",
+					"message": "API rate limit exceeded for user."
+				}]},
+				mock_api.get_rate_limit_headers(
+					_REQUEST_KIND_GRAPHQL, self._get_login()))
+			return
+
+		history = mock_api.make_history(variables.get("count", 100),
+			variables.get("after"), variables.get("since"))
+		branch_ref = None if history is None\
+			else {"target": {"history": history}}
+
+		self._send_json(200,
+			{"data": {"repository": {"defaultBranchRef": branch_ref}}},
+			rate_limit_headers)
+
+	def _get_login(self):
+		authorization = self.headers.get("Authorization")
+
+		if authorization is None:
+			return None
+
+		credential = b64decode(authorization.split()[-1]).decode()
+		return credential.split(":")[0]
+
+	def log_message(self, format, *args):
+		# The requests are not logged.
+		pass
+
+	def _send_json(self, status, data, headers):
+		content = json.dumps(data).encode(_ENCODING_UTF8)
+
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(content)))
+
+		if headers is not None:
+			for name, value in headers.items():
+				self.send_header(name, value)
+
+		self.end_headers()
+		self.wfile.write(content)
+
+
+class _MockApi:
+	"""
+	The synthetic data and the request counters of the mock server.
+	"""
+
+	def __init__(self, api_url, commit_count, files_per_commit, patch_size,
+			author_count, latency, rate_limit, rate_limit_window):
+		self.api_url = api_url
+		self.commit_count = commit_count
+		self.files_per_commit = files_per_commit
+		self.patch = "+" * patch_size
+		self.author_count = author_count
+		self.latency = latency
+		self.rate_limit = rate_limit
+		self.rate_limit_window = rate_limit_window
+
+		self._lock = RLock()
+		self._request_counts = {
+			_REQUEST_KIND_COMMIT_LIST: 0,
+			_REQUEST_KIND_COMMIT: 0,
+			_REQUEST_KIND_USER: 0,
+			_REQUEST_KIND_GRAPHQL: 0
+		}
+		# Each API and login are associated with the used requests and the
+		# reset moment.
+		self._rate_limits = dict()
+
+	def count_request(self, request_kind, login):
+		# Returns the rate limit headers, None if the limit is exceeded.
+		with self._lock:
+			self._request_counts[request_kind] += 1
+
+			if self.rate_limit is None:
+				return dict()
+
+			rate_limit_key = (request_kind == _REQUEST_KIND_GRAPHQL, login)
+			used_requests, reset_moment =\
+				self._get_rate_limit(rate_limit_key)
+
+			if used_requests >= self.rate_limit:
+				return None
+
+			self._rate_limits[rate_limit_key] =\
+				(used_requests + 1, reset_moment)
+
+			return self.get_rate_limit_headers(request_kind, login)
+
+	def _get_commit_nums(self, head_sha, since):
+		# Like the GitHub API, the history can start from a given commit.
+		first_num = self.commit_count if head_sha is None\
+			else min(int(head_sha, 16), self.commit_count)
+		commit_nums = range(first_num, 0, -1)
+
+		if since is not None:
+			since = datetime.strptime(since, _MOMENT_FORMAT)
+			commit_nums = [commit_num for commit_num in commit_nums
+				if _make_moment(commit_num) >= since]
+
+		return commit_nums
+
+	def _get_rate_limit(self, rate_limit_key):
+		used_requests, reset_moment =\
+			self._rate_limits.get(rate_limit_key, (0, 0))
+
+		if reset_moment <= time():
+			used_requests = 0
+			reset_moment = int(time() + self.rate_limit_window) + 1
+			self._rate_limits[rate_limit_key] = (used_requests, reset_moment)
+
+		return used_requests, reset_moment
+
+	def get_rate_limit_headers(self, request_kind, login):
+		if self.rate_limit is None:
+			return dict()
+
+		with self._lock:
+			used_requests, reset_moment = self._get_rate_limit(
+				(request_kind == _REQUEST_KIND_GRAPHQL, login))
+
+		return {
+			"X-RateLimit-Remaining": str(self.rate_limit - used_requests),
+			"X-RateLimit-Reset": str(reset_moment)
+		}
+
+	def get_request_counts(self):
+		with self._lock:
+			return dict(self._request_counts)
+
+	def make_commit(self, full_name, path, sha, page_num):
+		commit_num = int(sha, 16)
+
+		if not 1 <= commit_num <= self.commit_count:
+			return None, None
+
+		commit_data = self._make_listed_commit(full_name, commit_num)
+		file_count = self.files_per_commit
+		first_file = (page_num - 1) * _FILES_PER_PAGE
+		last_file = min(first_file + _FILES_PER_PAGE, file_count)
+
+		commit_data["files"] = [{
+			"filename": f"src/package_{commit_num % 10}/module_{i}.py",
+			"status": "modified",
+			"patch": self.patch
+		} for i in range(first_file, last_file)]
+
+		link = None
+		if last_file < file_count:
+			link = f"<{self.api_url}{path}?page={page_num + 1}>; rel=\"next\""
+
+		return commit_data, link
+
+	def make_commit_list(self, full_name, path, per_page, page_num, since,
+			head_sha):
+		commit_nums = self._get_commit_nums(head_sha, since)
+		page_count = (len(commit_nums) + per_page - 1) // per_page
+		first_index = (page_num - 1) * per_page
+		commit_list_data = [self._make_listed_commit(full_name, commit_num)
+			for commit_num in commit_nums[first_index: first_index + per_page]]
+
+		link = None
+		if page_num < page_count:
+			page_url = f"{self.api_url}{path}?per_page={per_page}"
+			link = f"<{page_url}&page={page_num + 1}>; rel=\"next\", "\
+				+ f"<{page_url}&page={page_count}>; rel=\"last\""
+
+		return commit_list_data, link
+
+	def make_history(self, count, cursor, since):
+		# Returns None if the repository is empty. The cursor is the number of
+		# commits on the previous pages.
+		if self.commit_count == 0:
+			return None
+
+		commit_nums = self._get_commit_nums(None, since)
+		first_index = 0 if cursor is None else int(cursor)
+		end_index = min(first_index + count, len(commit_nums))
+
+		return {
+			"pageInfo": {
+				"hasNextPage": end_index < len(commit_nums),
+				"endCursor": str(end_index)
+			},
+			"nodes": [self._make_history_node(commit_num)
+				for commit_num in commit_nums[first_index: end_index]]
+		}
+
+	def _make_history_node(self, commit_num):
+		author_num = commit_num % self.author_count
+		user_data = {"user": {
+			"login": f"user{author_num}",
+			"databaseId": author_num + 1,
+			"name": f"User {author_num}"
+		}}
+
+		return {
+			"oid": f"{commit_num:040x}",
+			"message": f"Commit {commit_num}\n\nSynthetic commit.",
+			"authoredDate": _make_moment(commit_num).strftime(_MOMENT_FORMAT),
+			"author": user_data,
+			"committer": user_data
+		}
+
+	def _make_listed_commit(self, full_name, commit_num):
+		sha = f"{commit_num:040x}"
+		author_num = commit_num % self.author_count
+		user_data = {"login": f"user{author_num}", "id": author_num + 1}
+
+		return {
+			"sha": sha,
+			"url": f"{self.api_url}/repos/{full_name}/commits/{sha}",
+			"commit": {
+				"message": f"Commit {commit_num}\n\nSynthetic commit.",
+				"author": {
+					"name": f"User {author_num}",
+					"email": f"user{author_num}@example.com",
+					"date": _make_moment(commit_num).strftime(_MOMENT_FORMAT)
+				}
+			},
+			"author": user_data,
+			"committer": user_data
+		}
+
+	def make_user(self, login):
+		author_num = int(login[len("user"):])
+		return {
+			"login": login,
+			"id": author_num + 1,
+			"name": f"User {author_num}"
+		}
+
+
+def _serve(settings, port_queue):
+	server = ThreadingHTTPServer((_HOST, 0), _MockApiHandler)
+	server.daemon_threads = True
+	api_url = f"http://{_HOST}:{server.server_port}"
+	server.mock_api = _MockApi(api_url, **settings)
+
+	port_queue.put(server.server_port)
+	server.serve_forever()
+
+
+class MockGitHubApiServer:
+	"""
+	This class starts and stops the mock GitHub API server in a separate
+	process. It can be used as a context manager, which stops the server upon
+	exit. Give property api_url to GitHubTransport to send the requests to
+	the server.
+	"""
+
+	def __init__(self, commit_count=1000, files_per_commit=5, patch_size=200,
+			author_count=20, latency=0, rate_limit=None,
+			rate_limit_window=60):
+		"""
+		The constructor defines the synthetic repositories and the behavior of
+		the server.
+
+		Parameters:
+			commit_count (int): the number of commits per repository.
+				Defaults to 1000.
+			files_per_commit (int): the number of files changed by each
+				commit. Defaults to 5.
+			patch_size (int): the number of characters in each file's patch.
+				Defaults to 200.
+			author_count (int): the number of distinct commit authors.
+				Defaults to 20.
+			latency (float): the number of seconds that the server waits
+				before responding. Defaults to 0.
+			rate_limit (int): the number of requests allowed per credential in
+				each rate limit window of the REST API and of the GraphQL API.
+				Defaults to None, which means no limit.
+			rate_limit_window (float): the number of seconds before the rate
+				limit of a credential is reset. Defaults to 60.
+		"""
+		self._settings = {
+			"commit_count": commit_count,
+			"files_per_commit": files_per_commit,
+			"patch_size": patch_size,
+			"author_count": author_count,
+			"latency": latency,
+			"rate_limit": rate_limit,
+			"rate_limit_window": rate_limit_window
+		}
+		self._process = None
+		self._api_url = None
+
+	def __enter__(self):
+		self.start()
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.stop()
+
+	def get_request_counts(self):
+		"""
+		Provides the number of requests that the server received for each
+		endpoint: commit_list, commit, user and graphql.
+
+		Returns:
+			dict: the request counts (int) by endpoint (str).
+		"""
+		with urlopen(self._api_url + _PATH_STATS) as response:
+			return json.loads(response.read())
+
+	def start(self):
+		"""
+		Starts the server's process and waits until the server is ready.
+		"""
+		port_queue = Queue()
+		self._process = Process(
+			target=_serve, args=(self._settings, port_queue), daemon=True)
+		self._process.start()
+		self._api_url = f"http://{_HOST}:{port_queue.get()}"
+
+	def stop(self):
+		"""
+		Stops the server's process.
+		"""
+		if self._process is not None:
+			self._process.terminate()
+			self._process.join()
+			self._process = None
+
+	@property
+	def api_url(self):
+		"""
+		str: the root URL of the mock API, None if the server is not started.
+		"""
+		return self._api_url
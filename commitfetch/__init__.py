@@ -1,8 +1,22 @@
 from .commit_requests import\
+	get_repo_commit_page_count,\
 	get_repo_commits
+from .commit_requests_async import\
+	get_repo_commits_async
+from .commit_requests_batch import\
+	get_multi_repo_commits
 from .commit_rw import\
+	get_commit,\
+	index_commit_reprs,\
 	read_commit_reprs,\
+	read_newest_commit,\
 	write_commit_reprs
+from .commit_rw_parallel import\
+	read_commit_reprs_parallel
+from .commit_store import\
+	CommitStore
+from .fetch_checkpoint import\
+	FetchCheckpoint
 from .file_io import\
 	read_github_credentials
 from .github_data import\
@@ -11,15 +25,63 @@ from .github_data import\
 	GitHubUser,\
 	GitHubUserRepository,\
 	RepoIdentity
+from .github_transport import\
+	GitHubTransport
+from .github_transport_async import\
+	AsyncGitHubTransport
+from .github_user_cache import\
+	GitHubUserCache
+from .jsonl_rw import\
+	convert_commit_reprs_to_jsonl,\
+	read_commits_jsonl,\
+	read_github_users_jsonl,\
+	write_commits_jsonl,\
+	write_github_users_jsonl
+from .local_repo_commits import\
+	get_local_repo_commits
+from .parquet_rw import\
+	read_commit_table,\
+	read_commits_parquet,\
+	write_commits_parquet
+from .request_metrics import\
+	RequestMetrics
+from .request_observer import\
+	RequestObserver
+from .response_cache import\
+	ResponseCache
 
 __all__ = [
+	AsyncGitHubTransport.__name__,
 	Commit.__name__,
+	CommitStore.__name__,
+	FetchCheckpoint.__name__,
 	GitHubCredRepository.__name__,
+	GitHubTransport.__name__,
 	GitHubUser.__name__,
+	GitHubUserCache.__name__,
 	GitHubUserRepository.__name__,
 	RepoIdentity.__name__,
+	RequestMetrics.__name__,
+	RequestObserver.__name__,
+	ResponseCache.__name__,
+	convert_commit_reprs_to_jsonl.__name__,
+	get_commit.__name__,
+	get_local_repo_commits.__name__,
+	get_multi_repo_commits.__name__,
+	get_repo_commit_page_count.__name__,
 	get_repo_commits.__name__,
+	get_repo_commits_async.__name__,
+	index_commit_reprs.__name__,
 	read_commit_reprs.__name__,
+	read_commit_reprs_parallel.__name__,
+	read_commit_table.__name__,
+	read_commits_jsonl.__name__,
+	read_commits_parquet.__name__,
 	read_github_credentials.__name__,
-	write_commit_reprs.__name__
+	read_github_users_jsonl.__name__,
+	read_newest_commit.__name__,
+	write_commit_reprs.__name__,
+	write_commits_jsonl.__name__,
+	write_commits_parquet.__name__,
+	write_github_users_jsonl.__name__
 ]
@@ -1,9 +1,33 @@
 # __all__ declared at the module's end
 
+from concurrent.futures import\
+	ThreadPoolExecutor
+from datetime import\
+	datetime
 import json
-import requests
+from random import\
+	uniform
 from time import\
-	sleep
+	perf_counter,\
+	sleep,\
+	time
+from urllib.parse import\
+	parse_qs,\
+	quote,\
+	urlsplit
+
+try:
+	import ijson
+except ImportError:
+	# ijson is an optional dependency.
+	ijson = None
+
+from requests.exceptions import\
+	ChunkedEncodingError,\
+	ConnectionError as RequestConnectionError,\
+	Timeout
+from requests.utils import\
+	parse_header_links
 
 from ghae import\
 	GitHubApiError,\
@@ -15,8 +39,32 @@ from .github_data import\
 	GitHubUser,\
 	GitHubUserRepository,\
 	RepoIdentity
+from .github_data.commit import\
+	_datetime_to_str
+from .github_transport import\
+	GitHubTransport
 
 
+_ATTR_FROM_CACHE = "from_cache"
+
+# Another credential is chosen only if it has this many more remaining
+# requests than the current one. Thus, the requests are not spread evenly over
+# the credentials, which would switch credentials after almost every request.
+_CREDENTIAL_SWITCH_MARGIN = 100 # requests
+
+_DOC_URL_REST = "https://docs.github.com/rest"
+
+_HEADER_CONTENT_LENGTH = "Content-Length"
+_HEADER_LINK = "Link"
+_HEADER_RATE_LIMIT_REMAINING = "X-RateLimit-Remaining"
+_HEADER_RATE_LIMIT_RESET = "X-RateLimit-Reset"
+_HEADER_RETRY_AFTER = "Retry-After"
+
+_HTTP_STATUS_OK = 200
+
+_JSON_EVENT_NULL = "null"
+_JSON_EVENT_START_MAP = "start_map"
+
 _KEY_AUTHOR = "author"
 _KEY_COMMIT = "commit"
 _KEY_COMMITTER = "committer"
@@ -30,43 +78,329 @@ _KEY_NAME = "name"
 _KEY_SHA = "sha"
 _KEY_URL = "url"
 
+_LINK_LAST = "last"
+_LINK_NEXT = "next"
+_LINK_REL = "rel"
+_LINK_URL = "url"
+
+_MAX_PER_PAGE = 100
+
+_MIN_SERVER_ERROR_STATUS = 500
+
+_MIN_TRANSPORT_POOL_SIZE = 10
+
+_PARAM_PAGE = "page"
+
 _PATH_COMMITS = "/commits/"
 
-_PATH_REPOS = "https://api.github.com/repos/"
+_PATH_REPOS = "/repos/"
 _PATH_REPOS_LEN = len(_PATH_REPOS)
-_PATH_USERS = "https://api.github.com/users/"
+_PATH_USERS = "/users/"
+
+_PREFIX_FILENAME = "files.item.filename"
 
 _RATE_LIMIT_EXCEEDED = "API rate limit exceeded"
+_REQUEST_KIND_COMMIT = "commit"
+_REQUEST_KIND_COMMIT_LIST = "commit_list"
+_REQUEST_KIND_USER = "user"
+
+# The exceptions that can be raised because of a transient network failure
+_RETRYABLE_ERRORS = (ChunkedEncodingError, RequestConnectionError, Timeout)
+
+_SECONDARY_RATE_LIMIT = "secondary rate limit"
+
+# GitHub recommends waiting at least one minute after exceeding a secondary
+# rate limit if the response does not indicate when to retry.
+_SECONDARY_RATE_LIMIT_WAIT = 60 # seconds
 
 _STATUS_404 = "404"
 
+_STREAM_CHUNK_SIZE = 65536 # bytes
+
+# The commit data fields that a streamed commit response provides, by JSON
+# prefix. Each field is identified by its path in the commit data.
+_STREAMED_FIELDS = {
+	"author.id": (_KEY_AUTHOR, _KEY_ID),
+	"author.login": (_KEY_AUTHOR, _KEY_LOGIN),
+	"commit.author.date": (_KEY_COMMIT, _KEY_AUTHOR, _KEY_DATE),
+	"commit.message": (_KEY_COMMIT, _KEY_MESSAGE),
+	"committer.id": (_KEY_COMMITTER, _KEY_ID),
+	"committer.login": (_KEY_COMMITTER, _KEY_LOGIN),
+	"sha": (_KEY_SHA,),
+	"url": (_KEY_URL,)
+}
+
 _TIME_BEFORE_API_AVAILABLE = 3602 # seconds
 
 _USER_REPO = GitHubUserRepository()
 
 
-def _catch_api_rate_limit_exception(gae, credentials, can_wait):
-	credential = credentials.get_next_credential()
+def _advance_checkpoint(checkpoint, page, commit_index, commit_sha):
+	# The next commit to provide follows the one at commit_index. The engines
+	# call this function after the yield of a commit returns, when the
+	# consumer requests the next commit. Thus, a commit that the consumer did
+	# not finish processing is not recorded.
+	if checkpoint is not None:
+		checkpoint._advance(page, commit_index + 1, commit_sha)
 
-	if credential is None:
-		if can_wait:
-			sleep(_TIME_BEFORE_API_AVAILABLE)
-			credentials.reset_credential_iter()
-			credential = credentials.get_next_credential()
-		else:
+
+def _attach_rate_limit(gae, response):
+	# A rate limit error carries the rate limit indicated by its own response.
+	# The rate limits recorded meanwhile can come from more recent responses.
+	gae._rate_limit = _get_rate_limit(response)
+
+
+def _catch_api_rate_limit_exception(gae, credentials, can_wait, transport):
+	credential = credentials.get_best_credential()
+
+	while credential is None:
+		if not can_wait:
 			raise gae
 
+		wait_time = credentials.get_wait_time()
+
+		if transport.observer is not None:
+			transport.observer.on_rate_limit_wait(wait_time)
+
+		sleep(wait_time)
+		credential = credentials.get_best_credential()
+
 	return credential
 
 
-def _catch_github_api_error(gae, credentials, can_wait):
-	if _RATE_LIMIT_EXCEEDED in gae.message:
-		return _catch_api_rate_limit_exception(gae, credentials, can_wait)
+def _catch_commit_error(error, repository, commit_sha, credential,
+		cred_repo, can_wait, transport, on_commit_error):
+	# Returns the credential for a new attempt, None if the commit is skipped.
+	if isinstance(error, GitHubApiError) and _is_rate_limit_error(error):
+		return _catch_github_api_error(
+			error, credential, cred_repo, can_wait, transport)
+
+	if on_commit_error is None:
+		raise error
+
+	on_commit_error(repository, commit_sha, error)
+	return None
+
+
+def _catch_github_api_error(gae, credential, credentials, can_wait, transport):
+	if _record_rate_limit_error(gae, credential, credentials):
+		return _catch_api_rate_limit_exception(
+			gae, credentials, can_wait, transport)
 
 	else:
 		raise gae
 
 
+def _decode_commit_stream(response):
+	# Only the fields that _make_commit_with_author needs are kept. Thus, the
+	# files' patches, which can be very large, are never all in memory.
+	commit_data = {
+		_KEY_COMMIT: {_KEY_AUTHOR: dict()},
+		_KEY_AUTHOR: None,
+		_KEY_COMMITTER: None,
+		_KEY_FILES: list()
+	}
+
+	json_events = ijson.sendable_list()
+	json_parser = ijson.parse_coro(json_events)
+
+	try:
+		for chunk in response.iter_content(_STREAM_CHUNK_SIZE):
+			json_parser.send(chunk)
+			_store_streamed_fields(json_events, commit_data)
+			json_events.clear()
+
+		json_parser.close()
+		_store_streamed_fields(json_events, commit_data)
+
+	finally:
+		response.close()
+
+	return commit_data
+
+
+def _detect_api_error(url, data, response):
+	try:
+		detect_github_api_error(url, data)
+	except GitHubApiError as gae:
+		_attach_rate_limit(gae, response)
+		raise
+
+
+def _fetch_repo_commits(repository, commit_list_url, last_sha,
+		include_files, cred_repo, can_wait, transport, on_commit_error,
+		checkpoint):
+	credential = cred_repo.credentials[0]
+	pinned_list_url = _pin_commit_list_url(commit_list_url, checkpoint)
+
+	page_num = 1
+	if checkpoint is not None:
+		page_num = checkpoint._get_start_page(page_num)
+
+	# Loop through all the commit pages until the last page.
+	while True:
+		credential = _select_credential(cred_repo, credential, transport)
+
+		try:
+			commit_page_data, has_next_page = _request_commit_page(
+				pinned_list_url, page_num, credential, cred_repo, transport)
+
+		except GitHubApiError as gae:
+			credential = _catch_github_api_error(
+				gae, credential, cred_repo, can_wait, transport)
+			continue
+
+		commit_data_len = len(commit_page_data)
+
+		# Iterate through the list of commits from the page.
+		commit_data_index = 0
+		if checkpoint is not None:
+			commit_data_index = checkpoint._get_start_index(
+				[cd[_KEY_SHA] for cd in commit_page_data])
+			pinned_list_url =\
+				_pin_commit_list_url(commit_list_url, checkpoint)
+
+		while commit_data_index < commit_data_len:
+			commit_data = commit_page_data[commit_data_index]
+
+			if commit_data[_KEY_SHA] == last_sha:
+				# The rest of the history is already known.
+				return
+
+			credential = _select_credential(cred_repo, credential, transport)
+
+			try:
+				commit = _get_listed_commit(commit_data, repository,
+					include_files, credential, cred_repo, transport)
+
+			except Exception as ex:
+				retry_credential = _catch_commit_error(ex, repository,
+					commit_data[_KEY_SHA], credential, cred_repo, can_wait,
+					transport, on_commit_error)
+
+				if retry_credential is not None:
+					credential = retry_credential
+					continue
+
+				_advance_checkpoint(checkpoint, page_num,
+					commit_data_index, commit_data[_KEY_SHA])
+
+			else:
+				yield commit
+				_advance_checkpoint(
+					checkpoint, page_num, commit_data_index, commit.sha)
+
+			commit_data_index += 1
+
+		if not has_next_page:
+			break
+
+		page_num += 1
+
+
+def _fetch_repo_commits_concurrently(repository, commit_list_url, last_sha,
+		include_files, cred_repo, can_wait, transport, on_commit_error,
+		max_workers, checkpoint):
+	executor = ThreadPoolExecutor(max_workers)
+	credential = cred_repo.credentials[0]
+	pinned_list_url = _pin_commit_list_url(commit_list_url, checkpoint)
+
+	# Each request is sent with the credential selected for the previous one
+	# so that the credential is only switched when necessary.
+	def submit_page_request(page_num):
+		nonlocal credential
+		credential = _select_credential(cred_repo, credential, transport)
+		future = executor.submit(_request_commit_page,
+			pinned_list_url, page_num, credential, cred_repo, transport)
+		return future, credential
+
+	def submit_commit_request(commit_data):
+		nonlocal credential
+		credential = _select_credential(cred_repo, credential, transport)
+		future = executor.submit(_get_listed_commit, commit_data,
+			repository, include_files, credential, cred_repo, transport)
+		return future, credential
+
+	try:
+		page_num = 1
+		if checkpoint is not None:
+			page_num = checkpoint._get_start_page(page_num)
+
+		page_request = submit_page_request(page_num)
+
+		# Loop through all the commit pages until the last page.
+		while page_request is not None:
+			page_future, page_credential = page_request
+
+			try:
+				commit_page_data, has_next_page = page_future.result()
+
+			except GitHubApiError as gae:
+				credential = _catch_github_api_error(
+					gae, page_credential, cred_repo, can_wait, transport)
+				page_request = submit_page_request(page_num)
+				continue
+
+			commit_shas = [cd[_KEY_SHA] for cd in commit_page_data]
+
+			# The commits already provided before an interruption are not
+			# requested again.
+			first_index = 0
+			if checkpoint is not None:
+				first_index = checkpoint._get_start_index(commit_shas)
+				pinned_list_url =\
+					_pin_commit_list_url(commit_list_url, checkpoint)
+
+			if last_sha in commit_shas:
+				# The rest of the history is already known.
+				commit_page_data =\
+					commit_page_data[:commit_shas.index(last_sha)]
+				has_next_page = False
+
+			page_request = submit_page_request(page_num + 1)\
+				if has_next_page else None
+
+			commit_requests = [submit_commit_request(commit_data)
+				for commit_data in commit_page_data[first_index:]]
+
+			# Yield the commits in the order of the page.
+			commit_data_index = first_index
+			while commit_data_index < len(commit_page_data):
+				commit_future, commit_credential =\
+					commit_requests[commit_data_index - first_index]
+
+				commit_data = commit_page_data[commit_data_index]
+
+				try:
+					commit = commit_future.result()
+
+				except Exception as ex:
+					retry_credential = _catch_commit_error(ex, repository,
+						commit_data[_KEY_SHA], commit_credential, cred_repo,
+						can_wait, transport, on_commit_error)
+
+					if retry_credential is not None:
+						credential = retry_credential
+						commit_requests[commit_data_index - first_index] =\
+							submit_commit_request(commit_data)
+						continue
+
+					_advance_checkpoint(checkpoint, page_num,
+						commit_data_index, commit_data[_KEY_SHA])
+
+				else:
+					yield commit
+					_advance_checkpoint(
+						checkpoint, page_num, commit_data_index, commit.sha)
+
+				commit_data_index += 1
+
+			page_num += 1
+
+	finally:
+		executor.shutdown(cancel_futures=True)
+
+
 def _get_commit_author_login_and_id(commit_data):
 	author_login = None
 	author_id = None
@@ -85,7 +419,143 @@ def _get_commit_author_login_and_id(commit_data):
 	return author_login, author_id
 
 
-def get_repo_commits(repository, credentials, can_wait):
+def _get_listed_commit(commit_data, repository, include_files,
+		credential, cred_repo, transport):
+	if include_files:
+		return _request_commit(commit_data[_KEY_SHA],
+			repository, credential, cred_repo, transport)
+
+	# The commit list provides all the data but the files.
+	return _make_commit_from_api_data(
+		commit_data, credential, cred_repo, transport)
+
+
+def _get_page_links(response):
+	link_header = response.headers.get(_HEADER_LINK)
+	if link_header is None:
+		return dict()
+
+	return {link.get(_LINK_REL): link.get(_LINK_URL)
+		for link in parse_header_links(link_header)}
+
+
+def _get_page_num_from_url(page_url):
+	query = parse_qs(urlsplit(page_url).query)
+	return int(query[_PARAM_PAGE][0])
+
+
+def _get_rate_limit(response):
+	# Returns the remaining requests and the reset moment indicated by the
+	# response's headers, None if the headers do not indicate them.
+	headers = response.headers
+	retry_after = headers.get(_HEADER_RETRY_AFTER)
+
+	if retry_after is not None:
+		return 0, time() + int(retry_after)
+
+	remaining = headers.get(_HEADER_RATE_LIMIT_REMAINING)
+	reset_moment = headers.get(_HEADER_RATE_LIMIT_RESET)
+
+	if remaining is None or reset_moment is None:
+		return None
+
+	return int(remaining), int(reset_moment)
+
+
+def _get_response_size(response):
+	# The size of the content as transferred, which can be compressed.
+	content_length = response.headers.get(_HEADER_CONTENT_LENGTH)
+
+	if content_length is not None:
+		return int(content_length)
+
+	return len(response.content)
+
+
+def _get_retry_delay(transport, retry_num):
+	# Exponential backoff with full jitter: the delay is random between 0 and
+	# a maximum that doubles for each retry.
+	max_delay = transport.backoff_factor * 2 ** retry_num
+	return uniform(0, min(max_delay, transport.max_backoff))
+
+
+def get_repo_commit_page_count(repository, credentials, can_wait,
+		per_page=_MAX_PER_PAGE, transport=None, since=None):
+	"""
+	Obtains the number of commit pages that get_repo_commits will request from
+	the GitHub API with the same page size. This function sends one request,
+	whose response indicates the last page's number. It allows to size work
+	before iterating through a repository's commits.
+
+	The other parameters have the same meaning as for get_repo_commits.
+
+	Parameters:
+		repository (str): a repository's full name in the format
+			<owner>/<name>.
+		credentials: GitHub credentials.
+		can_wait (bool): allows this function to wait if the GitHub API's
+			request rate limit is exceeded.
+		per_page (int): the number of commits per page, from 1 to 100.
+			Defaults to 100.
+		transport (GitHubTransport): sends the request to the GitHub API.
+			Defaults to None.
+		since (str or datetime.datetime): only the commits committed at or
+			after this moment are counted. If it is a string, it must match
+			format %Y-%m-%dT%H:%M:%SZ. Defaults to None.
+
+	Returns:
+		int: the number of commit pages, 0 if the repository has no commits.
+
+	Raises:
+		GitHubApiError: if an error occurred upon a request to the GitHub API.
+		ValueError: if argument per_page is not between 1 and 100.
+	"""
+	_raise_per_page_value_error(per_page)
+
+	cred_repo = credentials
+	if not isinstance(cred_repo, GitHubCredRepository):
+		cred_repo = GitHubCredRepository(credentials)
+
+	owns_transport = transport is None
+	if owns_transport:
+		transport = GitHubTransport()
+
+	credential = _select_credential(
+		cred_repo, cred_repo.credentials[0], transport)
+	commit_list_url = _make_commit_list_url(
+		transport.api_url, repository, per_page, since)
+	commit_page_url = _make_commit_page_url(commit_list_url, 1)
+
+	try:
+		while True:
+			try:
+				commits_response = _send_request(
+					commit_page_url, _REQUEST_KIND_COMMIT_LIST,
+					credential, cred_repo, transport)
+				commit_page_data = json.loads(commits_response.content)
+				_detect_api_error(
+					commit_page_url, commit_page_data, commits_response)
+				break
+
+			except GitHubApiError as gae:
+				credential = _catch_github_api_error(
+					gae, credential, cred_repo, can_wait, transport)
+
+	finally:
+		if owns_transport:
+			transport.close()
+
+	last_page_url = _get_page_links(commits_response).get(_LINK_LAST)
+	if last_page_url is not None:
+		return _get_page_num_from_url(last_page_url)
+
+	return 1 if len(commit_page_data) > 0 else 0
+
+
+def get_repo_commits(repository, credentials, can_wait, transport=None,
+		max_workers=1, per_page=_MAX_PER_PAGE, since=None, last_sha=None,
+		use_graphql=False, include_files=True, on_commit_error=None,
+		checkpoint=None):
 	"""
 	This generator obtains data about all the commits in a GitHub repository
 	through the GitHub API. Each iteration yields data about one commit.
@@ -98,10 +568,73 @@ def get_repo_commits(repository, credentials, can_wait):
 	is. If it is a generator, a list, a set or a tuple, its content will be
 	used to create a GitHubCredRepository.
 
-	The GitHub API allows 5000 authenticated requests per user per hour. When
-	the request rate limit is exceeded, an error occurs. At that moment, if
-	argument can_wait is False, this generator raises an exception. If can_wait
-	is True, this generator waits for one hour then resumes sending requests.
+	The GitHub API allows 5000 authenticated requests per user per hour. The
+	responses indicate each credential's remaining requests, and this
+	generator switches to the credential that has the most when it has at
+	least 100 more than the current one. When the request rate limit of every
+	credential is exceeded, an error occurs. At that moment, if argument
+	can_wait is False, this generator raises an exception. If can_wait is
+	True, this generator waits until the earliest rate limit reset then
+	resumes sending requests. Secondary rate limits are handled the same way.
+
+	The requests go through a GitHubTransport, which reuses connections from
+	one request to the next. If argument transport is None, this generator
+	makes a transport with the default settings and closes it when the
+	iteration ends. The transport sets the requests' timeout and the number
+	of retries after a connection error, a timeout or a server error (status
+	5xx).
+
+	By default, a commit that cannot be obtained, even after the retries,
+	interrupts the iteration with an exception. If argument on_commit_error is
+	specified, this function is called instead with the repository's name
+	(str), the commit's SHA (str) and the exception, and the commit is
+	skipped. It can record the failed commits to request them later or ignore
+	them. Exceeded rate limits and the failures to obtain a commit list are
+	not passed to this function.
+
+	If argument max_workers is greater than 1, a pool of max_workers threads
+	requests the commits of a page concurrently and prefetches the next page.
+	The commits are still yielded in the order of the pages.
+
+	The commits are listed in pages of per_page commits. This generator follows
+	the pagination links of the responses and stops after the last page.
+
+	Arguments since and last_sha allow to request only the part of the
+	history above a known commit. If since is specified, the GitHub API lists
+	only the commits whose committer date is at or after that moment. If
+	last_sha is specified, this generator stops before the commit that has
+	this SHA, without requesting it or the following pages. Function
+	read_newest_commit provides these values from a file written by
+	write_commit_reprs.
+
+	Both arguments can skip commits added since the known commit. A Commit's
+	property moment is its author date, which can precede its committer
+	date, and a commit from a merged branch or a rebase can be placed below
+	the known commit in the history. An incremental synchronization that
+	must not miss commits should omit last_sha, give since a moment earlier
+	than the known commit's, and deduplicate the commits on their SHA, for
+	instance with CommitStore.
+
+	If argument use_graphql is True, the commits are obtained from the GitHub
+	GraphQL API instead. Each query provides per_page commits of the default
+	branch with their message, moment and author, which spares the requests
+	for the commits' authors. The GraphQL API does not provide the files
+	changed by a commit, so this generator still requests each commit from
+	the REST API to obtain them. The commits are the same as without GraphQL.
+	The GraphQL API's URL is derived from the transport's property api_url.
+
+	If argument include_files is False, the commits are made from the data of
+	the commit lists and their property files is an empty tuple. The
+	commits are then not requested one by one, which reduces the number of
+	requests from about two per commit to one per page, plus one per author
+	unless use_graphql is True. The other properties are the same.
+
+	If argument checkpoint is specified, this generator records in it the
+	position of each commit that it provides or skips, and an iteration
+	given a checkpoint saved by an interrupted one resumes right after the
+	last commit recorded. Function write_commit_reprs saves the checkpoint
+	as it writes the commits. If the checkpoint is complete, this generator
+	yields nothing. See FetchCheckpoint.
 
 	Parameters:
 		repository (str): a repository's full name in the format
@@ -109,55 +642,128 @@ def get_repo_commits(repository, credentials, can_wait):
 		credentials: GitHub credentials.
 		can_wait (bool): allows this generator to wait if the GitHub API's
 			request rate limit is exceeded.
+		transport (GitHubTransport): sends the requests to the GitHub API.
+			Defaults to None.
+		max_workers (int): the maximum number of concurrent requests.
+			Defaults to 1.
+		per_page (int): the number of commits per page, from 1 to 100.
+			Defaults to 100.
+		since (str or datetime.datetime): only the commits committed at or
+			after this moment are obtained. If it is a string, it must match
+			format %Y-%m-%dT%H:%M:%SZ. Defaults to None.
+		last_sha (str): the SHA of the most recent commit already known. This
+			commit and the ones below it in the history are not obtained.
+			Defaults to None.
+		use_graphql (bool): makes this generator use the GitHub GraphQL API.
+			Defaults to False.
+		include_files (bool): determines whether the files changed by the
+			commits are obtained. Defaults to True.
+		on_commit_error (callable): is called with the repository, the SHA
+			and the exception when a commit cannot be obtained. Defaults to
+			None.
+		checkpoint (FetchCheckpoint): records the progress of the iteration.
+			Defaults to None.
 
 	Yields:
 		Commit: data about one commit from the specified repository.
 
 	Raises:
 		GitHubApiError: if an error occurred upon a request to the GitHub API.
+		requests.RequestException: if a request could not be completed.
+		ValueError: if argument max_workers is less than 1, argument
+			per_page is not between 1 and 100 or argument checkpoint does not
+			match the other arguments or the commit history.
 	"""
+	if max_workers < 1:
+		raise ValueError("The number of workers must be at least 1.")
+
+	_raise_per_page_value_error(per_page)
+
+	if checkpoint is not None:
+		checkpoint._begin(repository, per_page, since, last_sha, use_graphql,
+			include_files)
+
+		if checkpoint.is_complete:
+			return
+
 	cred_repo = credentials
 	if not isinstance(cred_repo, GitHubCredRepository):
 		cred_repo = GitHubCredRepository(credentials)
 
-	credential = cred_repo.get_next_credential()
+	owns_transport = transport is None
+	if owns_transport:
+		transport = GitHubTransport(
+			pool_size=max(max_workers, _MIN_TRANSPORT_POOL_SIZE))
 
-	page_num = 1
+	commit_list_url = _make_commit_list_url(
+		transport.api_url, repository, per_page, since)
+
+	try:
+		if use_graphql:
+			# The GraphQL engine imports this module.
+			from .commit_requests_graphql import\
+				_fetch_repo_commits_graphql
+
+			yield from _fetch_repo_commits_graphql(repository, since,
+				last_sha, include_files, cred_repo, can_wait, transport,
+				on_commit_error, max_workers, per_page, checkpoint)
+		elif max_workers == 1:
+			yield from _fetch_repo_commits(repository, commit_list_url,
+				last_sha, include_files, cred_repo, can_wait, transport,
+				on_commit_error, checkpoint)
+		else:
+			yield from _fetch_repo_commits_concurrently(repository,
+				commit_list_url, last_sha, include_files, cred_repo, can_wait,
+				transport, on_commit_error, max_workers, checkpoint)
+
+		if checkpoint is not None:
+			checkpoint._finish()
+
+	finally:
+		if owns_transport:
+			transport.close()
 
-	# Loop through all the commit pages until an empty page is encountered.
-	while True:
-		try:
-			commit_page_data = _request_commit_page(
-				repository, page_num, credential)
 
+def _is_rate_limit_error(gae):
+	return _RATE_LIMIT_EXCEEDED in gae.message\
+		or _SECONDARY_RATE_LIMIT in gae.message
+
+
+def _make_commit_from_api_data(commit_data, credential, cred_repo, transport):
+	author = None
+	author_login, author_id = _get_commit_author_login_and_id(commit_data)
+
+	if author_login is not None:
+		try:
+			author = _request_github_user(
+				author_login, credential, cred_repo, transport)
 		except GitHubApiError as gae:
-			credential = _catch_github_api_error(gae, cred_repo, can_wait)
-			continue
+			if gae.status != _STATUS_404:
+				raise
 
-		commit_data_len = len(commit_page_data)
-		if commit_data_len == 0:
-			# Stop the loop if there are no more commits in the pages.
-			break
+			author = GitHubUser(author_id, author_login, None)
 
-		# Iterate through the list of commits from the page.
-		commit_data_index = 0
-		while commit_data_index < commit_data_len:
-			commit_sha = commit_page_data[commit_data_index][_KEY_SHA]
+	return _make_commit_with_author(commit_data, author)
 
-			try:
-				commit = _request_commit(commit_sha, repository, credential)
-				yield commit
 
-			except GitHubApiError as gae:
-				credential = _catch_github_api_error(gae, cred_repo, can_wait)
-				continue
+def _make_commit_list_url(api_url, repository, per_page, since):
+	commit_list_url = api_url + _PATH_REPOS + repository\
+		+ "/commits?per_page=" + str(per_page)
 
-			commit_data_index += 1
+	if since is not None:
+		if isinstance(since, datetime):
+			since = _datetime_to_str(since)
 
-		page_num += 1
+		commit_list_url += "&since=" + quote(since)
 
+	return commit_list_url
 
-def _make_commit_from_api_data(commit_data, credential):
+
+def _make_commit_page_url(commit_list_url, page_num):
+	return commit_list_url + "&page=" + str(page_num)
+
+
+def _make_commit_with_author(commit_data, author):
 	sha = commit_data[_KEY_SHA]
 
 	api_url = commit_data[_KEY_URL]
@@ -168,19 +774,8 @@ def _make_commit_from_api_data(commit_data, credential):
 	commit_author_struct = commit_struct[_KEY_AUTHOR]
 	moment = commit_author_struct[_KEY_DATE]
 
-	author = None
-	author_login, author_id = _get_commit_author_login_and_id(commit_data)
-
-	if author_login is not None:
-		try:
-			author = _request_github_user(author_login, credential)
-		except GitHubApiError as gae:
-			if gae.status != _STATUS_404:
-				raise
-
-			author = GitHubUser(author_id, author_login, None)
-
-	file_data = commit_data[_KEY_FILES]
+	# The commit lists do not provide the files.
+	file_data = commit_data.get(_KEY_FILES, ())
 	file_generator = (fd[_KEY_FILENAME] for fd in file_data)
 
 	return Commit(sha, message, repo_identity, moment, author, file_generator)
@@ -197,13 +792,75 @@ def _make_github_user_from_api_data(github_user_data):
 	return github_user
 
 
+def _make_server_error(url, status_code, retry_count):
+	return GitHubApiError(
+		f"Server error that persisted after {retry_count} retries",
+		_DOC_URL_REST, str(status_code), url)
+
+
+def _observe_streamed_response(observer, url, response):
+	# The latency excludes the reading of the content. If the content was
+	# streamed, the raw response counts the bytes read from the connection.
+	if response.status_code == _HTTP_STATUS_OK:
+		byte_count = response.raw.tell()
+	else:
+		byte_count = _get_response_size(response)
+
+	observer.on_request(_REQUEST_KIND_COMMIT, url, response.status_code,
+		response.elapsed.total_seconds(), byte_count)
+
+
+def _pin_commit_list_url(commit_list_url, checkpoint):
+	# Once a checkpoint knows the head of the history, the commit lists start
+	# from it so that the commits pushed later do not shift the pages.
+	if checkpoint is None or checkpoint.head_sha is None:
+		return commit_list_url
+
+	return commit_list_url + "&sha=" + checkpoint.head_sha
+
+
+def _raise_per_page_value_error(per_page):
+	if not 1 <= per_page <= _MAX_PER_PAGE:
+		raise ValueError(
+			f"The page size must be between 1 and {_MAX_PER_PAGE}.")
+
+
+def _record_rate_limit_error(gae, credential, cred_repo):
+	if not _is_rate_limit_error(gae):
+		return False
+
+	# The error's response normally indicates that the credential is
+	# exhausted, and _record_rate_limit has recorded it. If it does not, the
+	# credential is set aside for a while. The rate limits recorded since the
+	# error's response was sent are not considered because, with concurrent
+	# requests, they can come from a more recent response.
+	rate_limit = getattr(gae, "_rate_limit", None)
+
+	if rate_limit is None or rate_limit[0] > 0:
+		wait_time = _SECONDARY_RATE_LIMIT_WAIT\
+			if _SECONDARY_RATE_LIMIT in gae.message\
+			else _TIME_BEFORE_API_AVAILABLE
+		cred_repo.update_rate_limit(credential, 0, time() + wait_time)
+
+	return True
+
+
+def _record_rate_limit(response, credential, cred_repo):
+	rate_limit = _get_rate_limit(response)
+
+	if rate_limit is not None:
+		cred_repo.update_rate_limit(credential, *rate_limit)
+
+
 def _repo_from_commit_api_url(url):
-	path_commits_index = url.index(_PATH_COMMITS)
-	repo_full_name =  url[_PATH_REPOS_LEN: path_commits_index]
+	# The API's URL can be followed by a path, like on GitHub Enterprise.
+	path_repos_end = url.index(_PATH_REPOS) + _PATH_REPOS_LEN
+	path_commits_index = url.index(_PATH_COMMITS, path_repos_end)
+	repo_full_name =  url[path_repos_end: path_commits_index]
 	return RepoIdentity.from_full_name(repo_full_name)
 
 
-def _request_commit(commit_sha, repository, credential):
+def _request_commit(commit_sha, repository, credential, cred_repo, transport):
 	"""
 	Requests a commit from the GitHub API. The caller must provide a GitHub
 	credential to authenticate the requests to the GitHub API.
@@ -214,6 +871,9 @@ def _request_commit(commit_sha, repository, credential):
 			<owner>/<name>.
 		credential (tuple): a GitHub credential consisting of a username
 			(str, index 0) and a PAT (str, index 1).
+		cred_repo (GitHubCredRepository): records the credential's rate
+			limit indicated by the response.
+		transport (GitHubTransport): sends the request to the GitHub API.
 	
 	Returns:
 		Commit: an object that contains the wanted commit's data.
@@ -221,14 +881,14 @@ def _request_commit(commit_sha, repository, credential):
 	Raises:
 		GitHubApiError: if the response indicates that an error occurred.
 	"""
-	commit_url = _PATH_REPOS + repository + _PATH_COMMITS + commit_sha
-	commit_response = requests.get(commit_url, auth=credential)
-	commit_data = json.loads(commit_response.content)
-
-	detect_github_api_error(commit_url, commit_data)
+	commit_url = transport.api_url\
+		+ _PATH_REPOS + repository + _PATH_COMMITS + commit_sha
+	commit_data = _request_commit_data(
+		commit_url, credential, cred_repo, transport)
 
 	try:
-		commit = _make_commit_from_api_data(commit_data, credential)
+		commit = _make_commit_from_api_data(
+			commit_data, credential, cred_repo, transport)
 	except Exception as ex:
 		ex.add_note(f"Commit URL: {commit_url}")
 		raise
@@ -236,35 +896,115 @@ def _request_commit(commit_sha, repository, credential):
 	return commit
 
 
-def _request_commit_page(repository, page_num, credential):
+def _request_commit_data(commit_url, credential, cred_repo, transport):
+	"""
+	Requests a commit's data from the GitHub API. A response lists at most
+	300 of the commit's files. This function follows the pagination links to
+	obtain all the files. If library ijson is installed and the transport
+	does not cache the responses, the responses are decoded while they are
+	received, and only the fields used to make a Commit are kept. A request
+	whose connection fails while its response is received is sent again.
+
+	Parameters:
+		commit_url (str): the URL of a commit on the GitHub API.
+		credential (tuple): a GitHub credential consisting of a username
+			(str, index 0) and a PAT (str, index 1).
+		cred_repo (GitHubCredRepository): records the credential's rate
+			limit indicated by the responses.
+		transport (GitHubTransport): sends the requests to the GitHub API.
+
+	Returns:
+		dict: the commit's data, with all its files.
+
+	Raises:
+		GitHubApiError: if a response indicates that an error occurred.
+	"""
+	can_stream = ijson is not None and transport.cache is None
+	commit_data = None
+	page_url = commit_url
+
+	while page_url is not None:
+		response, page_data = _request_commit_data_page(
+			page_url, credential, cred_repo, transport, can_stream)
+
+		if can_stream and transport.observer is not None:
+			_observe_streamed_response(transport.observer, page_url, response)
+
+		_detect_api_error(page_url, page_data, response)
+
+		if commit_data is None:
+			commit_data = page_data
+		else:
+			commit_data[_KEY_FILES].extend(page_data[_KEY_FILES])
+
+		page_url = _get_page_links(response).get(_LINK_NEXT)
+
+	return commit_data
+
+
+def _request_commit_data_page(
+		page_url, credential, cred_repo, transport, stream):
+	# A streamed response is decoded by the retried function so that a
+	# connection failure during the reception of the content causes a retry.
+	page_data = None
+
+	def send():
+		nonlocal page_data
+		# The data of a commit identified by its SHA never changes.
+		response = transport.get(
+			page_url, credential, is_immutable=True, stream=stream)
+
+		if stream and response.status_code == _HTTP_STATUS_OK:
+			page_data = _decode_commit_stream(response)
+
+		return response
+
+	response = _send_with_retries(
+		send, _REQUEST_KIND_COMMIT, page_url, transport, stream)
+	_record_rate_limit(response, credential, cred_repo)
+
+	if page_data is None:
+		page_data = json.loads(response.content)
+
+	return response, page_data
+
+
+def _request_commit_page(
+		commit_list_url, page_num, credential, cred_repo, transport):
 	"""
 	Requests a page of commit data from the GitHub API. The caller must provide
-	a GitHub credential to authenticate the requests to the GitHub API.
+	a GitHub credential to authenticate the requests to the GitHub API. The
+	pagination links of the response indicate whether a next page exists.
 
 	Parameters:
-		repository (str): a GitHub repository name in the format
-			<owner>/<name>.
+		commit_list_url (str): the URL of a repository's commit list. Its
+			query string sets the page size and can filter the commits.
 		page_num (int): the number of a commit page on the GitHub API, >= 1.
 		credential (tuple): a GitHub credential consisting of a username
 			(str, index 0) and a PAT (str, index 1).
+		cred_repo (GitHubCredRepository): records the credential's rate
+			limit indicated by the response.
+		transport (GitHubTransport): sends the request to the GitHub API.
 
 	Returns:
-		list: the data of the commits from the wanted page.
+		tuple: the data of the commits from the wanted page (list, index 0)
+			and True if there is a next page, False otherwise (bool, index 1).
 
 	Raises:
 		GitHubApiError: if the response indicates that an error occurred.
 	"""
-	commit_page_url = _PATH_REPOS + repository\
-		+ '/commits?page=' + str(page_num)
-	commits_response = requests.get(commit_page_url, auth=credential)
+	commit_page_url = _make_commit_page_url(commit_list_url, page_num)
+	commits_response = _send_request(commit_page_url,
+		_REQUEST_KIND_COMMIT_LIST, credential, cred_repo, transport)
 	commit_page_data = json.loads(commits_response.content)
 
-	detect_github_api_error(commit_page_url, commit_page_data)
+	_detect_api_error(commit_page_url, commit_page_data, commits_response)
 
-	return commit_page_data
+	has_next_page = _LINK_NEXT in _get_page_links(commits_response)
+	return commit_page_data, has_next_page
 
 
-def _request_github_user(user_login, credential):
+def _request_github_user(user_login, credential, cred_repo, transport):
 	"""
 	Request data about a GitHub user from the GitHub API. The caller must
 	provide a GitHub credential to authenticate the requests to the GitHub API.
@@ -274,6 +1014,9 @@ def _request_github_user(user_login, credential):
 			property GitHubUser.login.
 		credential (tuple): a GitHub credential consisting of a username
 			(str, index 0) and a PAT (str, index 1).
+		cred_repo (GitHubCredRepository): records the credential's rate
+			limit indicated by the response.
+		transport (GitHubTransport): sends the request to the GitHub API.
 
 	Returns:
 		GitHubUser: data about the specified GitHub user.
@@ -282,15 +1025,20 @@ def _request_github_user(user_login, credential):
 		GitHubApiError: if the response indicates that an error occurred.
 	"""
 	github_user = _USER_REPO.get_user(user_login)
+
+	if transport.observer is not None:
+		transport.observer.on_user_lookup(user_login, github_user is not None)
+
 	if github_user is not None:
 		return github_user
 
-	user_url = _PATH_USERS + user_login
-	user_response = requests.get(user_url, auth=credential)
+	user_url = transport.api_url + _PATH_USERS + user_login
+	user_response = _send_request(
+		user_url, _REQUEST_KIND_USER, credential, cred_repo, transport)
 	github_user_data = json.loads(user_response.content)
 
 	try:
-		detect_github_api_error(user_url, github_user_data)
+		_detect_api_error(user_url, github_user_data, user_response)
 	except Exception as ex:
 		ex.add_note(f"User URL: {user_url}")
 		raise
@@ -299,4 +1047,129 @@ def _request_github_user(user_login, credential):
 	return github_user
 
 
-__all__ = [get_repo_commits.__name__]
+def _select_credential(cred_repo, credential, transport):
+	# If no credential has remaining requests, keep the current credential. The
+	# rate limit error will make the caller wait.
+	best_credential = cred_repo.get_best_credential()
+
+	if best_credential is None or best_credential == credential:
+		return credential
+
+	remaining = cred_repo.get_remaining_requests(credential)
+	if remaining > 0 and remaining + _CREDENTIAL_SWITCH_MARGIN\
+			> cred_repo.get_remaining_requests(best_credential):
+		return credential
+
+	if transport.observer is not None:
+		transport.observer.on_credential_switch(best_credential[0])
+
+	return best_credential
+
+
+def _send_request(url, request_kind, credential, cred_repo, transport):
+	response = _send_with_retries(lambda: transport.get(url, credential),
+		request_kind, url, transport)
+	_record_rate_limit(response, credential, cred_repo)
+	return response
+
+
+def _send_with_retries(send, request_kind, url, transport, stream=False):
+	"""
+	Sends a request by calling a function and sends it again if it fails
+	because of a connection error, a timeout or a server error (status 5xx).
+	The transport sets the maximum number of retries and the backoff before
+	each retry. The transport's observer is notified of each response and
+	each retry, but a streamed response that does not have a 5xx status is
+	left for the caller to observe. A response that the transport took from
+	its cache without sending a request is reported as a cache hit.
+
+	Parameters:
+		send (callable): sends the request and returns the response.
+		request_kind (str): the kind of request reported to the observer.
+		url (str): the requested URL.
+		transport (GitHubTransport): provides the retry settings and the
+			observer.
+		stream (bool): indicates that the response's content is streamed.
+			Defaults to False.
+
+	Returns:
+		requests.Response: the first response that does not have a 5xx
+			status.
+
+	Raises:
+		GitHubApiError: if the response still has a 5xx status after the
+			last retry.
+		requests.RequestException: if the request could not be completed.
+	"""
+	observer = transport.observer
+	retry_num = 0
+
+	while True:
+		start = perf_counter()
+
+		try:
+			response = send()
+
+		except _RETRYABLE_ERRORS:
+			if retry_num >= transport.max_retries:
+				raise
+
+		else:
+			is_server_error =\
+				response.status_code >= _MIN_SERVER_ERROR_STATUS
+
+			if observer is not None:
+				if getattr(response, _ATTR_FROM_CACHE, False):
+					observer.on_cache_hit(request_kind, url)
+
+				elif is_server_error or not stream:
+					observer.on_request(request_kind, url,
+						response.status_code, perf_counter() - start,
+						_get_response_size(response))
+
+			if not is_server_error:
+				return response
+
+			response.close()
+
+			if retry_num >= transport.max_retries:
+				raise _make_server_error(url, response.status_code, retry_num)
+
+		delay = _get_retry_delay(transport, retry_num)
+		retry_num += 1
+
+		if observer is not None:
+			observer.on_retry(request_kind, url, retry_num, delay)
+
+		sleep(delay)
+
+
+def _store_streamed_fields(json_events, commit_data):
+	for prefix, event, value in json_events:
+		if prefix == _PREFIX_FILENAME:
+			commit_data[_KEY_FILES].append({_KEY_FILENAME: value})
+			continue
+
+		if prefix in (_KEY_AUTHOR, _KEY_COMMITTER):
+			if event == _JSON_EVENT_START_MAP:
+				commit_data[prefix] = dict()
+			elif event == _JSON_EVENT_NULL:
+				commit_data[prefix] = None
+
+			continue
+
+		field_path = _STREAMED_FIELDS.get(prefix)
+
+		if field_path is not None:
+			field_parent = commit_data
+
+			for key in field_path[:-1]:
+				field_parent = field_parent[key]
+
+			field_parent[field_path[-1]] = value
+
+
+__all__ = [
+	get_repo_commit_page_count.__name__,
+	get_repo_commits.__name__
+]
@@ -0,0 +1,385 @@
+# __all__ declared at the module's end
+
+import asyncio
+import json
+from time import\
+	perf_counter
+
+try:
+	import aiohttp
+except ImportError:
+	# aiohttp is an optional dependency.
+	aiohttp = None
+
+from ghae import\
+	GitHubApiError
+
+from .commit_requests import\
+	_KEY_FILES,\
+	_KEY_SHA,\
+	_LINK_NEXT,\
+	_MAX_PER_PAGE,\
+	_MIN_SERVER_ERROR_STATUS,\
+	_PATH_COMMITS,\
+	_PATH_REPOS,\
+	_PATH_USERS,\
+	_REQUEST_KIND_COMMIT,\
+	_REQUEST_KIND_COMMIT_LIST,\
+	_REQUEST_KIND_USER,\
+	_STATUS_404,\
+	_USER_REPO,\
+	_detect_api_error,\
+	_get_commit_author_login_and_id,\
+	_get_page_links,\
+	_get_response_size,\
+	_get_retry_delay,\
+	_is_rate_limit_error,\
+	_make_commit_list_url,\
+	_make_commit_page_url,\
+	_make_commit_with_author,\
+	_make_github_user_from_api_data,\
+	_make_server_error,\
+	_raise_per_page_value_error,\
+	_record_rate_limit,\
+	_record_rate_limit_error,\
+	_select_credential
+from .github_data import\
+	GitHubCredRepository,\
+	GitHubUser
+from .github_transport_async import\
+	AsyncGitHubTransport
+
+
+# The exceptions that can be raised because of a transient network failure
+_RETRYABLE_ERRORS = (asyncio.TimeoutError,) if aiohttp is None\
+	else (asyncio.TimeoutError, aiohttp.ClientConnectionError,
+		aiohttp.ClientPayloadError)
+
+
+async def _catch_commit_error(error, repository, commit_sha, credential,
+		cred_repo, can_wait, transport, on_commit_error):
+	# Returns the credential for a new attempt, None if the commit is skipped.
+	if isinstance(error, GitHubApiError) and _is_rate_limit_error(error):
+		return await _catch_github_api_error(
+			error, credential, cred_repo, can_wait, transport)
+
+	if on_commit_error is None:
+		raise error
+
+	on_commit_error(repository, commit_sha, error)
+	return None
+
+
+async def _catch_github_api_error(
+		gae, credential, credentials, can_wait, transport):
+	if not _record_rate_limit_error(gae, credential, credentials):
+		raise gae
+
+	credential = credentials.get_best_credential()
+
+	while credential is None:
+		if not can_wait:
+			raise gae
+
+		wait_time = credentials.get_wait_time()
+
+		if transport.observer is not None:
+			transport.observer.on_rate_limit_wait(wait_time)
+
+		await asyncio.sleep(wait_time)
+		credential = credentials.get_best_credential()
+
+	return credential
+
+
+async def get_repo_commits_async(repository, credentials, can_wait,
+		transport=None, per_page=_MAX_PER_PAGE, since=None, last_sha=None,
+		include_files=True, on_commit_error=None):
+	"""
+	This asynchronous generator is the counterpart of get_repo_commits for
+	asyncio. It obtains data about all the commits in a GitHub repository
+	through the GitHub API. Each iteration yields data about one commit.
+
+	The commits of a page are requested concurrently while the next page is
+	prefetched. They are still yielded in the order of the pages. The
+	concurrency is bounded by the transport, which can be shared by many
+	iterations in the same event loop. If argument transport is None, this
+	generator makes a transport with the default settings and closes it when
+	the iteration ends.
+
+	The credentials and arguments can_wait, per_page, since, last_sha,
+	include_files and on_commit_error have the same meaning as for
+	get_repo_commits. Waiting for a rate limit reset or before a retry does
+	not block the event loop.
+
+	Parameters:
+		repository (str): a repository's full name in the format
+			<owner>/<name>.
+		credentials: GitHub credentials.
+		can_wait (bool): allows this generator to wait if the GitHub API's
+			request rate limit is exceeded.
+		transport (AsyncGitHubTransport): sends the requests to the GitHub
+			API. Defaults to None.
+		per_page (int): the number of commits per page, from 1 to 100.
+			Defaults to 100.
+		since (str or datetime.datetime): only the commits committed at or
+			after this moment are obtained. Defaults to None.
+		last_sha (str): the SHA of the most recent commit already known. This
+			commit and the ones below it in the history are not obtained.
+			Defaults to None.
+		include_files (bool): determines whether the files changed by the
+			commits are obtained. Defaults to True.
+		on_commit_error (callable): is called with the repository, the SHA
+			and the exception when a commit cannot be obtained. Defaults to
+			None.
+
+	Yields:
+		Commit: data about one commit from the specified repository.
+
+	Raises:
+		aiohttp.ClientError: if a request could not be completed.
+		GitHubApiError: if an error occurred upon a request to the GitHub API.
+		ImportError: if argument transport is None and aiohttp is not
+			installed.
+		ValueError: if argument per_page is not between 1 and 100.
+	"""
+	_raise_per_page_value_error(per_page)
+
+	cred_repo = credentials
+	if not isinstance(cred_repo, GitHubCredRepository):
+		cred_repo = GitHubCredRepository(credentials)
+
+	owns_transport = transport is None
+	if owns_transport:
+		transport = AsyncGitHubTransport()
+
+	commit_list_url = _make_commit_list_url(
+		transport.api_url, repository, per_page, since)
+	pending_tasks = list()
+	credential = cred_repo.credentials[0]
+
+	def create_task(coroutine, credential):
+		task = asyncio.ensure_future(coroutine)
+		pending_tasks.append(task)
+		return task, credential
+
+	# Each request is sent with the credential selected for the previous one
+	# so that the credential is only switched when necessary.
+	def create_page_task(page_num):
+		nonlocal credential
+		credential = _select_credential(cred_repo, credential, transport)
+		return create_task(_request_commit_page(commit_list_url,
+			page_num, credential, cred_repo, transport), credential)
+
+	def create_commit_task(commit_data):
+		nonlocal credential
+		credential = _select_credential(cred_repo, credential, transport)
+
+		if include_files:
+			coroutine = _request_commit(commit_data[_KEY_SHA],
+				repository, credential, cred_repo, transport)
+		else:
+			# The commit list provides all the data but the files.
+			coroutine = _make_commit_from_api_data(
+				commit_data, credential, cred_repo, transport)
+
+		return create_task(coroutine, credential)
+
+	try:
+		page_num = 1
+		page_task = create_page_task(page_num)
+
+		# Loop through all the commit pages until the last page.
+		while page_task is not None:
+			page_future, page_credential = page_task
+
+			try:
+				commit_page_data, has_next_page = await page_future
+
+			except GitHubApiError as gae:
+				credential = await _catch_github_api_error(
+					gae, page_credential, cred_repo, can_wait, transport)
+				page_task = create_page_task(page_num)
+				continue
+
+			commit_shas = [cd[_KEY_SHA] for cd in commit_page_data]
+
+			if last_sha in commit_shas:
+				# The rest of the history is already known.
+				commit_page_data =\
+					commit_page_data[:commit_shas.index(last_sha)]
+				has_next_page = False
+
+			page_task = create_page_task(page_num + 1)\
+				if has_next_page else None
+
+			commit_tasks = [create_commit_task(commit_data)
+				for commit_data in commit_page_data]
+
+			# Yield the commits in the order of the page.
+			commit_data_index = 0
+			while commit_data_index < len(commit_tasks):
+				commit_future, commit_credential =\
+					commit_tasks[commit_data_index]
+
+				commit_data = commit_page_data[commit_data_index]
+
+				try:
+					commit = await commit_future
+
+				except Exception as ex:
+					retry_credential = await _catch_commit_error(ex,
+						repository, commit_data[_KEY_SHA], commit_credential,
+						cred_repo, can_wait, transport, on_commit_error)
+
+					if retry_credential is not None:
+						credential = retry_credential
+						commit_tasks[commit_data_index] =\
+							create_commit_task(commit_data)
+						continue
+
+				else:
+					yield commit
+
+				commit_data_index += 1
+
+			page_num += 1
+			pending_tasks = [task for task in pending_tasks if not task.done()]
+
+	finally:
+		for task in pending_tasks:
+			task.cancel()
+
+		if len(pending_tasks) > 0:
+			await asyncio.gather(*pending_tasks, return_exceptions=True)
+
+		if owns_transport:
+			await transport.close()
+
+
+async def _make_commit_from_api_data(
+		commit_data, credential, cred_repo, transport):
+	author = None
+	author_login, author_id = _get_commit_author_login_and_id(commit_data)
+
+	if author_login is not None:
+		try:
+			author = await _request_github_user(
+				author_login, credential, cred_repo, transport)
+		except GitHubApiError as gae:
+			if gae.status != _STATUS_404:
+				raise
+
+			author = GitHubUser(author_id, author_login, None)
+
+	return _make_commit_with_author(commit_data, author)
+
+
+async def _request_commit(
+		commit_sha, repository, credential, cred_repo, transport):
+	commit_url = transport.api_url\
+		+ _PATH_REPOS + repository + _PATH_COMMITS + commit_sha
+	commit_response = await _send_request(commit_url,
+		_REQUEST_KIND_COMMIT, credential, cred_repo, transport)
+	commit_data = json.loads(commit_response.content)
+
+	_detect_api_error(commit_url, commit_data, commit_response)
+
+	# A response lists at most 300 of the commit's files. The pagination
+	# links lead to the other files.
+	file_page_url = _get_page_links(commit_response).get(_LINK_NEXT)
+
+	while file_page_url is not None:
+		file_page_response = await _send_request(file_page_url,
+			_REQUEST_KIND_COMMIT, credential, cred_repo, transport)
+		file_page_data = json.loads(file_page_response.content)
+
+		_detect_api_error(file_page_url, file_page_data, file_page_response)
+
+		commit_data[_KEY_FILES].extend(file_page_data[_KEY_FILES])
+		file_page_url = _get_page_links(file_page_response).get(_LINK_NEXT)
+
+	try:
+		commit = await _make_commit_from_api_data(
+			commit_data, credential, cred_repo, transport)
+	except Exception as ex:
+		ex.add_note(f"Commit URL: {commit_url}")
+		raise
+
+	return commit
+
+
+async def _request_commit_page(
+		commit_list_url, page_num, credential, cred_repo, transport):
+	commit_page_url = _make_commit_page_url(commit_list_url, page_num)
+	commits_response = await _send_request(commit_page_url,
+		_REQUEST_KIND_COMMIT_LIST, credential, cred_repo, transport)
+	commit_page_data = json.loads(commits_response.content)
+
+	_detect_api_error(commit_page_url, commit_page_data, commits_response)
+
+	has_next_page = _LINK_NEXT in _get_page_links(commits_response)
+	return commit_page_data, has_next_page
+
+
+async def _request_github_user(user_login, credential, cred_repo, transport):
+	github_user = _USER_REPO.get_user(user_login)
+
+	if transport.observer is not None:
+		transport.observer.on_user_lookup(user_login, github_user is not None)
+
+	if github_user is not None:
+		return github_user
+
+	user_url = transport.api_url + _PATH_USERS + user_login
+	user_response = await _send_request(
+		user_url, _REQUEST_KIND_USER, credential, cred_repo, transport)
+	github_user_data = json.loads(user_response.content)
+
+	try:
+		_detect_api_error(user_url, github_user_data, user_response)
+	except Exception as ex:
+		ex.add_note(f"User URL: {user_url}")
+		raise
+
+	github_user = _make_github_user_from_api_data(github_user_data)
+	return github_user
+
+
+async def _send_request(url, request_kind, credential, cred_repo, transport):
+	# The counterpart of commit_requests._send_with_retries
+	observer = transport.observer
+	retry_num = 0
+
+	while True:
+		start = perf_counter()
+
+		try:
+			response = await transport.get(url, credential)
+
+		except _RETRYABLE_ERRORS:
+			if retry_num >= transport.max_retries:
+				raise
+
+		else:
+			if observer is not None:
+				observer.on_request(request_kind, url, response.status_code,
+					perf_counter() - start, _get_response_size(response))
+
+			if response.status_code < _MIN_SERVER_ERROR_STATUS:
+				_record_rate_limit(response, credential, cred_repo)
+				return response
+
+			if retry_num >= transport.max_retries:
+				raise _make_server_error(url, response.status_code, retry_num)
+
+		delay = _get_retry_delay(transport, retry_num)
+		retry_num += 1
+
+		if observer is not None:
+			observer.on_retry(request_kind, url, retry_num, delay)
+
+		await asyncio.sleep(delay)
+
+
+__all__ = [get_repo_commits_async.__name__]
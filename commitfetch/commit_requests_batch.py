@@ -0,0 +1,257 @@
+# __all__ declared at the module's end
+
+from collections import\
+	deque
+from concurrent.futures import\
+	FIRST_COMPLETED,\
+	ThreadPoolExecutor,\
+	wait
+
+from .commit_requests import\
+	_KEY_SHA,\
+	_MAX_PER_PAGE,\
+	_MIN_TRANSPORT_POOL_SIZE,\
+	_catch_commit_error,\
+	_get_listed_commit,\
+	_make_commit_list_url,\
+	_raise_per_page_value_error,\
+	_request_commit_page,\
+	_select_credential
+from .github_data import\
+	GitHubCredRepository,\
+	RepoIdentity
+from .github_transport import\
+	GitHubTransport
+
+
+_DEFAULT_MAX_WORKERS = 10
+
+
+class _RepoState:
+	"""
+	The progress of the requests about one repository.
+	"""
+
+	def __init__(self, repository, commit_list_url):
+		self.repository = repository
+		self.repo_identity = RepoIdentity.from_full_name(repository)
+		self.commit_list_url = commit_list_url
+		self.next_page_num = 1
+		self.is_page_pending = False
+		self.commit_page_data = deque()
+		self.request_count = 0
+
+	def is_done(self):
+		return self.next_page_num is None and not self.is_page_pending\
+			and len(self.commit_page_data) == 0 and self.request_count == 0
+
+
+def get_multi_repo_commits(repositories, credentials, can_wait,
+		transport=None, max_workers=_DEFAULT_MAX_WORKERS,
+		per_page=_MAX_PER_PAGE, since=None, include_files=True,
+		on_commit_error=None, on_repo_error=None):
+	"""
+	This generator obtains data about all the commits in many GitHub
+	repositories through the GitHub API. Each iteration yields a repository's
+	identity and data about one of its commits.
+
+	All the repositories share one GitHubCredRepository and one pool of
+	max_workers threads. The requests are scheduled in turn for each
+	repository: one page or commit request for a repository, then one for the
+	next repository, and so forth. Thus, a large or slow repository does not
+	delay the others. The next page of a repository is requested once fewer
+	than per_page of its commits remain to request. The credentials are
+	switched like in get_repo_commits.
+
+	The commits are yielded as soon as they are obtained. Consequently, the
+	commits of different repositories are interleaved, and the commits of a
+	repository are not necessarily in the order of its history.
+
+	The credentials and arguments can_wait, transport, per_page, since,
+	include_files and on_commit_error have the same meaning as for
+	get_repo_commits. When the rate limit of every credential is exceeded,
+	this generator waits for the earliest reset if can_wait is True. The
+	requests in progress are then completed.
+
+	If a page of a repository's commit list cannot be obtained, for instance
+	because the repository does not exist or is empty, function
+	on_repo_error is called with the repository and the exception. No other
+	page of that repository is then requested, but the commits of the pages
+	already obtained are. The other repositories are not affected. If
+	on_repo_error is None, the exception is raised.
+
+	Parameters:
+		repositories: the full names (str) of the repositories, in the format
+			<owner>/<name>. It can be any iterable object.
+		credentials: GitHub credentials.
+		can_wait (bool): allows this generator to wait if the GitHub API's
+			request rate limit is exceeded.
+		transport (GitHubTransport): sends the requests to the GitHub API.
+			Defaults to None.
+		max_workers (int): the maximum number of concurrent requests.
+			Defaults to 10.
+		per_page (int): the number of commits per page, from 1 to 100.
+			Defaults to 100.
+		since (str or datetime.datetime): only the commits committed at or
+			after this moment are obtained. Defaults to None.
+		include_files (bool): determines whether the files changed by the
+			commits are obtained. Defaults to True.
+		on_commit_error (callable): is called with the repository, the SHA
+			and the exception when a commit cannot be obtained. Defaults to
+			None.
+		on_repo_error (callable): is called with the repository and the
+			exception when a page of the repository's commit list cannot be
+			obtained. Defaults to None.
+
+	Yields:
+		tuple: the identity of a repository (RepoIdentity, index 0) and data
+			about one of its commits (Commit, index 1).
+
+	Raises:
+		GitHubApiError: if an error occurred upon a request to the GitHub API.
+		requests.RequestException: if a request could not be completed.
+		ValueError: if argument max_workers is less than 1 or argument
+			per_page is not between 1 and 100.
+	"""
+	if max_workers < 1:
+		raise ValueError("The number of workers must be at least 1.")
+
+	_raise_per_page_value_error(per_page)
+
+	cred_repo = credentials
+	if not isinstance(cred_repo, GitHubCredRepository):
+		cred_repo = GitHubCredRepository(credentials)
+
+	owns_transport = transport is None
+	if owns_transport:
+		transport = GitHubTransport(
+			pool_size=max(max_workers, _MIN_TRANSPORT_POOL_SIZE))
+
+	# The repositories that can have requests scheduled, in turn order.
+	repo_states = deque(_RepoState(repository, _make_commit_list_url(
+		transport.api_url, repository, per_page, since))
+		for repository in repositories)
+
+	executor = ThreadPoolExecutor(max_workers)
+	credential = cred_repo.credentials[0]
+
+	# Each future is associated with its repository, the requested page
+	# number or commit data and the credential of the request.
+	futures = dict()
+
+	# Each request is sent with the credential selected for the previous one
+	# so that the credential is only switched when necessary.
+	def submit_request(repo_state, page_num, commit_data):
+		nonlocal credential
+		credential = _select_credential(cred_repo, credential, transport)
+
+		if page_num is not None:
+			future = executor.submit(_request_commit_page,
+				repo_state.commit_list_url, page_num,
+				credential, cred_repo, transport)
+			repo_state.is_page_pending = True
+		else:
+			future = executor.submit(_get_listed_commit, commit_data,
+				repo_state.repository, include_files,
+				credential, cred_repo, transport)
+
+		repo_state.request_count += 1
+		futures[future] = (repo_state, page_num, commit_data, credential)
+
+	def schedule_requests():
+		# Give each repository one request in turn until all the workers
+		# are busy.
+		skipped_repo_count = 0
+
+		while len(futures) < max_workers\
+				and skipped_repo_count < len(repo_states):
+			repo_state = repo_states[0]
+			repo_states.rotate(-1)
+
+			# The next page is requested only when few commits of the
+			# repository remain to request.
+			if repo_state.next_page_num is not None\
+					and not repo_state.is_page_pending\
+					and len(repo_state.commit_page_data) < per_page:
+				submit_request(repo_state, repo_state.next_page_num, None)
+				skipped_repo_count = 0
+
+			elif len(repo_state.commit_page_data) > 0:
+				submit_request(
+					repo_state, None, repo_state.commit_page_data.popleft())
+				skipped_repo_count = 0
+
+			else:
+				skipped_repo_count += 1
+
+	try:
+		schedule_requests()
+
+		while len(futures) > 0:
+			done_futures, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+			for future in done_futures:
+				repo_state, page_num, commit_data, request_credential =\
+					futures.pop(future)
+				repo_state.request_count -= 1
+
+				if page_num is not None:
+					repo_state.is_page_pending = False
+
+				try:
+					result = future.result()
+
+				except Exception as ex:
+					if page_num is None:
+						commit_sha = commit_data[_KEY_SHA]
+						on_error = on_commit_error
+					else:
+						commit_sha = None
+						on_error = None if on_repo_error is None\
+							else _ignore_commit_sha(on_repo_error)
+
+					retry_credential = _catch_commit_error(ex,
+						repo_state.repository, commit_sha, request_credential,
+						cred_repo, can_wait, transport, on_error)
+
+					if retry_credential is not None:
+						credential = retry_credential
+						submit_request(repo_state, page_num, commit_data)
+						continue
+
+					# The commit is skipped, or the repository's next pages.
+					result = None
+
+				if page_num is not None and result is None:
+					repo_state.next_page_num = None
+
+				elif page_num is not None:
+					commit_page_data, has_next_page = result
+					repo_state.commit_page_data.extend(commit_page_data)
+					repo_state.next_page_num =\
+						page_num + 1 if has_next_page else None
+
+				elif result is not None:
+					yield repo_state.repo_identity, result
+
+				if repo_state.is_done():
+					repo_states.remove(repo_state)
+
+			schedule_requests()
+
+	finally:
+		executor.shutdown(cancel_futures=True)
+
+		if owns_transport:
+			transport.close()
+
+
+def _ignore_commit_sha(on_repo_error):
+	# Adapts on_repo_error to the signature of on_commit_error.
+	def on_page_error(repository, commit_sha, error):
+		on_repo_error(repository, error)
+
+	return on_page_error
+
+
+__all__ = [get_multi_repo_commits.__name__]
@@ -0,0 +1,417 @@
+# __all__ declared at the module's end
+
+from concurrent.futures import\
+	ThreadPoolExecutor
+from datetime import\
+	datetime,\
+	timezone
+import json
+
+from ghae import\
+	GitHubApiError
+
+from .commit_requests import\
+	_KEY_FILENAME,\
+	_KEY_FILES,\
+	_PATH_COMMITS,\
+	_PATH_REPOS,\
+	_RATE_LIMIT_EXCEEDED,\
+	_USER_REPO,\
+	_advance_checkpoint,\
+	_attach_rate_limit,\
+	_catch_commit_error,\
+	_catch_github_api_error,\
+	_detect_api_error,\
+	_record_rate_limit,\
+	_request_commit_data,\
+	_select_credential,\
+	_send_with_retries
+from .github_data import\
+	Commit,\
+	GitHubCredRepository,\
+	GitHubUser,\
+	RepoIdentity
+from .github_data.commit import\
+	_datetime_to_str
+
+
+_DOC_URL_GRAPHQL = "https://docs.github.com/graphql"
+
+_ERROR_RATE_LIMITED = "RATE_LIMITED"
+
+_KEY_AFTER = "after"
+_KEY_AUTHOR = "author"
+_KEY_AUTHORED_DATE = "authoredDate"
+_KEY_COMMITTER = "committer"
+_KEY_COUNT = "count"
+_KEY_DATA = "data"
+_KEY_DATABASE_ID = "databaseId"
+_KEY_DEFAULT_BRANCH_REF = "defaultBranchRef"
+_KEY_END_CURSOR = "endCursor"
+_KEY_ERRORS = "errors"
+_KEY_HAS_NEXT_PAGE = "hasNextPage"
+_KEY_HISTORY = "history"
+_KEY_LOGIN = "login"
+_KEY_MESSAGE = "message"
+_KEY_NAME = "name"
+_KEY_NODES = "nodes"
+_KEY_OID = "oid"
+_KEY_OWNER = "owner"
+_KEY_PAGE_INFO = "pageInfo"
+_KEY_QUERY = "query"
+_KEY_REPOSITORY = "repository"
+_KEY_SINCE = "since"
+_KEY_TARGET = "target"
+_KEY_TYPE = "type"
+_KEY_USER = "user"
+_KEY_VARIABLES = "variables"
+
+_PATH_API_V3 = "/v3"
+_PATH_GRAPHQL = "/graphql"
+
+_REQUEST_KIND_GRAPHQL = "graphql"
+
+_UTC_OFFSET = "+00:00"
+_UTC_SUFFIX = "Z"
+
+_USER_FIELDS = "user { login databaseId name }"
+
+# The history of the default branch, from the most recent commit.
+_HISTORY_QUERY = "query($owner: String!, $name: String!, $count: Int!, "\
+	+ "$after: String, $since: GitTimestamp) { "\
+	+ "repository(owner: $owner, name: $name) { "\
+	+ "defaultBranchRef { target { ... on Commit { "\
+	+ "history(first: $count, after: $after, since: $since) { "\
+	+ "pageInfo { hasNextPage endCursor } "\
+	+ "nodes { oid message authoredDate "\
+	+ f"author {{ {_USER_FIELDS} }} committer {{ {_USER_FIELDS} }} "\
+	+ "} } } } } } }"
+
+
+def _detect_graphql_error(graphql_url, response, graphql_data):
+	errors = graphql_data.get(_KEY_ERRORS)
+	if not errors:
+		return
+
+	error = errors[0]
+	message = error.get(_KEY_MESSAGE, str())
+
+	if error.get(_KEY_TYPE) == _ERROR_RATE_LIMITED\
+			and _RATE_LIMIT_EXCEEDED not in message:
+		message = _RATE_LIMIT_EXCEEDED + ". " + message
+
+	# The GraphQL API reports most errors with status 200 and an error type.
+	status = error.get(_KEY_TYPE, str(response.status_code))
+	gae = GitHubApiError(message, _DOC_URL_GRAPHQL, status, graphql_url)
+	_attach_rate_limit(gae, response)
+	raise gae
+
+
+def _fetch_repo_commits_graphql(repository, since, last_sha, include_files,
+		cred_repo, can_wait, transport, on_commit_error, max_workers,
+		per_page, checkpoint):
+	"""
+	This generator is the GraphQL engine of get_repo_commits. One GraphQL query
+	provides per_page commits of the default branch with their author's data.
+	Only the lists of the files changed by the commits are requested from the
+	REST API, unless include_files is False.
+
+	The executor's threads request the file lists of a page concurrently and
+	the next page of the history. The commits are yielded in the order of the
+	history.
+
+	The GraphQL API has its own rate limit, distinct from the REST API's.
+	Argument cred_repo records the REST rate limits, and the GraphQL rate
+	limits are recorded in another GitHubCredRepository that contains the
+	same credentials. Thus, exceeding one rate limit does not prevent the
+	requests to the other API.
+
+	Parameters:
+		repository (str): a repository's full name in the format
+			<owner>/<name>.
+		since (str or datetime.datetime): only the commits committed at or
+			after this moment are obtained.
+		last_sha (str): the SHA of the most recent commit already known.
+		include_files (bool): determines whether the files changed by the
+			commits are requested.
+		cred_repo (GitHubCredRepository): provides the credentials and records
+			their REST rate limits.
+		can_wait (bool): allows this generator to wait if the GitHub API's
+			request rate limit is exceeded.
+		transport (GitHubTransport): sends the requests to the GitHub API.
+		on_commit_error (callable): is called with the repository, the SHA
+			and the exception when a commit's files cannot be obtained. If it
+			is None, the exception is raised.
+		max_workers (int): the maximum number of concurrent requests.
+		per_page (int): the number of commits per query, from 1 to 100.
+		checkpoint (FetchCheckpoint): records the cursor of the page and the
+			index of each commit provided or skipped. It can be None.
+
+	Yields:
+		Commit: data about one commit from the specified repository.
+
+	Raises:
+		GitHubApiError: if an error occurred upon a request to the GitHub API.
+	"""
+	executor = ThreadPoolExecutor(max_workers)
+	credential = cred_repo.credentials[0]
+	graphql_cred_repo = GitHubCredRepository(cred_repo.credentials)
+	graphql_credential = credential
+	repo_identity = RepoIdentity.from_full_name(repository)
+	graphql_url = _make_graphql_url(transport.api_url)
+
+	if isinstance(since, datetime):
+		since = _datetime_to_str(since)
+
+	variables = {
+		_KEY_OWNER: repo_identity.owner,
+		_KEY_NAME: repo_identity.name,
+		_KEY_COUNT: per_page,
+		_KEY_AFTER: None,
+		_KEY_SINCE: since
+	}
+
+	# Each request is sent with the credential selected for the previous one
+	# so that the credential is only switched when necessary.
+	def submit_history_request(cursor):
+		nonlocal graphql_credential
+		graphql_credential = _select_credential(
+			graphql_cred_repo, graphql_credential, transport)
+		future = executor.submit(_request_history_page, graphql_url,
+			dict(variables, **{_KEY_AFTER: cursor}),
+			graphql_credential, graphql_cred_repo, transport)
+		return future, graphql_credential
+
+	def submit_files_request(commit_sha):
+		nonlocal credential
+		credential = _select_credential(cred_repo, credential, transport)
+		future = executor.submit(_request_commit_files,
+			commit_sha, repository, credential, cred_repo, transport)
+		return future, credential
+
+	try:
+		cursor = None
+		if checkpoint is not None:
+			cursor = checkpoint._get_start_page(cursor)
+
+		history_request = submit_history_request(cursor)
+
+		# Loop through all the history pages until the last page.
+		while history_request is not None:
+			history_future, history_credential = history_request
+
+			try:
+				commit_nodes, has_next_page, next_cursor =\
+					history_future.result()
+
+			except GitHubApiError as gae:
+				graphql_credential = _catch_github_api_error(gae,
+					history_credential, graphql_cred_repo, can_wait,
+					transport)
+				history_request = submit_history_request(cursor)
+				continue
+
+			commit_shas = [cn[_KEY_OID] for cn in commit_nodes]
+
+			# The commits already provided before an interruption are not
+			# requested again.
+			first_index = 0
+			if checkpoint is not None:
+				first_index = checkpoint._get_start_index(commit_shas)
+
+			if last_sha in commit_shas:
+				# The rest of the history is already known.
+				commit_nodes = commit_nodes[:commit_shas.index(last_sha)]
+				has_next_page = False
+
+			history_request = submit_history_request(next_cursor)\
+				if has_next_page else None
+			# A checkpoint identifies the page by the cursor that requests it.
+			page_cursor = cursor
+			cursor = next_cursor
+
+			if not include_files:
+				for commit_node_index in range(first_index, len(commit_nodes)):
+					commit_node = commit_nodes[commit_node_index]
+					yield _make_commit_from_graphql_data(
+						commit_node, repo_identity, (), transport.observer)
+					_advance_checkpoint(checkpoint, page_cursor,
+						commit_node_index, commit_node[_KEY_OID])
+
+				continue
+
+			files_requests = [submit_files_request(commit_node[_KEY_OID])
+				for commit_node in commit_nodes[first_index:]]
+
+			# Yield the commits in the order of the history.
+			commit_node_index = first_index
+			while commit_node_index < len(commit_nodes):
+				files_future, files_credential =\
+					files_requests[commit_node_index - first_index]
+				commit_node = commit_nodes[commit_node_index]
+
+				try:
+					files = files_future.result()
+
+				except Exception as ex:
+					retry_credential = _catch_commit_error(ex, repository,
+						commit_node[_KEY_OID], files_credential, cred_repo,
+						can_wait, transport, on_commit_error)
+
+					if retry_credential is not None:
+						credential = retry_credential
+						files_requests[commit_node_index - first_index] =\
+							submit_files_request(commit_node[_KEY_OID])
+						continue
+
+					_advance_checkpoint(checkpoint, page_cursor,
+						commit_node_index, commit_node[_KEY_OID])
+
+				else:
+					yield _make_commit_from_graphql_data(commit_node,
+						repo_identity, files, transport.observer)
+					_advance_checkpoint(checkpoint, page_cursor,
+						commit_node_index, commit_node[_KEY_OID])
+
+				commit_node_index += 1
+
+	finally:
+		executor.shutdown(cancel_futures=True)
+
+
+def _get_github_user_from_graphql_data(commit_node, observer):
+	user_struct = None
+
+	author_struct = commit_node[_KEY_AUTHOR]
+	if author_struct is not None:
+		user_struct = author_struct.get(_KEY_USER)
+
+	if user_struct is None:
+		committer_struct = commit_node[_KEY_COMMITTER]
+		if committer_struct is not None:
+			user_struct = committer_struct.get(_KEY_USER)
+
+	if user_struct is None:
+		return None
+
+	login = user_struct[_KEY_LOGIN]
+
+	github_user = _USER_REPO.get_user(login)
+
+	# Like the REST API's engines, this function reports the lookup even
+	# though the user's data comes with the query's.
+	if observer is not None:
+		observer.on_user_lookup(login, github_user is not None)
+
+	if github_user is None:
+		github_user = GitHubUser(
+			user_struct[_KEY_DATABASE_ID], login, user_struct[_KEY_NAME])
+		_USER_REPO.register_user(github_user)
+
+	return github_user
+
+
+def _make_commit_from_graphql_data(commit_node, repo_identity, files,
+		observer):
+	author = _get_github_user_from_graphql_data(commit_node, observer)
+	moment = _moment_from_git_timestamp(commit_node[_KEY_AUTHORED_DATE])
+
+	return Commit(commit_node[_KEY_OID], commit_node[_KEY_MESSAGE],
+		repo_identity, moment, author, files)
+
+
+def _make_graphql_url(api_url):
+	# On GitHub Enterprise Server, the REST API's root URL ends with /v3, and
+	# the GraphQL API replaces this part.
+	if api_url.endswith(_PATH_API_V3):
+		api_url = api_url[:-len(_PATH_API_V3)]
+
+	return api_url + _PATH_GRAPHQL
+
+
+def _moment_from_git_timestamp(git_timestamp):
+	# The REST API provides the moments in UTC. The GraphQL API can provide
+	# them with the offset of the author's time zone.
+	if git_timestamp.endswith(_UTC_SUFFIX):
+		git_timestamp = git_timestamp[:-len(_UTC_SUFFIX)] + _UTC_OFFSET
+
+	moment = datetime.fromisoformat(git_timestamp)
+	return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _request_commit_files(
+		commit_sha, repository, credential, cred_repo, transport):
+	"""
+	Requests the paths to the files changed by a commit from the REST API,
+	which the GraphQL API does not provide.
+
+	Parameters:
+		commit_sha (str): a SHA hash that identifies a commit.
+		repository (str): a GitHub repository name in the format
+			<owner>/<name>.
+		credential (tuple): a GitHub credential consisting of a username
+			(str, index 0) and a PAT (str, index 1).
+		cred_repo (GitHubCredRepository): records the credential's rate
+			limit indicated by the response.
+		transport (GitHubTransport): sends the request to the GitHub API.
+
+	Returns:
+		tuple: the paths (str) to the files changed by the commit.
+
+	Raises:
+		GitHubApiError: if the response indicates that an error occurred.
+	"""
+	commit_url = transport.api_url\
+		+ _PATH_REPOS + repository + _PATH_COMMITS + commit_sha
+	commit_data = _request_commit_data(
+		commit_url, credential, cred_repo, transport)
+
+	return tuple(fd[_KEY_FILENAME] for fd in commit_data[_KEY_FILES])
+
+
+def _request_history_page(
+		graphql_url, variables, credential, cred_repo, transport):
+	"""
+	Requests a page of a repository's commit history from the GraphQL API.
+
+	Parameters:
+		graphql_url (str): the URL of the GraphQL API.
+		variables (dict): the values of the query's variables.
+		credential (tuple): a GitHub credential consisting of a username
+			(str, index 0) and a PAT (str, index 1).
+		cred_repo (GitHubCredRepository): records the credential's GraphQL
+			rate limit indicated by the response.
+		transport (GitHubTransport): sends the request to the GitHub API.
+
+	Returns:
+		tuple: the data of the commits from the wanted page (list, index 0),
+			True if there is a next page, False otherwise (bool, index 1) and
+			the cursor of the next page (str, index 2).
+
+	Raises:
+		GitHubApiError: if the response indicates that an error occurred.
+	"""
+	query_data = {_KEY_QUERY: _HISTORY_QUERY, _KEY_VARIABLES: variables}
+	response = _send_with_retries(
+		lambda: transport.post(graphql_url, credential, query_data),
+		_REQUEST_KIND_GRAPHQL, graphql_url, transport)
+	_record_rate_limit(response, credential, cred_repo)
+	graphql_data = json.loads(response.content)
+
+	_detect_api_error(graphql_url, graphql_data, response)
+	_detect_graphql_error(graphql_url, response, graphql_data)
+
+	branch_ref = graphql_data[_KEY_DATA][_KEY_REPOSITORY]\
+		[_KEY_DEFAULT_BRANCH_REF]
+	if branch_ref is None:
+		# The repository is empty.
+		return list(), False, None
+
+	history = branch_ref[_KEY_TARGET][_KEY_HISTORY]
+	page_info = history[_KEY_PAGE_INFO]
+
+	return history[_KEY_NODES], page_info[_KEY_HAS_NEXT_PAGE],\
+		page_info[_KEY_END_CURSOR]
+
+
+__all__ = list()
@@ -1,35 +1,362 @@
 # __all__ declared at the module's end
 
-# syspathmodif is a dependency of repr_rw.
-from syspathmodif import\
-	sm_contains
+from datetime import\
+	datetime
+import gzip
+import io
+import mmap
+import os
+import re
+import struct
 
-from repr_rw import\
-	read_reprs,\
-	write_reprs
+try:
+	import zstandard
+except ImportError:
+	# zstandard is an optional dependency.
+	zstandard = None
 
+# strath is an indirect dependency of repr_rw.
+from strath import\
+	ensure_path_is_pathlib
 
-_LIB_NAME = "commitfetch"
+from .github_data import\
+	Commit,\
+	GitHubUser,\
+	RepoIdentity
 
-_COMMIT_READING_IMPORTATIONS = ("from commitfetch import GitHubUser, Commit",)
 
+_BACKSLASH_REPLACE = "backslashreplace"
 
-def _add_lib_to_sys_modules():
-	from pathlib import Path
-	# syspathmodif is a dependency of repr_rw.
-	from syspathmodif import sp_append
+_COMPRESSION_GZIP = "gzip"
+_COMPRESSION_ZSTD = "zstd"
 
-	# Storing a string avoids the conversion by syspathmodif.
-	repo_root = str(Path(__file__).resolve().parents[1])
-	was_repo_root_appended = sp_append(repo_root)
+_DEFAULT_GZIP_LEVEL = 6
+_DEFAULT_ZSTD_LEVEL = 3
 
-	# The import includes commitfetch in sys.modules.
-	import commitfetch
+_ENCODING_LATIN1 = "latin-1"
+_ENCODING_UNICODE_ESCAPE = "unicode_escape"
+_ENCODING_UTF8 = "utf-8"
 
-	if was_repo_root_appended:
-		# Leave repo_root if it was initially in sys.path.
-		from syspathmodif import sp_remove
-		sp_remove(repo_root)
+# The compression formats are recognized by the first bytes of the files.
+_GZIP_MAGIC = b"\x1f\x8b"
+_GZIP_SUFFIX = ".gz"
+
+# An index file starts with a header that contains the size and the
+# modification time of the indexed file. The records that follow contain a
+# key made from a SHA and the offset of the commit's line. They are sorted by
+# key.
+_INDEX_HEADER = struct.Struct("<8sQQ")
+_INDEX_MAGIC = b"CFSHAIDX"
+_INDEX_RECORD = struct.Struct("<33sQ")
+_INDEX_SUFFIX = ".idx"
+
+_MAX_SHA_SIZE = 32 # bytes
+
+_NEW_LINE = "\n"
+_NEW_LINE_BYTES = b"\n"
+
+_NONE = "None"
+
+# Large reads keep the reading efficient on network storage.
+_READ_BUFFER_SIZE = 1048576 # bytes, 1 MiB
+
+_REGEX_STR = r"(?:'[^'\\\n]*(?:\\.[^'\\\n]*)*'"\
+	+ r"|\"[^\"\\\n]*(?:\\.[^\"\\\n]*)*\")"
+_REGEX_SEP = r"\s*,\s*"
+
+_PATTERN_COMMIT = re.compile(r"Commit\(\s*"
+	+ f"({_REGEX_STR}){_REGEX_SEP}({_REGEX_STR}){_REGEX_SEP}"
+	+ f"({_REGEX_STR}){_REGEX_SEP}({_REGEX_STR}){_REGEX_SEP}"
+	+ r"(None|GitHubUser\(\s*(-?\d+|None)" + _REGEX_SEP
+	+ f"({_REGEX_STR}|None){_REGEX_SEP}({_REGEX_STR}|None)"
+	+ r"\s*\))" + _REGEX_SEP
+	+ r"\(\s*((?:" + _REGEX_STR + _REGEX_SEP + r")*(?:"
+	+ _REGEX_STR + r"\s*)?)\)\s*,?\s*\)")
+_PATTERN_REPR_SHA = re.compile(rb"\s*Commit\(\s*'([0-9A-Fa-f]+)'")
+_PATTERN_STR = re.compile(_REGEX_STR)
+
+_UTC_SUFFIX = "Z"
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_ZSTD_SUFFIX = ".zst"
+
+
+def _decode_str(str_literal):
+	if str_literal == _NONE:
+		return None
+
+	# Remove the quotes.
+	content = str_literal[1:-1]
+
+	if "\\" in content:
+		# The characters that Latin-1 cannot encode become escape sequences,
+		# which the decoding turns back into those characters.
+		content = content.encode(_ENCODING_LATIN1, _BACKSLASH_REPLACE)\
+			.decode(_ENCODING_UNICODE_ESCAPE)
+
+	return content
+
+
+def _detect_compression(first_bytes):
+	if first_bytes.startswith(_GZIP_MAGIC):
+		return _COMPRESSION_GZIP
+
+	if first_bytes.startswith(_ZSTD_MAGIC):
+		return _COMPRESSION_ZSTD
+
+	return None
+
+
+def _end_compression(commit_file, raw_file):
+	# Ends the current gzip member or Zstandard frame without closing the
+	# file. A compressed file can consist of several members or frames.
+	if commit_file is not raw_file:
+		commit_file.close()
+
+
+def get_commit(file_path, sha):
+	"""
+	Reads the commit identified by a SHA in a text file written by
+	write_commit_reprs without reading the other commits. The commit's line
+	is found through the file's SHA index, then only this line is parsed.
+
+	The index is a file whose path is file_path followed by suffix .idx.
+	Function write_commit_reprs writes it if argument write_index is True. If
+	the index does not exist or the text file was modified after the
+	indexing, this function calls index_commit_reprs first.
+
+	Parameters:
+		file_path (str or pathlib.Path): the path to a text file that contains
+			Commit representations.
+		sha (str): the SHA hash that identifies the wanted commit.
+
+	Returns:
+		Commit: the commit identified by argument sha, None if the file does
+			not contain it.
+
+	Raises:
+		FileNotFoundError: if argument file_path does not exist.
+		TypeError: if argument file_path is not of type str or pathlib.Path.
+		ValueError: if argument sha is not a hexadecimal SHA or the text file
+			is compressed or not made of Commit representations.
+	"""
+	file_path = ensure_path_is_pathlib(file_path, False)
+	index_key = _make_index_key(sha)
+	index_path = _make_index_path(file_path)
+
+	if not _is_index_up_to_date(file_path, index_path):
+		index_commit_reprs(file_path)
+
+	offset = _search_index(index_path, index_key)
+
+	if offset is None:
+		return None
+
+	with file_path.open(mode="rb") as commit_file,\
+			mmap.mmap(commit_file.fileno(), 0, access=mmap.ACCESS_READ)\
+			as commit_map:
+		line_end = commit_map.find(_NEW_LINE_BYTES, offset)
+
+		if line_end < 0:
+			line_end = len(commit_map)
+
+		commit_repr = commit_map[offset: line_end].decode(_ENCODING_UTF8)
+
+	commit = _parse_commit_repr(commit_repr.strip(), dict(), dict(), dict())
+
+	if commit is None:
+		raise ValueError(f"The line at byte {offset} of {file_path} "
+			+ "is not a Commit representation.")
+
+	return commit
+
+
+def _get_compression_from_suffix(file_path):
+	suffix = file_path.suffix.lower()
+
+	if suffix == _GZIP_SUFFIX:
+		return _COMPRESSION_GZIP
+
+	if suffix == _ZSTD_SUFFIX:
+		return _COMPRESSION_ZSTD
+
+	return None
+
+
+def _get_file_state(file_path):
+	file_stat = file_path.stat()
+	return file_stat.st_size, file_stat.st_mtime_ns
+
+
+def index_commit_reprs(file_path):
+	"""
+	Writes the SHA index of a text file written by write_commit_reprs. The
+	index maps each commit's SHA to the position of its line, which allows
+	function get_commit to read one commit without reading the whole file.
+	The index is a file whose path is file_path followed by suffix .idx. If it
+	already exists, this function will overwrite it. Only the SHA at the
+	start of each line is read. A compressed file cannot be indexed.
+
+	Parameters:
+		file_path (str or pathlib.Path): the path to a text file that contains
+			Commit representations.
+
+	Returns:
+		int: the number of indexed commits.
+
+	Raises:
+		FileNotFoundError: if argument file_path does not exist.
+		TypeError: if argument file_path is not of type str or pathlib.Path.
+		ValueError: if a line is not a Commit representation, a SHA is not
+			hexadecimal or the file is compressed.
+	"""
+	file_path = ensure_path_is_pathlib(file_path, False)
+	index_entries = list()
+	offset = 0
+
+	with file_path.open(mode="rb") as commit_file:
+		if _detect_compression(commit_file.peek(len(_ZSTD_MAGIC)))\
+				is not None:
+			raise ValueError(
+				f"{file_path} cannot be indexed because it is compressed.")
+
+		for line_num, line in enumerate(commit_file, 1):
+			# Empty lines are ignored.
+			if not line.isspace():
+				sha_match = _PATTERN_REPR_SHA.match(line)
+
+				if sha_match is None:
+					raise ValueError(f"Line {line_num} of {file_path} "
+						+ "is not a Commit representation.")
+
+				index_entries.append(
+					(_make_index_key(sha_match.group(1).decode()), offset))
+
+			offset += len(line)
+
+	return _write_index(file_path, index_entries)
+
+
+def _is_index_up_to_date(file_path, index_path):
+	try:
+		with index_path.open(mode="rb") as index_file:
+			header_data = index_file.read(_INDEX_HEADER.size)
+	except FileNotFoundError:
+		return False
+
+	if len(header_data) < _INDEX_HEADER.size:
+		return False
+
+	magic, file_size, file_mtime_ns = _INDEX_HEADER.unpack(header_data)
+
+	return magic == _INDEX_MAGIC\
+		and (file_size, file_mtime_ns) == _get_file_state(file_path)
+
+
+def _make_index_key(sha):
+	try:
+		sha_bytes = bytes.fromhex(sha)
+	except ValueError:
+		raise ValueError(f"SHA {sha} is not hexadecimal.") from None
+
+	if len(sha_bytes) > _MAX_SHA_SIZE:
+		raise ValueError(f"SHA {sha} is too long.")
+
+	# The length distinguishes the SHAs that differ by trailing zeros.
+	return bytes((len(sha_bytes),)) + sha_bytes.ljust(_MAX_SHA_SIZE, b"\0")
+
+
+def _make_index_path(file_path):
+	return file_path.with_name(file_path.name + _INDEX_SUFFIX)
+
+
+def _open_decompressor(raw_file):
+	"""
+	Provides the decompressed content of a file written by write_commit_reprs.
+	The compression format is detected from the file's first bytes.
+
+	Parameters:
+		raw_file (io.BufferedReader): the file, opened in binary mode at its
+			beginning.
+
+	Returns:
+		a binary file object that provides the decompressed content, raw_file
+			itself if the file is not compressed.
+
+	Raises:
+		ImportError: if the file is compressed with Zstandard and zstandard is
+			not installed.
+	"""
+	compression = _detect_compression(raw_file.peek(len(_ZSTD_MAGIC)))
+
+	if compression == _COMPRESSION_GZIP:
+		return gzip.GzipFile(fileobj=raw_file, mode="rb")
+
+	if compression == _COMPRESSION_ZSTD:
+		_raise_zstd_import_error()
+		# A file written with a checkpoint contains several frames.
+		return io.BufferedReader(
+			zstandard.ZstdDecompressor().stream_reader(raw_file,
+				read_size=_READ_BUFFER_SIZE, read_across_frames=True),
+			_READ_BUFFER_SIZE)
+
+	return raw_file
+
+
+def _parse_commit_repr(commit_repr, github_users, repo_identities, paths):
+	# The representation is parsed with regular expressions rather than
+	# evaluated, which is faster and does not execute the file's content.
+	commit_match = _PATTERN_COMMIT.fullmatch(commit_repr)
+
+	if commit_match is None:
+		return None
+
+	sha, message, full_name, moment, author_repr, author_id, author_login,\
+		author_name, files = commit_match.groups()
+
+	# Equal authors, repositories and file paths are decoded once.
+	author = github_users.get(author_repr)
+
+	if author is None and author_repr != _NONE:
+		author = GitHubUser(
+			None if author_id == _NONE else int(author_id),
+			_decode_str(author_login), _decode_str(author_name))
+		github_users[author_repr] = author
+
+	repo_identity = repo_identities.get(full_name)
+
+	if repo_identity is None:
+		repo_identity = RepoIdentity.from_full_name(_decode_str(full_name))
+		repo_identities[full_name] = repo_identity
+
+	# The moments are written in format %Y-%m-%dT%H:%M:%SZ. Without the final
+	# Z, datetime.fromisoformat parses them much faster than
+	# datetime.strptime.
+	moment = _decode_str(moment)
+
+	if not moment.endswith(_UTC_SUFFIX):
+		return None
+
+	moment = datetime.fromisoformat(moment[:-len(_UTC_SUFFIX)])
+
+	file_paths = list()
+
+	for path_literal in _PATTERN_STR.findall(files):
+		path = paths.get(path_literal)
+
+		if path is None:
+			path = _decode_str(path_literal)
+			paths[path_literal] = path
+
+		file_paths.append(path)
+
+	return Commit(_decode_str(sha), _decode_str(message), repo_identity,
+		moment, author, file_paths)
+
+
+def _raise_zstd_import_error():
+	if zstandard is None:
+		raise ImportError("Zstandard compression requires package zstandard.")
 
 
 def read_commit_reprs(file_path):
@@ -40,6 +367,15 @@ def read_commit_reprs(file_path):
 	repr. Each line in the file must be a Commit representation. Empty lines
 	are ignored.
 
+	The representations are parsed according to the format of Commit and
+	GitHubUser representations. They are not evaluated as Python code, which
+	makes this generator fast and prevents a file from executing code. Equal
+	authors, repositories and file paths are recreated once and shared by the
+	commits.
+
+	The file can be compressed with gzip or Zstandard, which is detected from
+	its first bytes regardless of its name. It is decompressed as it is read.
+
 	Parameters:
 		file_path (str or pathlib.Path): the path to a text file that contains
 			Commit representations.
@@ -47,40 +383,278 @@ def read_commit_reprs(file_path):
 	Yields:
 		Commit: a Commit instance recreated from its representation.
 
+	Raises:
+		FileNotFoundError: if argument file_path does not exist.
+		ImportError: if the file is compressed with Zstandard and zstandard is
+			not installed.
+		TypeError: if argument file_path is not of type str or pathlib.Path.
+		ValueError: if a line is not a Commit representation.
+	"""
+	file_path = ensure_path_is_pathlib(file_path, False)
+	github_users = dict()
+	repo_identities = dict()
+	paths = dict()
+
+	with file_path.open(mode="rb", buffering=_READ_BUFFER_SIZE) as raw_file,\
+			io.TextIOWrapper(_open_decompressor(raw_file),
+				encoding=_ENCODING_UTF8) as commit_file:
+		for line_num, commit_repr in enumerate(commit_file, 1):
+			commit_repr = commit_repr.strip()
+
+			if len(commit_repr) == 0:
+				continue
+
+			commit = _parse_commit_repr(
+				commit_repr, github_users, repo_identities, paths)
+
+			if commit is None:
+				raise ValueError(f"Line {line_num} of {file_path} "
+					+ "is not a Commit representation.")
+
+			yield commit
+
+
+def read_newest_commit(file_path):
+	"""
+	Reads the first Commit representation in a text file written by
+	write_commit_reprs. Since get_repo_commits provides the most recent commits
+	first, this commit is the newest one in a file that stores its results.
+	Its properties sha and moment can be given to get_repo_commits as
+	arguments last_sha and since to request only the history above it.
+
+	This does not obtain every commit added since the file was written.
+	Property moment is the commit's author date, while the GitHub API filters
+	argument since on the committer date. Also, a commit from a merged branch
+	or a rebase can be placed below this commit in the history. To not miss
+	commits, omit last_sha, give since a moment earlier than this commit's,
+	and deduplicate the commits on their SHA, for instance with CommitStore.
+
+	Parameters:
+		file_path (str or pathlib.Path): the path to a text file that contains
+			Commit representations.
+
+	Returns:
+		Commit: the first Commit in the file, None if the file contains no
+			Commit representation.
+
 	Raises:
 		FileNotFoundError: if argument file_path does not exist.
 		TypeError: if argument file_path is not of type str or pathlib.Path.
-		Exception: any exception raised upon the parsing of a Commit
+		ValueError: if the first line that is not empty is not a Commit
 			representation.
 	"""
-	# When this generator is being used, package commitfetch has presumably
-	# been imported at least once and thus, included in sys.modules. This makes
-	# commitfetch available for import with no modifications to sys.path.
+	commit_generator = read_commit_reprs(file_path)
+
+	try:
+		return next(commit_generator, None)
+	finally:
+		commit_generator.close()
+
+
+def _save_checkpoint(raw_file, checkpoint):
+	# The checkpoint must not record commits that could be lost.
+	raw_file.flush()
+	os.fsync(raw_file.fileno())
+	checkpoint.save(raw_file.tell())
+
+
+def _search_index(index_path, index_key):
+	with index_path.open(mode="rb") as index_file,\
+			mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)\
+			as index_map:
+		# Binary search
+		low = 0
+		high = (len(index_map) - _INDEX_HEADER.size) // _INDEX_RECORD.size
+
+		while low < high:
+			middle = (low + high) // 2
+			record_key, offset = _INDEX_RECORD.unpack_from(index_map,
+				_INDEX_HEADER.size + middle * _INDEX_RECORD.size)
+
+			if record_key < index_key:
+				low = middle + 1
+			elif record_key > index_key:
+				high = middle
+			else:
+				return offset
 
-	if not sm_contains(_LIB_NAME):
-		_add_lib_to_sys_modules()
+	return None
 
-	commit_generator = read_reprs(file_path, _COMMIT_READING_IMPORTATIONS)
-	yield from commit_generator
 
+def _start_compression(raw_file, compression, compression_level):
+	# Provides the file object to which the representations are written.
+	if compression == _COMPRESSION_GZIP:
+		if compression_level is None:
+			compression_level = _DEFAULT_GZIP_LEVEL
 
-def write_commit_reprs(file_path, commits):
+		return gzip.GzipFile(
+			fileobj=raw_file, mode="wb", compresslevel=compression_level)
+
+	if compression == _COMPRESSION_ZSTD:
+		if compression_level is None:
+			compression_level = _DEFAULT_ZSTD_LEVEL
+
+		return zstandard.ZstdCompressor(level=compression_level)\
+			.stream_writer(raw_file, closefd=False)
+
+	return raw_file
+
+
+def write_commit_reprs(file_path, commits, write_index=False,
+		checkpoint=None, compression_level=None):
 	"""
 	Writes the representations of Commit instances in a text file. The
 	representations are strings returned by function repr. Each line of the
 	file is a representation. If the file already exists, this function will
 	overwrite it.
 
+	If write_index is True, this function also writes the file's SHA index,
+	which allows function get_commit to read one commit without reading the
+	whole file. See index_commit_reprs.
+
+	Argument checkpoint allows to resume the writing of the commits provided
+	by get_repo_commits if it is interrupted. It must be the FetchCheckpoint
+	given to get_repo_commits. Every checkpoint.save_interval commits and
+	when the iteration ends, even with an exception, this function flushes
+	the file to the disk then saves the checkpoint with the file's size. If
+	the checkpoint was already saved, the file is not overwritten: it is
+	truncated to the saved size, and the commits are appended.
+
+	If the file's name ends with .gz or .zst, the representations are
+	compressed with gzip or Zstandard as they are written. Argument
+	compression_level then sets the compression level, which is 6 for gzip
+	and 3 for Zstandard by default. Each save of the checkpoint ends a gzip
+	member or a Zstandard frame so that the file can be truncated at the
+	saved size. A compressed file cannot be indexed.
+
 	Parameters:
 		file_path (str or pathlib.Path): the path to the text file that will
 			contain the Commit representations.
 		commits (generator, list, set or tuple): the Commit instances whose
 			representation will be written.
+		write_index (bool): determines whether the SHA index is written.
+			Defaults to False.
+		checkpoint (FetchCheckpoint): records the progress of the
+			get_repo_commits iteration that provides the commits. Defaults to
+			None.
+		compression_level (int): the compression level if the file is
+			compressed. Defaults to None, which means the format's default
+			level.
+
+	Raises:
+		FileNotFoundError: if the checkpoint was saved but argument file_path
+			does not exist.
+		ImportError: if the file's name ends with .zst and zstandard is not
+			installed.
+		TypeError: if argument file_path is not of type str or pathlib.Path.
+		ValueError: if write_index is True and the file is compressed or a
+			SHA is not hexadecimal, or if the file is smaller than the size
+			saved in the checkpoint.
 	"""
-	write_reprs(file_path, commits)
+	file_path = ensure_path_is_pathlib(file_path, False)
+	compression = _get_compression_from_suffix(file_path)
+	index_entries = list()
+	offset = 0
+
+	if compression is not None and write_index:
+		raise ValueError(
+			f"{file_path} cannot be indexed because it is compressed.")
+
+	if compression == _COMPRESSION_ZSTD:
+		_raise_zstd_import_error()
+
+	output_size = None if checkpoint is None else checkpoint.output_size
+
+	if output_size is None:
+		raw_file = file_path.open(mode="wb")
+	else:
+		raw_file = file_path.open(mode="r+b")
+
+		if raw_file.seek(0, os.SEEK_END) < output_size:
+			raw_file.close()
+			raise ValueError(f"{file_path} is smaller than the "
+				+ f"{output_size} bytes saved in checkpoint "
+				+ f"{checkpoint.file_path}.")
+
+		# The commits written after the last save will be provided again.
+		raw_file.truncate(output_size)
+		raw_file.seek(output_size)
+		offset = output_size
+
+	with raw_file:
+		commit_file = _start_compression(
+			raw_file, compression, compression_level)
+		commit_count = 0
+		# The commit being written is not saved in the checkpoint if the
+		# writing fails.
+		is_writing = False
+		# The checkpoint records a commit when the next one is obtained. If its
+		# position did not change since the last commit was obtained, the
+		# iteration stopped before recording the last commit.
+		commit_position = None
+
+		try:
+			for commit in commits:
+				if checkpoint is not None:
+					if commit_count > 0\
+							and commit_count % checkpoint.save_interval == 0:
+						_end_compression(commit_file, raw_file)
+						_save_checkpoint(raw_file, checkpoint)
+						commit_file = _start_compression(
+							raw_file, compression, compression_level)
+
+					commit_position = checkpoint._position
+
+				is_writing = True
+				line = (repr(commit) + _NEW_LINE).encode(_ENCODING_UTF8)
+				commit_file.write(line)
+				is_writing = False
+
+				if write_index:
+					index_entries.append((_make_index_key(commit.sha), offset))
+
+				offset += len(line)
+				commit_count += 1
+
+		finally:
+			_end_compression(commit_file, raw_file)
+
+			if checkpoint is not None and not is_writing and (commit_count == 0
+					or checkpoint._position is not commit_position):
+				_save_checkpoint(raw_file, checkpoint)
+
+	if write_index:
+		if output_size is None:
+			_write_index(file_path, index_entries)
+		else:
+			# The commits written before the interruption must be indexed.
+			index_commit_reprs(file_path)
+
+
+def _write_index(file_path, index_entries):
+	# A SHA that appears several times is associated with its first line.
+	index_entries.sort()
+	index_path = _make_index_path(file_path)
+	record_count = 0
+	previous_key = None
+
+	with index_path.open(mode="wb") as index_file:
+		index_file.write(_INDEX_HEADER.pack(
+			_INDEX_MAGIC, *_get_file_state(file_path)))
+
+		for index_key, offset in index_entries:
+			if index_key != previous_key:
+				index_file.write(_INDEX_RECORD.pack(index_key, offset))
+				record_count += 1
+				previous_key = index_key
+
+	return record_count
 
 
 __all__ = [
+	get_commit.__name__,
+	index_commit_reprs.__name__,
 	read_commit_reprs.__name__,
+	read_newest_commit.__name__,
 	write_commit_reprs.__name__
 ]
@@ -0,0 +1,206 @@
+# __all__ declared at the module's end
+
+from collections import\
+	deque
+from concurrent.futures import\
+	FIRST_COMPLETED,\
+	ProcessPoolExecutor,\
+	wait
+import os
+
+# strath is an indirect dependency of repr_rw.
+from strath import\
+	ensure_path_is_pathlib
+
+from .commit_rw import\
+	_ENCODING_UTF8,\
+	_READ_BUFFER_SIZE,\
+	_ZSTD_MAGIC,\
+	_detect_compression,\
+	_open_decompressor,\
+	_parse_commit_repr
+
+
+_DEFAULT_CHUNK_SIZE = 33554432 # bytes, 32 MiB
+
+_NEW_LINE = b"\n"
+
+# The number of chunks submitted to the pool per worker.
+_CHUNKS_PER_WORKER = 2
+
+
+def _iter_chunk_tasks(file_path, chunk_size):
+	# Each task is a function that provides a chunk's commits and its
+	# arguments. A compressed file is decompressed by the calling process, and
+	# the decompressed chunks are parsed in the pool.
+	with file_path.open(mode="rb") as raw_file:
+		compression = _detect_compression(raw_file.peek(len(_ZSTD_MAGIC)))
+		file_size = raw_file.seek(0, os.SEEK_END)
+
+	if compression is None:
+		for chunk_start in range(0, file_size, chunk_size):
+			yield _read_chunk, (file_path, chunk_start,
+				min(chunk_start + chunk_size, file_size))
+
+		return
+
+	with file_path.open(mode="rb", buffering=_READ_BUFFER_SIZE) as raw_file,\
+			_open_decompressor(raw_file) as commit_file:
+		line_start = 0
+
+		while True:
+			chunk_data = commit_file.read(chunk_size)
+
+			if len(chunk_data) == 0:
+				break
+
+			if not chunk_data.endswith(_NEW_LINE):
+				# Complete the last line.
+				chunk_data += commit_file.readline()
+
+			yield _parse_chunk, (file_path, line_start, chunk_data)
+			line_start += len(chunk_data)
+
+
+def _parse_chunk(file_path, line_start, chunk_data):
+	github_users = dict()
+	repo_identities = dict()
+	paths = dict()
+	commits = list()
+
+	for line in chunk_data.split(_NEW_LINE):
+		commit_repr = line.decode(_ENCODING_UTF8).strip()
+
+		if len(commit_repr) > 0:
+			commit = _parse_commit_repr(
+				commit_repr, github_users, repo_identities, paths)
+
+			if commit is None:
+				raise ValueError(f"The line at byte {line_start} of "
+					+ f"{file_path} is not a Commit representation.")
+
+			commits.append(commit)
+
+		line_start += len(line) + len(_NEW_LINE)
+
+	return commits
+
+
+def _read_chunk(file_path, start, end):
+	# A chunk comprises the lines that begin in the byte range [start, end).
+	with file_path.open(mode="rb") as commit_file:
+		if start > 0:
+			# Skip the line that began in the previous chunk.
+			commit_file.seek(start - 1)
+			commit_file.readline()
+
+		line_start = commit_file.tell()
+
+		if line_start >= end:
+			return list()
+
+		chunk_data = commit_file.read(end - line_start)
+
+		if not chunk_data.endswith(_NEW_LINE):
+			# Complete the last line.
+			chunk_data += commit_file.readline()
+
+	return _parse_chunk(file_path, line_start, chunk_data)
+
+
+def read_commit_reprs_parallel(file_path, max_workers=None,
+		chunk_size=_DEFAULT_CHUNK_SIZE, ordered=True):
+	"""
+	This generator reads a text file written by write_commit_reprs like
+	read_commit_reprs, but it parses the file in several processes. Each
+	iteration yields a Commit instance.
+
+	The file is divided in chunks of about chunk_size bytes that end at line
+	boundaries. A pool of max_workers processes parses the chunks, and each
+	process sends the commits of a chunk to this generator. At most two chunks
+	per process are parsed or waiting to be yielded at once, which limits the
+	memory usage. If the file is compressed with gzip or Zstandard, this
+	generator decompresses it and sends the decompressed chunks to the
+	processes.
+
+	If ordered is True, the commits are yielded in the order of the file.
+	Otherwise, the commits of a chunk are yielded as soon as the chunk is
+	parsed, which avoids waiting for a slow chunk. Equal authors and
+	repositories are shared by the commits of a chunk.
+
+	On a single core or for a small file, read_commit_reprs is faster because
+	it does not need to transfer the commits between processes.
+
+	Parameters:
+		file_path (str or pathlib.Path): the path to a text file that contains
+			Commit representations.
+		max_workers (int): the number of processes. Defaults to None, which
+			means the number of processors.
+		chunk_size (int): the approximate number of bytes per chunk. Defaults
+			to 33554432 (32 MiB).
+		ordered (bool): determines whether the commits are yielded in the
+			order of the file. Defaults to True.
+
+	Yields:
+		Commit: a Commit instance recreated from its representation.
+
+	Raises:
+		FileNotFoundError: if argument file_path does not exist.
+		ImportError: if the file is compressed with Zstandard and zstandard is
+			not installed.
+		TypeError: if argument file_path is not of type str or pathlib.Path.
+		ValueError: if argument max_workers or chunk_size is less than 1 or a
+			line is not a Commit representation.
+	"""
+	file_path = ensure_path_is_pathlib(file_path, False)
+
+	if max_workers is None:
+		max_workers = os.cpu_count() or 1
+	elif max_workers < 1:
+		raise ValueError("The number of workers must be at least 1.")
+
+	if chunk_size < 1:
+		raise ValueError("The chunk size must be at least 1.")
+
+	chunk_tasks = _iter_chunk_tasks(file_path, chunk_size)
+	max_pending_chunks = max_workers * _CHUNKS_PER_WORKER
+
+	executor = ProcessPoolExecutor(max_workers)
+
+	# The futures are in the order of their chunk in the file.
+	futures = deque()
+
+	def submit_chunks():
+		while len(futures) < max_pending_chunks:
+			chunk_task = next(chunk_tasks, None)
+
+			if chunk_task is None:
+				break
+
+			chunk_function, chunk_args = chunk_task
+			futures.append(executor.submit(chunk_function, *chunk_args))
+
+	try:
+		submit_chunks()
+
+		while len(futures) > 0:
+			if ordered:
+				done_futures = (futures.popleft(),)
+
+			else:
+				done_futures, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+				for future in done_futures:
+					futures.remove(future)
+
+			submit_chunks()
+
+			for future in done_futures:
+				yield from future.result()
+
+	finally:
+		executor.shutdown(cancel_futures=True)
+		chunk_tasks.close()
+
+
+__all__ = [read_commit_reprs_parallel.__name__]
@@ -0,0 +1,337 @@
+# __all__ declared at the module's end
+
+from datetime import\
+	datetime
+import sqlite3
+from threading import\
+	Lock
+
+# strath is an indirect dependency of repr_rw.
+from strath import\
+	ensure_path_is_pathlib
+
+from .github_data import\
+	Commit,\
+	GitHubUser,\
+	RepoIdentity
+from .github_data.commit import\
+	_datetime_to_str
+
+
+_DEFAULT_BATCH_SIZE = 1000 # commits
+
+# SQLite limits the number of parameters in a statement.
+_MAX_SHAS_PER_QUERY = 500
+
+_SQL_COUNT = "SELECT COUNT(*) FROM commits"
+_SQL_CREATE_COMMITS = "CREATE TABLE IF NOT EXISTS commits ("\
+	+ "sha TEXT PRIMARY KEY, message TEXT NOT NULL, "\
+	+ "repository TEXT NOT NULL, moment TEXT NOT NULL, "\
+	+ "author_id INTEGER, author_login TEXT, author_name TEXT)"
+_SQL_CREATE_FILES = "CREATE TABLE IF NOT EXISTS commit_files ("\
+	+ "sha TEXT NOT NULL, position INTEGER NOT NULL, path TEXT NOT NULL, "\
+	+ "PRIMARY KEY (sha, position)) WITHOUT ROWID"
+_SQL_CREATE_INDEXES = (
+	"CREATE INDEX IF NOT EXISTS commits_author_login "\
+		+ "ON commits (author_login, moment)",
+	"CREATE INDEX IF NOT EXISTS commits_moment ON commits (moment)",
+	"CREATE INDEX IF NOT EXISTS commit_files_path ON commit_files (path)"
+)
+_SQL_DELETE_FILES = "DELETE FROM commit_files WHERE sha = ?"
+_SQL_INSERT_FILE =\
+	"INSERT INTO commit_files (sha, position, path) VALUES (?, ?, ?)"
+_SQL_SELECT_COMMITS = "SELECT sha, message, repository, moment, "\
+	+ "author_id, author_login, author_name FROM commits"
+_SQL_SELECT_FILES = "SELECT sha, path FROM commit_files WHERE sha IN "
+_SQL_UPSERT_COMMIT = "INSERT INTO commits (sha, message, repository, "\
+	+ "moment, author_id, author_login, author_name) "\
+	+ "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (sha) DO UPDATE SET "\
+	+ "message = excluded.message, repository = excluded.repository, "\
+	+ "moment = excluded.moment, author_id = excluded.author_id, "\
+	+ "author_login = excluded.author_login, "\
+	+ "author_name = excluded.author_name"
+
+_UTC_SUFFIX_LEN = len("Z")
+
+
+def _moment_to_str(moment):
+	if isinstance(moment, datetime):
+		moment = _datetime_to_str(moment)
+
+	return moment
+
+
+class CommitStore:
+	"""
+	This class stores Commit instances in an SQLite database file and allows
+	to query them without reading every commit. The commits are indexed by
+	SHA, author login, moment and the paths to the files that they changed.
+
+	A commit is identified by its SHA. Adding a commit that the store already
+	contains replaces it, so storing the same commits again, for instance upon
+	repeated synchronizations, does not create duplicates. Consequently, the
+	store keeps one repository per SHA: if a repository and its fork share
+	commits, these commits belong to the repository added last, and
+	find_commits does not provide them for the other one.
+
+	This class is thread-safe. Method close releases the database file. This
+	class can also be used as a context manager, which calls close upon exit.
+	"""
+
+	def __init__(self, file_path):
+		"""
+		The constructor opens or creates the store's database file.
+
+		Parameters:
+			file_path (str or pathlib.Path): the path to the SQLite database
+				file that contains the commits.
+
+		Raises:
+			TypeError: if argument file_path is not of type str or
+				pathlib.Path.
+		"""
+		self._file_path = ensure_path_is_pathlib(file_path, False)
+		self._lock = Lock()
+
+		self._connection = sqlite3.connect(
+			self._file_path, check_same_thread=False)
+		self._connection.execute("PRAGMA journal_mode=WAL")
+		self._connection.execute(_SQL_CREATE_COMMITS)
+		self._connection.execute(_SQL_CREATE_FILES)
+
+		for sql_create_index in _SQL_CREATE_INDEXES:
+			self._connection.execute(sql_create_index)
+
+		self._connection.commit()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def __len__(self):
+		with self._lock:
+			return self._connection.execute(_SQL_COUNT).fetchone()[0]
+
+	def _add_commit_batch(self, commits):
+		# A SHA can appear more than once in a batch, for instance in a
+		# repository and its fork. Like in separate batches, the last commit
+		# replaces the previous ones.
+		unique_commits = {commit.sha: commit for commit in commits}
+		commit_rows = list()
+		file_rows = list()
+
+		for commit in unique_commits.values():
+			author = commit.author
+			commit_rows.append((commit.sha, commit.message,
+				str(commit.repository), commit.moment_to_str(),
+				None if author is None else author.id,
+				None if author is None else author.login,
+				None if author is None else author.name))
+			file_rows.extend((commit.sha, position, path)
+				for position, path in enumerate(commit.files))
+
+		with self._lock:
+			with self._connection:
+				self._connection.executemany(_SQL_UPSERT_COMMIT, commit_rows)
+				self._connection.executemany(_SQL_DELETE_FILES,
+					((sha,) for sha in unique_commits))
+				self._connection.executemany(_SQL_INSERT_FILE, file_rows)
+
+	def add_commits(self, commits, batch_size=_DEFAULT_BATCH_SIZE):
+		"""
+		Stores Commit instances in this store. The commits are inserted in
+		transactions of batch_size commits, which allows to store the commits
+		while they are obtained from a generator like get_repo_commits. A
+		commit whose SHA is already in the store replaces the stored commit.
+
+		Parameters:
+			commits: the Commit instances to store. It can be any iterable
+				object.
+			batch_size (int): the number of commits per transaction. Defaults
+				to 1000.
+
+		Returns:
+			int: the number of stored commits.
+
+		Raises:
+			ValueError: if argument batch_size is less than 1.
+		"""
+		if batch_size < 1:
+			raise ValueError("The batch size must be at least 1.")
+
+		commit_count = 0
+		batch = list()
+
+		for commit in commits:
+			batch.append(commit)
+
+			if len(batch) >= batch_size:
+				self._add_commit_batch(batch)
+				commit_count += len(batch)
+				batch.clear()
+
+		if len(batch) > 0:
+			self._add_commit_batch(batch)
+			commit_count += len(batch)
+
+		return commit_count
+
+	def close(self):
+		"""
+		Closes the database file. The store cannot be used afterwards.
+		"""
+		with self._lock:
+			self._connection.close()
+
+	def _fetch_row_batches(self, cursor):
+		while True:
+			with self._lock:
+				row_batch = cursor.fetchmany(_MAX_SHAS_PER_QUERY)
+
+			if len(row_batch) == 0:
+				break
+
+			yield row_batch
+
+	def find_commits(self, author_login=None, since=None, until=None,
+			file_path=None, repository=None):
+		"""
+		This generator provides the stored commits that match all the
+		specified criteria, from the most recent to the oldest. Each iteration
+		yields a Commit instance. If no criterion is specified, this generator
+		provides all the commits. The commits are read from the database in
+		batches as the iteration advances, so they are not all held in memory.
+
+		Parameters:
+			author_login (str): the login name of the commits' author.
+				Defaults to None.
+			since (str or datetime.datetime): only the commits made at or after
+				this moment are provided. If it is a string, it must match
+				format %Y-%m-%dT%H:%M:%SZ. Defaults to None.
+			until (str or datetime.datetime): only the commits made before
+				this moment are provided. If it is a string, it must match
+				format %Y-%m-%dT%H:%M:%SZ. Defaults to None.
+			file_path (str): the path to a file that the commits changed.
+				Defaults to None.
+			repository (str or RepoIdentity): the repository that contains the
+				commits. A commit shared with another repository is only
+				associated with the repository from which it was added last.
+				Defaults to None.
+
+		Yields:
+			Commit: a stored commit that matches the criteria.
+		"""
+		conditions = list()
+		parameters = list()
+
+		if author_login is not None:
+			conditions.append("author_login = ?")
+			parameters.append(author_login)
+
+		if since is not None:
+			conditions.append("moment >= ?")
+			parameters.append(_moment_to_str(since))
+
+		if until is not None:
+			conditions.append("moment < ?")
+			parameters.append(_moment_to_str(until))
+
+		if file_path is not None:
+			conditions.append(
+				"sha IN (SELECT sha FROM commit_files WHERE path = ?)")
+			parameters.append(file_path)
+
+		if repository is not None:
+			conditions.append("repository = ?")
+			parameters.append(str(repository))
+
+		query = _SQL_SELECT_COMMITS
+
+		if len(conditions) > 0:
+			query += " WHERE " + " AND ".join(conditions)
+
+		query += " ORDER BY moment DESC, sha"
+
+		with self._lock:
+			cursor = self._connection.execute(query, parameters)
+
+		try:
+			yield from self._make_commits(self._fetch_row_batches(cursor))
+		finally:
+			with self._lock:
+				cursor.close()
+
+	def get_commit(self, sha):
+		"""
+		Provides the stored commit identified by a SHA.
+
+		Parameters:
+			sha (str): the SHA hash that identifies the wanted commit.
+
+		Returns:
+			Commit: the stored commit, None if this store does not contain it.
+		"""
+		with self._lock:
+			commit_rows = self._connection.execute(
+				_SQL_SELECT_COMMITS + " WHERE sha = ?", (sha,)).fetchall()
+
+		if len(commit_rows) == 0:
+			return None
+
+		return next(self._make_commits((commit_rows,)))
+
+	def _get_files(self, shas):
+		files = {sha: list() for sha in shas}
+		query = _SQL_SELECT_FILES + "(" + ", ".join("?" * len(shas)) + ")"\
+			+ " ORDER BY sha, position"
+
+		with self._lock:
+			file_rows = self._connection.execute(query, shas).fetchall()
+
+		for sha, path in file_rows:
+			files[sha].append(path)
+
+		return files
+
+	def _make_commits(self, row_batches):
+		# Each batch contains at most _MAX_SHAS_PER_QUERY rows.
+		github_users = dict()
+		repo_identities = dict()
+
+		for row_batch in row_batches:
+			files = self._get_files(tuple(row[0] for row in row_batch))
+
+			for sha, message, full_name, moment, author_id, author_login,\
+					author_name in row_batch:
+				author = None
+
+				if author_login is not None:
+					author_key = (author_id, author_login, author_name)
+					author = github_users.get(author_key)
+
+					if author is None:
+						author = GitHubUser(*author_key)
+						github_users[author_key] = author
+
+				repo_identity = repo_identities.get(full_name)
+				if repo_identity is None:
+					repo_identity = RepoIdentity.from_full_name(full_name)
+					repo_identities[full_name] = repo_identity
+
+				moment = datetime.fromisoformat(moment[:-_UTC_SUFFIX_LEN])
+
+				yield Commit(sha, message, repo_identity, moment, author,
+					files[sha])
+
+	@property
+	def file_path(self):
+		"""
+		pathlib.Path: the path to the SQLite database file that contains the
+			commits.
+		"""
+		return self._file_path
+
+
+__all__ = [CommitStore.__name__]
@@ -0,0 +1,254 @@
+# __all__ declared at the module's end
+
+from datetime import\
+	datetime
+import json
+import os
+
+# strath is an indirect dependency of repr_rw.
+from strath import\
+	ensure_path_is_pathlib
+
+from .github_data.commit import\
+	_datetime_to_str
+
+
+_DEFAULT_SAVE_INTERVAL = 100 # commits
+
+_ENCODING_UTF8 = "utf-8"
+
+_KEY_COMMIT_INDEX = "commit_index"
+_KEY_COMMIT_SHA = "commit_sha"
+_KEY_HEAD_SHA = "head_sha"
+_KEY_INCLUDE_FILES = "include_files"
+_KEY_IS_COMPLETE = "is_complete"
+_KEY_LAST_SHA = "last_sha"
+_KEY_OUTPUT_SIZE = "output_size"
+_KEY_PAGE = "page"
+_KEY_PER_PAGE = "per_page"
+_KEY_POSITION = "position"
+_KEY_QUERY = "query"
+_KEY_REPOSITORY = "repository"
+_KEY_SINCE = "since"
+_KEY_USE_GRAPHQL = "use_graphql"
+
+_TEMP_SUFFIX = ".tmp"
+
+
+class FetchCheckpoint:
+	"""
+	This class records the progress of get_repo_commits in a JSON state file
+	so that an iteration interrupted by an error or by the end of the process
+	can resume where it stopped. While iterating, get_repo_commits records
+	the position of a commit when the next commit is requested, after the
+	consumer has processed it. Method save writes this position in the state
+	file once the recorded commits are stored. A FetchCheckpoint made later
+	with the same file path makes get_repo_commits resume right after that
+	commit, without requesting the previous pages again.
+
+	Function write_commit_reprs calls save every save_interval commits, after
+	flushing its file to the disk, and when the iteration ends. It records
+	the size of its file so that a resumed call truncates the commits written
+	after the last save, which the resumed iteration provides again. Thus,
+	the file contains each commit once. If the process is killed, at most
+	save_interval commits are requested again.
+
+	The commit lists requested after a checkpoint's first page start from
+	the commit that was the most recent one at the beginning of the
+	iteration. Thus, the commits pushed in the meantime do not shift the
+	pages of a resumed iteration. When the iteration ends, the checkpoint is
+	complete, and get_repo_commits yields nothing if it is given a complete
+	checkpoint.
+
+	The state file is replaced atomically, so it always contains a complete
+	state. A checkpoint belongs to one call of get_repo_commits: it records
+	the arguments that select the commits, and another call with different
+	ones raises a ValueError.
+	"""
+
+	def __init__(self, file_path, save_interval=_DEFAULT_SAVE_INTERVAL):
+		"""
+		The constructor loads the state file if it exists. Otherwise, the
+		checkpoint is empty, and the iteration that uses it starts from the
+		most recent commit.
+
+		Parameters:
+			file_path (str or pathlib.Path): the path to the JSON file that
+				contains the checkpoint's state.
+			save_interval (int): the number of commits that write_commit_reprs
+				writes between two saves. Defaults to 100.
+
+		Raises:
+			TypeError: if argument file_path is not of type str or
+				pathlib.Path.
+			ValueError: if argument save_interval is less than 1 or the state
+				file is not valid JSON.
+		"""
+		if save_interval < 1:
+			raise ValueError("The save interval must be at least 1.")
+
+		self._file_path = ensure_path_is_pathlib(file_path, False)
+		self._save_interval = save_interval
+
+		try:
+			state = json.loads(
+				self._file_path.read_text(encoding=_ENCODING_UTF8))
+		except FileNotFoundError:
+			state = dict()
+
+		self._query = state.get(_KEY_QUERY)
+		self._head_sha = state.get(_KEY_HEAD_SHA)
+		self._position = state.get(_KEY_POSITION)
+		self._output_size = state.get(_KEY_OUTPUT_SIZE)
+		self._is_complete = state.get(_KEY_IS_COMPLETE, False)
+
+		# The position is checked against the first page that is obtained.
+		self._is_resuming = self._position is not None
+
+	def _advance(self, page, commit_index, commit_sha):
+		# Called by the engines of get_repo_commits after each commit. The new
+		# position is written by the next save.
+		self._position = {
+			_KEY_PAGE: page,
+			_KEY_COMMIT_INDEX: commit_index,
+			_KEY_COMMIT_SHA: commit_sha
+		}
+
+	def _begin(self, repository, per_page, since, last_sha, use_graphql,
+			include_files):
+		if isinstance(since, datetime):
+			since = _datetime_to_str(since)
+
+		query = {
+			_KEY_REPOSITORY: repository,
+			_KEY_PER_PAGE: per_page,
+			_KEY_SINCE: since,
+			_KEY_LAST_SHA: last_sha,
+			_KEY_USE_GRAPHQL: use_graphql,
+			_KEY_INCLUDE_FILES: include_files
+		}
+
+		if self._query is None:
+			self._query = query
+		elif self._query != query:
+			raise ValueError(f"Checkpoint {self._file_path} was recorded "
+				+ f"for other arguments of get_repo_commits: {self._query}.")
+
+	def _finish(self):
+		self._is_complete = True
+
+	def _get_start_index(self, commit_shas):
+		"""
+		Provides the index of the first commit to yield from a page. If the
+		iteration resumes, the first page obtained is the one where it
+		stopped, and the commits already provided are skipped. Otherwise, all
+		the commits are yielded. The first commit of the iteration's first
+		page is recorded as the head of the history.
+
+		Parameters:
+			commit_shas (list): the SHAs of the commits from a page.
+
+		Returns:
+			int: the index of the first commit to yield from the page.
+
+		Raises:
+			ValueError: if the page does not contain the commit where the
+				iteration stopped at the recorded index.
+		"""
+		if self._head_sha is None and len(commit_shas) > 0:
+			self._head_sha = commit_shas[0]
+
+		if not self._is_resuming:
+			return 0
+
+		self._is_resuming = False
+		commit_index = self._position[_KEY_COMMIT_INDEX]
+		commit_sha = self._position[_KEY_COMMIT_SHA]
+
+		if commit_index > len(commit_shas)\
+				or commit_shas[commit_index - 1] != commit_sha:
+			raise ValueError(f"Checkpoint {self._file_path} does not match "
+				+ f"the commit history: commit {commit_sha} is not at index "
+				+ f"{commit_index - 1} of its page anymore.")
+
+		return commit_index
+
+	def _get_start_page(self, first_page):
+		# The page where the iteration stopped, the first page otherwise
+		if self._position is None:
+			return first_page
+
+		return self._position[_KEY_PAGE]
+
+	def save(self, output_size=None):
+		"""
+		Writes the position of the last commit recorded by get_repo_commits in
+		the state file. The commit being processed is not recorded yet, and a
+		resumed iteration provides it again. Call this method only once the
+		recorded commits are stored. The state file is replaced atomically.
+
+		Parameters:
+			output_size (int): the size in bytes of the file that contains the
+				commits, which write_commit_reprs truncates to this size when
+				the iteration resumes. Defaults to None.
+		"""
+		self._output_size = output_size
+		state = {
+			_KEY_QUERY: self._query,
+			_KEY_HEAD_SHA: self._head_sha,
+			_KEY_POSITION: self._position,
+			_KEY_OUTPUT_SIZE: self._output_size,
+			_KEY_IS_COMPLETE: self._is_complete
+		}
+
+		temp_path = self._file_path.with_name(
+			self._file_path.name + _TEMP_SUFFIX)
+
+		with temp_path.open(mode="w", encoding=_ENCODING_UTF8) as temp_file:
+			json.dump(state, temp_file)
+			temp_file.flush()
+			os.fsync(temp_file.fileno())
+
+		os.replace(temp_path, self._file_path)
+
+	@property
+	def file_path(self):
+		"""
+		pathlib.Path: the path to the JSON file that contains the checkpoint's
+			state.
+		"""
+		return self._file_path
+
+	@property
+	def head_sha(self):
+		"""
+		str: the SHA of the most recent commit at the beginning of the
+			iteration, None if no page was obtained.
+		"""
+		return self._head_sha
+
+	@property
+	def is_complete(self):
+		"""
+		bool: True if the iteration ended, False otherwise.
+		"""
+		return self._is_complete
+
+	@property
+	def output_size(self):
+		"""
+		int: the size in bytes of the file that contains the commits at the
+			last save, None if it is unknown.
+		"""
+		return self._output_size
+
+	@property
+	def save_interval(self):
+		"""
+		int: the number of commits that write_commit_reprs writes between two
+			saves.
+		"""
+		return self._save_interval
+
+
+__all__ = [FetchCheckpoint.__name__]
@@ -1,24 +1,50 @@
 # __all__ declared at the module's end
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from sys import intern
 
 from .repo_identity import RepoIdentity
 
 
 _DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 
+_EPOCH = datetime(1970, 1, 1)
+_ONE_SECOND = timedelta(seconds=1)
+
 def _datetime_from_str(datetime_str):
 	return datetime.strptime(datetime_str, _DATETIME_FORMAT)
 
 def _datetime_to_str(datetime_obj):
 	return datetime.strftime(datetime_obj, _DATETIME_FORMAT)
 
+def _decode_moment(encoded_moment):
+	if isinstance(encoded_moment, int):
+		return _EPOCH + timedelta(seconds=encoded_moment)
+
+	return encoded_moment
+
+def _encode_moment(moment):
+	# An int takes less memory than a datetime. The conversion is lossless if
+	# the moment is naive and has no microseconds, like the moments from the
+	# GitHub API.
+	if moment.tzinfo is None and moment.microsecond == 0:
+		return (moment - _EPOCH) // _ONE_SECOND
+
+	return moment
+
 
 class Commit:
 	"""
 	A commit in a GitHub repository.
+
+	To reduce memory usage, this class has no instance dictionary, the paths
+	to the files are interned so that equal paths are shared by the commits,
+	and the moment is stored as a number of seconds when it is lossless.
 	"""
 
+	__slots__ = (
+		"_sha", "_message", "_repository", "_moment", "_author", "_files")
+
 	def __init__(self, sha, message, repository, moment, author, files):
 		"""
 		The GitHub commit constructor.
@@ -50,12 +76,12 @@ class Commit:
 			if isinstance(repository, str)\
 			else repository
 
-		self._moment =\
+		self._moment = _encode_moment(
 			_datetime_from_str(moment)\
 			if isinstance(moment, str)\
-			else moment
+			else moment)
 
-		self._files = tuple(files)
+		self._files = tuple(map(intern, files))
 
 	def __repr__(self):
 		arguments = (
@@ -96,7 +122,7 @@ class Commit:
 		"""
 		datetime.datetime: the moment when this commit was made.
 		"""
-		return self._moment
+		return _decode_moment(self._moment)
 
 	def moment_to_str(self):
 		"""
@@ -106,7 +132,7 @@ class Commit:
 		Returns:
 			str: the moment when this commit was made.
 		"""
-		return _datetime_to_str(self._moment)
+		return _datetime_to_str(_decode_moment(self._moment))
 
 	@property
 	def repository(self):
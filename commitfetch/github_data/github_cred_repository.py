@@ -1,5 +1,16 @@
 # __all__ declared at the module's end
 
+from threading import\
+	Lock
+from time import\
+	time
+
+
+_REQUEST_LIMIT = 5000
+
+# Waiting slightly past a reset moment guarantees that the reset has occurred.
+_RESET_MARGIN = 2 # seconds
+
 
 class GitHubCredRepository:
 	"""
@@ -12,6 +23,11 @@ class GitHubCredRepository:
 	Each credential allows to send 5000 requests per hour to the GitHub API. To
 	facilitate making many requests in a short period, this class allows to
 	iterate through the credentials.
+
+	This class can also keep track of the rate limit of each credential as
+	reported by the GitHub API. It then provides the credential that has the
+	most remaining requests and the time to wait until a credential becomes
+	usable again. The rate limit tracking is thread-safe.
 	"""
 
 	def __init__(self, credentials):
@@ -28,8 +44,37 @@ class GitHubCredRepository:
 		if len(self._credentials) < 1:
 			raise ValueError("At least one credential must be provided.")
 
+		# Each credential is mapped to its number of remaining requests and
+		# the moment when its rate limit resets. Unknown values are None.
+		self._rate_limits = {cred: (None, None) for cred in self._credentials}
+		self._rate_limit_lock = Lock()
+
 		self.reset_credential_iter()
 
+	def get_best_credential(self):
+		"""
+		Provides the credential that has the most remaining requests according
+		to the rate limits recorded by method update_rate_limit. A credential
+		whose rate limit is unknown or has been reset is considered unused.
+
+		Returns:
+			tuple: the credential that has the most remaining requests, None
+				if no credential has remaining requests.
+		"""
+		now = time()
+		best_credential = None
+		best_remaining = 0
+
+		with self._rate_limit_lock:
+			for credential in self._credentials:
+				remaining = self._get_remaining_requests(credential, now)
+
+				if remaining > best_remaining:
+					best_credential = credential
+					best_remaining = remaining
+
+		return best_credential
+
 	def get_next_credential(self):
 		"""
 		The next unused credential becomes the current credential unless all
@@ -46,6 +91,79 @@ class GitHubCredRepository:
 
 		return credential
 
+	def _get_remaining_requests(self, credential, now):
+		remaining, reset_moment = self._rate_limits[credential]
+
+		if remaining is None or (reset_moment is not None
+				and reset_moment <= now):
+			return _REQUEST_LIMIT
+
+		return remaining
+
+	def get_remaining_requests(self, credential):
+		"""
+		Provides the number of requests that a credential can still send
+		according to the rate limits recorded by method update_rate_limit.
+
+		Parameters:
+			credential (tuple): a credential stored in this instance.
+
+		Returns:
+			int: the number of remaining requests. It is 5000 if the rate limit
+				is unknown or has been reset.
+
+		Raises:
+			KeyError: if this instance does not contain argument credential.
+		"""
+		with self._rate_limit_lock:
+			return self._get_remaining_requests(credential, time())
+
+	def get_wait_time(self):
+		"""
+		Provides the time to wait until a credential has remaining requests
+		according to the rate limits recorded by method update_rate_limit. If
+		the reset moments are unknown, the time to wait is 2 seconds.
+
+		Returns:
+			float: the number of seconds to wait, 0 if a credential has
+				remaining requests.
+		"""
+		now = time()
+		earliest_reset = None
+
+		with self._rate_limit_lock:
+			for credential in self._credentials:
+				if self._get_remaining_requests(credential, now) > 0:
+					return 0
+
+				reset_moment = self._rate_limits[credential][1]
+				if reset_moment is not None and (earliest_reset is None
+						or reset_moment < earliest_reset):
+					earliest_reset = reset_moment
+
+		if earliest_reset is None:
+			return _RESET_MARGIN
+
+		return max(earliest_reset - now, 0) + _RESET_MARGIN
+
+	def get_reset_moment(self, credential):
+		"""
+		Provides the moment when a credential's rate limit resets according to
+		the rate limits recorded by method update_rate_limit.
+
+		Parameters:
+			credential (tuple): a credential stored in this instance.
+
+		Returns:
+			float: the reset moment in seconds since the Unix epoch, None if it
+				is unknown. It can be in the past.
+
+		Raises:
+			KeyError: if this instance does not contain argument credential.
+		"""
+		with self._rate_limit_lock:
+			return self._rate_limits[credential][1]
+
 	def reset_credential_iter(self):
 		"""
 		Resets the itertion through the credentials performed by method
@@ -53,6 +171,54 @@ class GitHubCredRepository:
 		"""
 		self._cred_iterator = iter(self._credentials)
 
+	def update_rate_limit(self, credential, remaining, reset_moment):
+		"""
+		Records the rate limit of a credential, as indicated by headers
+		X-RateLimit-Remaining and X-RateLimit-Reset of a response from the
+		GitHub API. To make a credential unusable for some time, for instance
+		upon exceeding a secondary rate limit, record 0 remaining requests and
+		the moment when the credential can be used again.
+
+		Concurrent responses can be received in another order than they were
+		sent. Thus, until the recorded reset moment, the rate limits of older
+		responses are ignored. For the same reset moment, the lowest number of
+		remaining requests is kept. Remaining requests for an earlier reset
+		moment are ignored, but 0 remaining requests until an earlier moment
+		that is not past make the credential unusable. A credential that has
+		no remaining requests stays unusable until its reset moment, which can
+		only be postponed.
+
+		Parameters:
+			credential (tuple): a credential stored in this instance.
+			remaining (int): the number of requests that the credential can
+				still send.
+			reset_moment (float): the moment when the rate limit resets, in
+				seconds since the Unix epoch.
+
+		Raises:
+			KeyError: if this instance does not contain argument credential.
+		"""
+		with self._rate_limit_lock:
+			if credential not in self._rate_limits:
+				raise KeyError(f"Unknown credential for user {credential[0]}.")
+
+			now = time()
+			recorded_remaining, recorded_reset = self._rate_limits[credential]
+
+			if recorded_reset is not None and recorded_reset > now:
+				if recorded_remaining == 0:
+					if remaining > 0 or reset_moment <= recorded_reset:
+						return
+
+				elif reset_moment == recorded_reset:
+					remaining = min(remaining, recorded_remaining)
+
+				elif reset_moment < recorded_reset\
+						and (remaining > 0 or reset_moment <= now):
+					return
+
+			self._rate_limits[credential] = (remaining, reset_moment)
+
 	@property
 	def credentials(self):
 		"""
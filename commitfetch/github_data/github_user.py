@@ -12,6 +12,8 @@ class GitHubUser:
 	# This class must stay immutable because instances are
 	# stored in singleton GitHubUserRepository to be reused.
 
+	__slots__ = ("_id", "_login", "_name")
+
 	def __init__(self, id, login, name):
 		"""
 		The constructor needs the user's ID, login name and real name.
@@ -38,6 +40,9 @@ class GitHubUser:
 			and self._login == value._login\
 			and self._name == value._name
 
+	def __hash__(self):
+		return hash((self._id, self._login, self._name))
+
 	@property
 	def id(self):
 		"""
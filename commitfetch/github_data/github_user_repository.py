@@ -6,6 +6,11 @@ class GitHubUserRepository:
 	This singleton stores GitHubUser instances identified by their property
 	login. Thus, it helps preventing the creation of many identical GitHubUser
 	instances.
+
+	This repository can be backed by a persistent cache, like a
+	GitHubUserCache, set with method set_cache. The users missing from this
+	repository are then looked for in the cache, and the registered users are
+	stored in the cache.
 	"""
 
 	_instance = None
@@ -14,6 +19,7 @@ class GitHubUserRepository:
 		if cls._instance is None:
 			cls._instance = super().__new__(cls)
 			cls._instance._content = dict()
+			cls._instance._cache = None
 
 		return cls._instance
 
@@ -27,9 +33,17 @@ class GitHubUserRepository:
 
 		Returns:
 			GitHubUser: data about the specified GitHub user, None if the user
-				is not registered.
+				is neither registered nor in the cache.
 		"""
 		github_user = self._content.get(user_login)
+
+		if github_user is None and self._cache is not None:
+			github_user = self._cache.get_user(user_login)
+
+			if github_user is not None:
+				# The user is already in the cache.
+				github_user = self._content.setdefault(user_login, github_user)
+
 		return github_user
 
 	def register_user(self, github_user):
@@ -50,7 +64,29 @@ class GitHubUserRepository:
 			self._content[user_login] = github_user
 			was_user_registered = True
 
+			if self._cache is not None:
+				self._cache.put_user(github_user)
+
 		return was_user_registered
 
+	def set_cache(self, cache):
+		"""
+		Sets the persistent cache that backs this repository. The cache must
+		have methods get_user and put_user like GitHubUserCache.
+
+		Parameters:
+			cache (GitHubUserCache): the persistent cache of GitHub users. If
+				it is None, this repository stops using a cache.
+		"""
+		self._cache = cache
+
+	@property
+	def cache(self):
+		"""
+		GitHubUserCache: the persistent cache that backs this repository, None
+			if there is no cache.
+		"""
+		return self._cache
+
 
 __all__ = [GitHubUserRepository.__name__]
@@ -3,6 +3,9 @@
 
 _SLASH = "/"
 
+# Maps the full names to the shared instances made by from_full_name.
+_INSTANCES = dict()
+
 
 class RepoIdentity:
 	"""
@@ -10,6 +13,11 @@ class RepoIdentity:
 	repository's name, which constitute the repository's identity.
 	"""
 
+	# This class must stay immutable because from_full_name shares its
+	# instances.
+
+	__slots__ = ("_owner", "_name")
+
 	def __init__(self, owner, name):
 		"""
 		The constructor requires the repository's owner and name.
@@ -34,11 +42,20 @@ class RepoIdentity:
 
 		return self._owner == value._owner and self._name == value._name
 
+	def __hash__(self):
+		return hash((self._owner, self._name))
+
+	def __reduce__(self):
+		# Unpickled instances are shared like those made by from_full_name.
+		return (RepoIdentity.from_full_name, (self.get_full_name(),))
+
 	@staticmethod
 	def from_full_name(full_name):
 		"""
-		Makes a RepoIdentity from a repository's full name, in the format
-		<owner>/<name>.
+		Provides a RepoIdentity from a repository's full name, in the format
+		<owner>/<name>. The instances are cached so that all the calls with the
+		same full name return the same instance, which saves memory when many
+		commits belong to the same repository.
 
 		Parameters:
 			full_name (str): a repository's full name in the prescibed format.
@@ -49,13 +66,18 @@ class RepoIdentity:
 		Raises:
 			ValueError: if parameter full_name is not in the expected format.
 		"""
+		repo_identity = _INSTANCES.get(full_name)
+		if repo_identity is not None:
+			return repo_identity
+
 		split_name = full_name.split(_SLASH)
 
 		if len(split_name) != 2:
 			raise ValueError(
 				"The repository name must be in the format <owner>/<name>.")
 
-		return RepoIdentity(split_name[0], split_name[1])
+		repo_identity = RepoIdentity(split_name[0], split_name[1])
+		return _INSTANCES.setdefault(full_name, repo_identity)
 
 	def get_full_name(self, separator=_SLASH):
 		"""
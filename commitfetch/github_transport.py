@@ -0,0 +1,367 @@
+# __all__ declared at the module's end
+
+from threading import\
+	Lock
+
+import requests
+from requests.adapters import\
+	HTTPAdapter
+
+
+_DEFAULT_API_URL = "https://api.github.com"
+_DEFAULT_BACKOFF_FACTOR = 1 # second
+_DEFAULT_MAX_BACKOFF = 60 # seconds
+_DEFAULT_MAX_RETRIES = 3
+_DEFAULT_POOL_SIZE = 10
+# The connection and read timeouts in seconds
+_DEFAULT_TIMEOUT = (10, 60)
+
+_HEADER_ACCEPT = "Accept"
+_HEADER_ACCEPT_ENCODING = "Accept-Encoding"
+_HEADER_ETAG = "ETag"
+_HEADER_IF_MODIFIED_SINCE = "If-Modified-Since"
+_HEADER_IF_NONE_MATCH = "If-None-Match"
+_HEADER_LAST_MODIFIED = "Last-Modified"
+_HEADER_LINK = "Link"
+
+# The cache keeps these headers with the content of the responses.
+_CACHED_HEADERS = (_HEADER_ETAG, _HEADER_LAST_MODIFIED, _HEADER_LINK)
+
+_DEFAULT_HEADERS = {
+	_HEADER_ACCEPT: "application/vnd.github+json",
+	_HEADER_ACCEPT_ENCODING: "gzip, deflate"
+}
+
+_PREFIX_HTTP = "http://"
+_PREFIX_HTTPS = "https://"
+
+_SLASH = "/"
+
+_STATUS_200 = 200
+_STATUS_304 = 304
+
+
+def _make_cached_response(url, content, cached_headers, headers):
+	# If argument headers is None, no request was sent. Like in library
+	# requests-cache, attribute from_cache indicates it.
+	response = requests.Response()
+	response.status_code = _STATUS_200
+	response.url = url
+	response._content = content
+	response.headers.update(cached_headers)
+
+	if headers is not None:
+		response.headers.update(headers)
+
+	response.from_cache = headers is None
+	return response
+
+
+class GitHubTransport:
+	"""
+	This class sends HTTP requests to the GitHub API. It keeps one
+	requests.Session per GitHub credential. Each session holds a pool of
+	persistent connections, which lets consecutive requests reuse connections
+	instead of opening a new one and performing a TLS handshake every time.
+
+	If this transport has a ResponseCache, it serves the responses to
+	immutable requests from the cache and revalidates the other cached
+	responses with conditional requests.
+
+	The functions that send requests through this transport retry a request
+	that fails because of a connection error, a timeout or a server error
+	(status 5xx). The delay before a retry grows exponentially with a random
+	jitter, which spreads the retries of concurrent requests.
+
+	If this transport has a RequestObserver, the functions that send requests
+	through it report their requests, rate limit waits, credential switches
+	and user lookups to the observer.
+
+	An instance can be shared by several calls of get_repo_commits. Method
+	close releases the connections. This class can also be used as a context
+	manager, which calls close upon exit.
+	"""
+
+	def __init__(self, pool_size=_DEFAULT_POOL_SIZE, timeout=_DEFAULT_TIMEOUT,
+			headers=None, session_factory=None, cache=None,
+			api_url=_DEFAULT_API_URL, observer=None,
+			max_retries=_DEFAULT_MAX_RETRIES,
+			backoff_factor=_DEFAULT_BACKOFF_FACTOR,
+			max_backoff=_DEFAULT_MAX_BACKOFF):
+		"""
+		The constructor allows to configure the sessions that this transport
+		will create.
+
+		Parameters:
+			pool_size (int): the maximum number of connections kept alive per
+				host in each session. Defaults to 10.
+			timeout (float or tuple): the number of seconds to wait for the
+				server, as accepted by requests. A tuple sets the connection
+				and read timeouts separately. None means no timeout. Defaults
+				to (10, 60).
+			headers (dict): HTTP headers to send with every request in
+				addition to, or instead of, the default Accept and
+				Accept-Encoding headers. Defaults to None.
+			session_factory (callable): it takes a credential and returns a
+				requests.Session. This transport sets the session's
+				authentication, but keeps its adapters and headers. Defaults
+				to None, in which case this transport makes the sessions.
+			cache (ResponseCache): stores the responses to avoid or reduce
+				later requests. Defaults to None.
+			api_url (str): the root URL of the GitHub API. Another value
+				allows to use GitHub Enterprise or a local stand-in for the
+				API. Defaults to https://api.github.com.
+			observer (RequestObserver): is notified of the requests and of
+				the related events. Defaults to None.
+			max_retries (int): the maximum number of retries of a request
+				that failed because of a connection error, a timeout or a
+				server error. Defaults to 3.
+			backoff_factor (float): the maximum delay in seconds before the
+				first retry. This maximum doubles for each following retry.
+				Defaults to 1.
+			max_backoff (float): the upper limit of the delay in seconds
+				before a retry. Defaults to 60.
+
+		Raises:
+			ValueError: if argument pool_size is less than 1 or argument
+				max_retries is negative.
+		"""
+		if pool_size < 1:
+			raise ValueError("The pool size must be at least 1.")
+
+		if max_retries < 0:
+			raise ValueError("The number of retries cannot be negative.")
+
+		self._api_url = api_url.rstrip(_SLASH)
+		self._pool_size = pool_size
+		self._timeout = timeout
+		self._session_factory = session_factory
+		self._cache = cache
+		self._observer = observer
+		self._max_retries = max_retries
+		self._backoff_factor = backoff_factor
+		self._max_backoff = max_backoff
+
+		self._headers = dict(_DEFAULT_HEADERS)
+		if headers is not None:
+			self._headers.update(headers)
+
+		self._sessions = dict()
+		self._session_lock = Lock()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def close(self):
+		"""
+		Closes the sessions and their connections. A later request opens a new
+		session.
+		"""
+		with self._session_lock:
+			sessions = tuple(self._sessions.values())
+			self._sessions.clear()
+
+		for session in sessions:
+			session.close()
+
+	def get(self, url, credential, params=None, headers=None,
+			is_immutable=False, stream=False):
+		"""
+		Sends a GET request through the session of the given credential.
+
+		If this transport has a cache and the request has no parameters, the
+		response is cached. If argument is_immutable is True, a cached
+		response is returned without sending a request, and its attribute
+		from_cache is True. Otherwise, the
+		request is conditional, and a response with status 304 (Not Modified)
+		is replaced by a response that has the cached content and status 200.
+
+		If argument stream is True and the response is not cached, the
+		response's content is not read before this method returns. The caller
+		can then read it in chunks and must close the response.
+
+		Parameters:
+			url (str): the requested URL.
+			credential (tuple): a GitHub credential consisting of a username
+				(str, index 0) and a PAT (str, index 1).
+			params (dict): the query string parameters. Defaults to None.
+			headers (dict): headers specific to this request. Defaults to
+				None.
+			is_immutable (bool): indicates that the requested resource never
+				changes. Defaults to False.
+			stream (bool): defers the reading of the response's content.
+				Defaults to False.
+
+		Returns:
+			requests.Response: the response from the GitHub API.
+
+		Raises:
+			requests.RequestException: if the request could not be completed.
+		"""
+		session = self.get_session(credential)
+
+		if self._cache is None or params is not None:
+			return session.get(url, params=params, headers=headers,
+				timeout=self._timeout, stream=stream)
+
+		cache_entry = self._cache.get(url)
+
+		if cache_entry is not None:
+			cached_headers, content = cache_entry
+
+			if is_immutable:
+				return _make_cached_response(
+					url, content, cached_headers, None)
+
+			etag = cached_headers.get(_HEADER_ETAG)
+			last_modified = cached_headers.get(_HEADER_LAST_MODIFIED)
+
+			headers = dict() if headers is None else dict(headers)
+			if etag is not None:
+				headers[_HEADER_IF_NONE_MATCH] = etag
+			if last_modified is not None:
+				headers[_HEADER_IF_MODIFIED_SINCE] = last_modified
+
+		response = session.get(url, headers=headers, timeout=self._timeout)
+
+		if response.status_code == _STATUS_304 and cache_entry is not None:
+			# The new headers contain the rate limit information.
+			response = _make_cached_response(
+				url, content, cached_headers, response.headers)
+
+		elif response.status_code == _STATUS_200:
+			cached_headers = {name: response.headers[name]
+				for name in _CACHED_HEADERS if name in response.headers}
+			self._cache.put(url, cached_headers, response.content)
+
+		return response
+
+	def get_session(self, credential):
+		"""
+		Provides the session associated with a credential. This method creates
+		the session if it does not exist.
+
+		Parameters:
+			credential (tuple): a GitHub credential consisting of a username
+				(str, index 0) and a PAT (str, index 1).
+
+		Returns:
+			requests.Session: the session that authenticates its requests with
+				the given credential.
+		"""
+		session = self._sessions.get(credential)
+		if session is not None:
+			return session
+
+		with self._session_lock:
+			session = self._sessions.get(credential)
+
+			if session is None:
+				session = self._make_session(credential)
+				self._sessions[credential] = session
+
+		return session
+
+	def _make_session(self, credential):
+		if self._session_factory is not None:
+			session = self._session_factory(credential)
+
+		else:
+			session = requests.Session()
+			session.headers.update(self._headers)
+
+			adapter = HTTPAdapter(
+				pool_connections=self._pool_size,
+				pool_maxsize=self._pool_size)
+			session.mount(_PREFIX_HTTPS, adapter)
+			session.mount(_PREFIX_HTTP, adapter)
+
+		session.auth = credential
+		return session
+
+	def post(self, url, credential, json_data):
+		"""
+		Sends a POST request whose body is JSON data through the session of the
+		given credential. The response is never cached.
+
+		Parameters:
+			url (str): the requested URL.
+			credential (tuple): a GitHub credential consisting of a username
+				(str, index 0) and a PAT (str, index 1).
+			json_data: the request's body, which will be serialized to JSON.
+
+		Returns:
+			requests.Response: the response from the GitHub API.
+
+		Raises:
+			requests.RequestException: if the request could not be completed.
+		"""
+		session = self.get_session(credential)
+		return session.post(url, json=json_data, timeout=self._timeout)
+
+	@property
+	def api_url(self):
+		"""
+		str: the root URL of the GitHub API, without a final slash.
+		"""
+		return self._api_url
+
+	@property
+	def backoff_factor(self):
+		"""
+		float: the maximum delay in seconds before the first retry of a
+			request.
+		"""
+		return self._backoff_factor
+
+	@property
+	def cache(self):
+		"""
+		ResponseCache: the cache of the responses, None if this transport does
+			not cache responses.
+		"""
+		return self._cache
+
+	@property
+	def max_backoff(self):
+		"""
+		float: the upper limit of the delay in seconds before a retry.
+		"""
+		return self._max_backoff
+
+	@property
+	def max_retries(self):
+		"""
+		int: the maximum number of retries of a request.
+		"""
+		return self._max_retries
+
+	@property
+	def observer(self):
+		"""
+		RequestObserver: the observer of the requests, None if the requests
+			are not observed.
+		"""
+		return self._observer
+
+	@property
+	def pool_size(self):
+		"""
+		int: the maximum number of connections kept alive per host in each
+			session.
+		"""
+		return self._pool_size
+
+	@property
+	def timeout(self):
+		"""
+		float or tuple: the number of seconds to wait for the server, None if
+			there is no timeout.
+		"""
+		return self._timeout
+
+
+__all__ = [GitHubTransport.__name__]
@@ -0,0 +1,252 @@
+# __all__ declared at the module's end
+
+import asyncio
+from collections import\
+	namedtuple
+
+try:
+	import aiohttp
+except ImportError:
+	# aiohttp is an optional dependency.
+	aiohttp = None
+
+
+_DEFAULT_API_URL = "https://api.github.com"
+_DEFAULT_BACKOFF_FACTOR = 1 # second
+_DEFAULT_MAX_BACKOFF = 60 # seconds
+_DEFAULT_MAX_CONCURRENCY = 100
+_DEFAULT_MAX_RETRIES = 3
+_DEFAULT_POOL_SIZE = 100
+# The connection and read timeouts in seconds
+_DEFAULT_TIMEOUT = (10, 60)
+
+_HEADER_ACCEPT = "Accept"
+_HEADER_ACCEPT_ENCODING = "Accept-Encoding"
+
+_DEFAULT_HEADERS = {
+	_HEADER_ACCEPT: "application/vnd.github+json",
+	_HEADER_ACCEPT_ENCODING: "gzip, deflate"
+}
+
+_SLASH = "/"
+
+
+# The fields have the names of the matching attributes of requests.Response.
+_AsyncResponse = namedtuple(
+	"_AsyncResponse", ("url", "status_code", "headers", "content"))
+
+
+class AsyncGitHubTransport:
+	"""
+	This class sends HTTP requests to the GitHub API from an asyncio event
+	loop. All its requests go through one aiohttp.ClientSession, whose
+	connection pool is shared by every credential, and a semaphore limits the
+	number of requests in progress.
+
+	Like GitHubTransport, this transport has a timeout and a number of retries
+	for the requests that fail because of a connection error, a timeout or a
+	server error. If it has a RequestObserver, get_repo_commits_async reports
+	the requests and the related events to it.
+
+	An instance can be shared by several concurrent calls of
+	get_repo_commits_async. Coroutine close releases the connections. This
+	class can also be used as an asynchronous context manager, which calls
+	close upon exit.
+
+	This class requires package aiohttp.
+	"""
+
+	def __init__(self, pool_size=_DEFAULT_POOL_SIZE,
+			max_concurrency=_DEFAULT_MAX_CONCURRENCY, timeout=_DEFAULT_TIMEOUT,
+			headers=None, api_url=_DEFAULT_API_URL, observer=None,
+			max_retries=_DEFAULT_MAX_RETRIES,
+			backoff_factor=_DEFAULT_BACKOFF_FACTOR,
+			max_backoff=_DEFAULT_MAX_BACKOFF):
+		"""
+		The constructor allows to configure the session that this transport
+		will create upon its first request.
+
+		Parameters:
+			pool_size (int): the maximum number of simultaneous connections.
+				Defaults to 100.
+			max_concurrency (int): the maximum number of requests in progress.
+				Defaults to 100.
+			timeout (float or tuple): the total number of seconds allowed for
+				a request. A tuple sets the connection timeout and the
+				timeout of each read from the connection instead. None means
+				no timeout. Defaults to (10, 60).
+			headers (dict): HTTP headers to send with every request in
+				addition to, or instead of, the default Accept and
+				Accept-Encoding headers. Defaults to None.
+			api_url (str): the root URL of the GitHub API. Another value
+				allows to use GitHub Enterprise or a local stand-in for the
+				API. Defaults to https://api.github.com.
+			observer (RequestObserver): is notified of the requests and of
+				the related events. Defaults to None.
+			max_retries (int): the maximum number of retries of a request
+				that failed because of a connection error, a timeout or a
+				server error. Defaults to 3.
+			backoff_factor (float): the maximum delay in seconds before the
+				first retry. This maximum doubles for each following retry.
+				Defaults to 1.
+			max_backoff (float): the upper limit of the delay in seconds
+				before a retry. Defaults to 60.
+
+		Raises:
+			ImportError: if aiohttp is not installed.
+			ValueError: if argument pool_size or max_concurrency is less than
+				1 or argument max_retries is negative.
+		"""
+		if aiohttp is None:
+			raise ImportError(
+				f"{self.__class__.__name__} requires package aiohttp.")
+
+		if pool_size < 1:
+			raise ValueError("The pool size must be at least 1.")
+
+		if max_concurrency < 1:
+			raise ValueError("The maximum concurrency must be at least 1.")
+
+		if max_retries < 0:
+			raise ValueError("The number of retries cannot be negative.")
+
+		self._api_url = api_url.rstrip(_SLASH)
+		self._pool_size = pool_size
+		self._max_concurrency = max_concurrency
+		self._observer = observer
+		self._max_retries = max_retries
+		self._backoff_factor = backoff_factor
+		self._max_backoff = max_backoff
+
+		if isinstance(timeout, tuple):
+			self._timeout = aiohttp.ClientTimeout(
+				sock_connect=timeout[0], sock_read=timeout[1])
+		else:
+			self._timeout = aiohttp.ClientTimeout(total=timeout)
+
+		self._headers = dict(_DEFAULT_HEADERS)
+		if headers is not None:
+			self._headers.update(headers)
+
+		self._auths = dict()
+		self._semaphore = asyncio.Semaphore(max_concurrency)
+		self._session = None
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc_value, traceback):
+		await self.close()
+
+	async def close(self):
+		"""
+		Closes the session and its connections. A later request opens a new
+		session.
+		"""
+		session = self._session
+		self._session = None
+
+		if session is not None:
+			await session.close()
+
+	async def get(self, url, credential, params=None, headers=None):
+		"""
+		Sends a GET request authenticated with the given credential and reads
+		the whole response. Like a requests.Response, the returned object has
+		attributes url, status_code, headers and content.
+
+		Parameters:
+			url (str): the requested URL.
+			credential (tuple): a GitHub credential consisting of a username
+				(str, index 0) and a PAT (str, index 1).
+			params (dict): the query string parameters. Defaults to None.
+			headers (dict): headers specific to this request. Defaults to
+				None.
+
+		Returns:
+			namedtuple: the response from the GitHub API.
+
+		Raises:
+			aiohttp.ClientError: if the request could not be completed.
+		"""
+		session = self._get_session()
+		auth = self._get_auth(credential)
+
+		async with self._semaphore:
+			async with session.get(url,
+					params=params, headers=headers, auth=auth) as response:
+				content = await response.read()
+
+		return _AsyncResponse(
+			str(response.url), response.status, response.headers, content)
+
+	def _get_auth(self, credential):
+		auth = self._auths.get(credential)
+
+		if auth is None:
+			auth = aiohttp.BasicAuth(credential[0], credential[1])
+			self._auths[credential] = auth
+
+		return auth
+
+	def _get_session(self):
+		if self._session is None:
+			connector = aiohttp.TCPConnector(limit=self._pool_size)
+			self._session = aiohttp.ClientSession(connector=connector,
+				headers=self._headers, timeout=self._timeout)
+
+		return self._session
+
+	@property
+	def api_url(self):
+		"""
+		str: the root URL of the GitHub API, without a final slash.
+		"""
+		return self._api_url
+
+	@property
+	def backoff_factor(self):
+		"""
+		float: the maximum delay in seconds before the first retry of a
+			request.
+		"""
+		return self._backoff_factor
+
+	@property
+	def max_backoff(self):
+		"""
+		float: the upper limit of the delay in seconds before a retry.
+		"""
+		return self._max_backoff
+
+	@property
+	def max_concurrency(self):
+		"""
+		int: the maximum number of requests in progress.
+		"""
+		return self._max_concurrency
+
+	@property
+	def max_retries(self):
+		"""
+		int: the maximum number of retries of a request.
+		"""
+		return self._max_retries
+
+	@property
+	def observer(self):
+		"""
+		RequestObserver: the observer of the requests, None if the requests
+			are not observed.
+		"""
+		return self._observer
+
+	@property
+	def pool_size(self):
+		"""
+		int: the maximum number of simultaneous connections.
+		"""
+		return self._pool_size
+
+
+__all__ = [AsyncGitHubTransport.__name__]
@@ -0,0 +1,193 @@
+# __all__ declared at the module's end
+
+import sqlite3
+from threading import\
+	Lock
+from time import\
+	time
+
+# strath is an indirect dependency of repr_rw.
+from strath import\
+	ensure_path_is_pathlib
+
+from .github_data import\
+	GitHubUser
+
+
+_DEFAULT_MAX_USERS = 100000
+_DEFAULT_TIME_TO_LIVE = 7 * 24 * 3600 # seconds
+
+_SQL_COUNT = "SELECT COUNT(*) FROM users"
+_SQL_CREATE_TABLE = "CREATE TABLE IF NOT EXISTS users ("\
+	+ "login TEXT PRIMARY KEY, id INTEGER, name TEXT, "\
+	+ "stored_at REAL NOT NULL, last_access REAL NOT NULL)"
+_SQL_CREATE_INDEX = "CREATE INDEX IF NOT EXISTS users_last_access "\
+	+ "ON users (last_access)"
+_SQL_DELETE = "DELETE FROM users WHERE login = ?"
+_SQL_DELETE_EXPIRED = "DELETE FROM users WHERE stored_at <= ?"
+_SQL_DELETE_OLDEST = "DELETE FROM users WHERE login IN "\
+	+ "(SELECT login FROM users ORDER BY last_access LIMIT ?)"
+_SQL_SELECT = "SELECT id, name, stored_at FROM users WHERE login = ?"
+_SQL_TOUCH = "UPDATE users SET last_access = ? WHERE login = ?"
+_SQL_UPSERT = "INSERT OR REPLACE INTO users "\
+	+ "(login, id, name, stored_at, last_access) VALUES (?, ?, ?, ?, ?)"
+
+
+class GitHubUserCache:
+	"""
+	This class stores GitHubUser instances in an SQLite database file so that
+	they remain available from one process to another. A user expires after a
+	time to live. When the cache contains too many users, the least recently
+	used ones are evicted.
+
+	Singleton GitHubUserRepository checks this cache if it is given one by
+	method set_cache. Then, get_repo_commits requests a user from the GitHub
+	API only if the user is in neither the repository nor the cache.
+
+	This class is thread-safe. Method close releases the database file. This
+	class can also be used as a context manager, which calls close upon exit.
+	"""
+
+	def __init__(self, file_path, time_to_live=_DEFAULT_TIME_TO_LIVE,
+			max_users=_DEFAULT_MAX_USERS):
+		"""
+		The constructor opens or creates the cache file and deletes the
+		expired users.
+
+		Parameters:
+			file_path (str or pathlib.Path): the path to the SQLite database
+				file that contains the cache.
+			time_to_live (float): the number of seconds during which a stored
+				user stays valid. Defaults to one week.
+			max_users (int): the maximum number of users in the cache.
+				Defaults to 100000.
+
+		Raises:
+			TypeError: if argument file_path is not of type str or
+				pathlib.Path.
+			ValueError: if argument time_to_live is not positive or argument
+				max_users is less than 1.
+		"""
+		if time_to_live <= 0:
+			raise ValueError("The time to live must be positive.")
+
+		if max_users < 1:
+			raise ValueError("The maximum number of users must be at least 1.")
+
+		self._file_path = ensure_path_is_pathlib(file_path, False)
+		self._time_to_live = time_to_live
+		self._max_users = max_users
+		self._lock = Lock()
+
+		self._connection = sqlite3.connect(
+			self._file_path, check_same_thread=False)
+		self._connection.execute("PRAGMA journal_mode=WAL")
+		self._connection.execute(_SQL_CREATE_TABLE)
+		self._connection.execute(_SQL_CREATE_INDEX)
+		self._connection.execute(
+			_SQL_DELETE_EXPIRED, (time() - self._time_to_live,))
+		self._connection.commit()
+
+		self._user_count = self._connection.execute(_SQL_COUNT).fetchone()[0]
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def close(self):
+		"""
+		Closes the database file. The cache cannot be used afterwards.
+		"""
+		with self._lock:
+			self._connection.close()
+
+	def get_user(self, user_login):
+		"""
+		Provides a GitHubUser instance identified by the user's login name,
+		which corresponds to property GitHubUser.login.
+
+		Parameters:
+			user_login (str): the wanted user's login name.
+
+		Returns:
+			GitHubUser: data about the specified GitHub user, None if the user
+				is not in the cache or has expired.
+		"""
+		now = time()
+
+		with self._lock:
+			user_data =\
+				self._connection.execute(_SQL_SELECT, (user_login,)).fetchone()
+
+			if user_data is None:
+				return None
+
+			user_id, user_name, stored_at = user_data
+
+			if stored_at <= now - self._time_to_live:
+				self._connection.execute(_SQL_DELETE, (user_login,))
+				self._user_count -= 1
+				self._connection.commit()
+				return None
+
+			self._connection.execute(_SQL_TOUCH, (now, user_login))
+			self._connection.commit()
+
+		return GitHubUser(user_id, user_login, user_name)
+
+	def put_user(self, github_user):
+		"""
+		Stores a GitHubUser instance in this cache, then evicts the least
+		recently used users if the cache contains too many users. If the cache
+		already contains the user, this method replaces it and restarts its
+		time to live.
+
+		Parameters:
+			github_user (GitHubUser): data about a GitHub user.
+		"""
+		now = time()
+		user_login = github_user.login
+
+		with self._lock:
+			is_new_user = self._connection.execute(
+				_SQL_SELECT, (user_login,)).fetchone() is None
+
+			self._connection.execute(_SQL_UPSERT,
+				(user_login, github_user.id, github_user.name, now, now))
+
+			if is_new_user:
+				self._user_count += 1
+
+			if self._user_count > self._max_users:
+				self._connection.execute(_SQL_DELETE_OLDEST,
+					(self._user_count - self._max_users,))
+				self._user_count = self._max_users
+
+			self._connection.commit()
+
+	@property
+	def file_path(self):
+		"""
+		pathlib.Path: the path to the SQLite database file that contains the
+			cache.
+		"""
+		return self._file_path
+
+	@property
+	def max_users(self):
+		"""
+		int: the maximum number of users in this cache.
+		"""
+		return self._max_users
+
+	@property
+	def time_to_live(self):
+		"""
+		float: the number of seconds during which a stored user stays valid.
+		"""
+		return self._time_to_live
+
+
+__all__ = [GitHubUserCache.__name__]
@@ -0,0 +1,261 @@
+# __all__ declared at the module's end
+
+from datetime import\
+	datetime
+import json
+
+try:
+	import orjson
+except ImportError:
+	# orjson is an optional dependency.
+	orjson = None
+
+# strath is an indirect dependency of repr_rw.
+from strath import\
+	ensure_path_is_pathlib
+
+from .commit_rw import\
+	read_commit_reprs
+from .github_data import\
+	Commit,\
+	GitHubUser,\
+	RepoIdentity
+
+
+_KEY_AUTHOR = "author"
+_KEY_FILES = "files"
+_KEY_ID = "id"
+_KEY_LOGIN = "login"
+_KEY_MESSAGE = "message"
+_KEY_MOMENT = "moment"
+_KEY_NAME = "name"
+_KEY_REPOSITORY = "repository"
+_KEY_SHA = "sha"
+
+_JSON_SEPARATORS = (",", ":")
+
+_NEW_LINE = b"\n"
+
+_UTC_SUFFIX_LEN = len("Z")
+
+
+def _commit_to_dict(commit):
+	return {
+		_KEY_SHA: commit.sha,
+		_KEY_MESSAGE: commit.message,
+		_KEY_REPOSITORY: str(commit.repository),
+		_KEY_MOMENT: commit.moment_to_str(),
+		_KEY_AUTHOR: _github_user_to_dict(commit.author),
+		_KEY_FILES: commit.files
+	}
+
+
+def convert_commit_reprs_to_jsonl(repr_file_path, jsonl_file_path):
+	"""
+	Converts a text file written by write_commit_reprs to a JSON Lines file
+	readable by read_commits_jsonl. The commits are processed one at a time,
+	which allows to convert large files.
+
+	Parameters:
+		repr_file_path (str or pathlib.Path): the path to a text file that
+			contains Commit representations.
+		jsonl_file_path (str or pathlib.Path): the path to the JSON Lines file
+			that will contain the commits. If it already exists, this function
+			will overwrite it.
+
+	Returns:
+		int: the number of converted commits.
+
+	Raises:
+		FileNotFoundError: if argument repr_file_path does not exist.
+		TypeError: if an argument is not of type str or pathlib.Path.
+		ValueError: if a line of the text file is not a Commit
+			representation.
+	"""
+	return write_commits_jsonl(
+		jsonl_file_path, read_commit_reprs(repr_file_path))
+
+
+def _dumps(obj):
+	if orjson is not None:
+		return orjson.dumps(obj)
+
+	return json.dumps(obj,
+		ensure_ascii=False, separators=_JSON_SEPARATORS).encode()
+
+
+def _github_user_to_dict(github_user):
+	if github_user is None:
+		return None
+
+	return {
+		_KEY_ID: github_user.id,
+		_KEY_LOGIN: github_user.login,
+		_KEY_NAME: github_user.name
+	}
+
+
+def _loads(line):
+	if orjson is not None:
+		return orjson.loads(line)
+
+	return json.loads(line)
+
+
+def _read_jsonl_dicts(file_path):
+	file_path = ensure_path_is_pathlib(file_path, False)
+
+	with file_path.open(mode="rb") as jsonl_file:
+		for line in jsonl_file:
+			# Empty lines are ignored.
+			if not line.isspace():
+				yield _loads(line)
+
+
+def read_commits_jsonl(file_path):
+	"""
+	This generator reads a JSON Lines file written by write_commits_jsonl and
+	recreates the Commit instances. Each iteration yields a Commit instance.
+	Empty lines are ignored.
+
+	Equal authors and repositories are recreated once and shared by the
+	commits. If library orjson is installed, it parses the lines. Otherwise,
+	module json does.
+
+	Parameters:
+		file_path (str or pathlib.Path): the path to a JSON Lines file that
+			contains commits.
+
+	Yields:
+		Commit: a Commit instance recreated from a line.
+
+	Raises:
+		FileNotFoundError: if argument file_path does not exist.
+		TypeError: if argument file_path is not of type str or pathlib.Path.
+		ValueError: if a line is not valid JSON.
+		KeyError: if a line lacks commit data.
+	"""
+	github_users = dict()
+	repo_identities = dict()
+
+	for commit_dict in _read_jsonl_dicts(file_path):
+		author = None
+		author_dict = commit_dict[_KEY_AUTHOR]
+
+		if author_dict is not None:
+			author_key = (author_dict[_KEY_ID],
+				author_dict[_KEY_LOGIN], author_dict[_KEY_NAME])
+			author = github_users.get(author_key)
+
+			if author is None:
+				author = GitHubUser(*author_key)
+				github_users[author_key] = author
+
+		full_name = commit_dict[_KEY_REPOSITORY]
+		repo_identity = repo_identities.get(full_name)
+
+		if repo_identity is None:
+			repo_identity = RepoIdentity.from_full_name(full_name)
+			repo_identities[full_name] = repo_identity
+
+		# The moments are written in format %Y-%m-%dT%H:%M:%SZ. Without the
+		# final Z, datetime.fromisoformat parses them much faster than
+		# datetime.strptime.
+		moment = datetime.fromisoformat(
+			commit_dict[_KEY_MOMENT][:-_UTC_SUFFIX_LEN])
+
+		yield Commit(commit_dict[_KEY_SHA], commit_dict[_KEY_MESSAGE],
+			repo_identity, moment, author, commit_dict[_KEY_FILES])
+
+
+def read_github_users_jsonl(file_path):
+	"""
+	This generator reads a JSON Lines file written by write_github_users_jsonl
+	and recreates the GitHubUser instances. Each iteration yields a
+	GitHubUser instance. Empty lines are ignored.
+
+	Parameters:
+		file_path (str or pathlib.Path): the path to a JSON Lines file that
+			contains GitHub users.
+
+	Yields:
+		GitHubUser: a GitHubUser instance recreated from a line.
+
+	Raises:
+		FileNotFoundError: if argument file_path does not exist.
+		TypeError: if argument file_path is not of type str or pathlib.Path.
+		ValueError: if a line is not valid JSON.
+		KeyError: if a line lacks user data.
+	"""
+	for user_dict in _read_jsonl_dicts(file_path):
+		yield GitHubUser(user_dict[_KEY_ID],
+			user_dict[_KEY_LOGIN], user_dict[_KEY_NAME])
+
+
+def _write_jsonl_dicts(file_path, dicts):
+	file_path = ensure_path_is_pathlib(file_path, False)
+	line_count = 0
+
+	with file_path.open(mode="wb") as jsonl_file:
+		for obj_dict in dicts:
+			jsonl_file.write(_dumps(obj_dict))
+			jsonl_file.write(_NEW_LINE)
+			line_count += 1
+
+	return line_count
+
+
+def write_commits_jsonl(file_path, commits):
+	"""
+	Writes Commit instances in a JSON Lines file. Each line is a JSON object
+	that contains one commit's data. The file is encoded in UTF-8. If it
+	already exists, this function will overwrite it.
+
+	If library orjson is installed, it serializes the commits. Otherwise,
+	module json does.
+
+	Parameters:
+		file_path (str or pathlib.Path): the path to the JSON Lines file that
+			will contain the commits.
+		commits: the Commit instances to write. It can be any iterable object,
+			including a generator like get_repo_commits.
+
+	Returns:
+		int: the number of written commits.
+
+	Raises:
+		TypeError: if argument file_path is not of type str or pathlib.Path.
+	"""
+	return _write_jsonl_dicts(
+		file_path, (_commit_to_dict(commit) for commit in commits))
+
+
+def write_github_users_jsonl(file_path, github_users):
+	"""
+	Writes GitHubUser instances in a JSON Lines file. Each line is a JSON
+	object that contains one user's data. The file is encoded in UTF-8. If it
+	already exists, this function will overwrite it.
+
+	Parameters:
+		file_path (str or pathlib.Path): the path to the JSON Lines file that
+			will contain the users.
+		github_users: the GitHubUser instances to write. It can be any
+			iterable object.
+
+	Returns:
+		int: the number of written users.
+
+	Raises:
+		TypeError: if argument file_path is not of type str or pathlib.Path.
+	"""
+	return _write_jsonl_dicts(file_path,
+		(_github_user_to_dict(github_user) for github_user in github_users))
+
+
+__all__ = [
+	convert_commit_reprs_to_jsonl.__name__,
+	read_commits_jsonl.__name__,
+	read_github_users_jsonl.__name__,
+	write_commits_jsonl.__name__,
+	write_github_users_jsonl.__name__
+]
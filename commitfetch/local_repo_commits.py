@@ -0,0 +1,227 @@
+# __all__ declared at the module's end
+
+from datetime import\
+	datetime,\
+	timezone
+import re
+import subprocess
+from tempfile import\
+	TemporaryFile
+
+# strath is an indirect dependency of repr_rw.
+from strath import\
+	ensure_path_is_pathlib
+
+from .github_data import\
+	Commit,\
+	GitHubUser,\
+	GitHubUserRepository,\
+	RepoIdentity
+from .github_data.commit import\
+	_datetime_to_str
+
+
+_ENCODING = "utf-8"
+
+_FIELD_SEPARATOR = "\x1f"
+_FILE_SEPARATOR = "\0"
+_RECORD_SEPARATOR = b"\x1e"
+
+# A record contains the SHA, the author's timestamp, name and email, then the
+# raw message. The file names follow the last field separator.
+_LOG_FORMAT = "--format=%x1e%H%x1f%at%x1f%an%x1f%ae%x1f%B%x1f"
+
+_NEW_LINE = "\n"
+
+# GitHub gives its users an email address in one of these formats:
+# <id>+<login>@users.noreply.github.com or <login>@users.noreply.github.com.
+_NOREPLY_EMAIL_PATTERN = re.compile(
+	r"^(?:(\d+)\+)?([A-Za-z0-9-]+)@users\.noreply\.github\.com$")
+
+_READ_SIZE = 1 << 16 # bytes
+
+# Matches https://github.com/<owner>/<name>.git and
+# git@github.com:<owner>/<name>.git, with or without the suffix .git.
+_REMOTE_URL_PATTERN = re.compile(r"[/:]([^/:]+)/([^/]+?)(?:\.git)?/?$")
+
+_USER_REPO = GitHubUserRepository()
+
+
+def _get_remote_repository(repo_path, git_command):
+	result = subprocess.run(
+		(git_command, "-C", str(repo_path),
+			"config", "--get", "remote.origin.url"),
+		capture_output=True, text=True)
+	remote_url = result.stdout.strip()
+
+	match = _REMOTE_URL_PATTERN.search(remote_url)
+	if result.returncode != 0 or match is None:
+		raise ValueError(
+			"The repository's full name cannot be deduced from the clone. "
+			+ "Specify argument repository.")
+
+	return RepoIdentity(match.group(1), match.group(2))
+
+
+def get_local_repo_commits(repo_path, repository=None, author_resolver=None,
+		revision="HEAD", since=None, last_sha=None, git_command="git"):
+	"""
+	This generator obtains data about the commits in a local clone of a GitHub
+	repository, without any request to the GitHub API. It streams the output
+	of command git log and yields one Commit instance per commit, from the
+	most recent. The clone can be a bare mirror.
+
+	The commits are the same as those that get_repo_commits yields, including
+	the paths to the changed files. A merge commit's files are those changed
+	with respect to its first parent, like on GitHub. The moment is the
+	author's, in UTC.
+
+	A commit's author is a GitHubUser only if it can be deduced from the
+	author's name and email address. By default, this generator recognizes the
+	noreply email addresses of GitHub, like 123+login@users.noreply.github.com,
+	and provides the user registered in GitHubUserRepository if there is one.
+	Otherwise, the author's name is None because the clone does not contain the
+	user's profile. If argument author_resolver is specified, it takes the
+	author's name and email address and returns a GitHubUser or None. Either
+	way, the author of each name and address is resolved once.
+
+	Parameters:
+		repo_path (str or pathlib.Path): the path to the clone.
+		repository (str or RepoIdentity): the repository's full name in the
+			format <owner>/<name>. Defaults to None, in which case it is
+			deduced from the URL of the clone's remote origin.
+		author_resolver (callable): makes the GitHubUser of an author's name
+			(str) and email address (str). Defaults to None.
+		revision (str): the commit from which the history is read, like a
+			branch name. Defaults to HEAD.
+		since (str or datetime.datetime): only the commits committed at or
+			after this moment are obtained. If it is a string, it must match
+			format %Y-%m-%dT%H:%M:%SZ. Defaults to None.
+		last_sha (str): the SHA of the most recent commit already known. This
+			commit and the ones below it in the history are not obtained.
+			Defaults to None.
+		git_command (str): the name of, or the path to, the git executable.
+			Defaults to git.
+
+	Yields:
+		Commit: data about one commit from the specified repository.
+
+	Raises:
+		subprocess.CalledProcessError: if command git log fails.
+		TypeError: if argument repo_path is not of type str or pathlib.Path.
+		ValueError: if argument repository is None and the repository's full
+			name cannot be deduced from the clone.
+	"""
+	repo_path = ensure_path_is_pathlib(repo_path, False)
+
+	if repository is None:
+		repository = _get_remote_repository(repo_path, git_command)
+	elif isinstance(repository, str):
+		repository = RepoIdentity.from_full_name(repository)
+
+	if author_resolver is None:
+		author_resolver = _resolve_author_from_email
+
+	command = [git_command, "-C", str(repo_path), "log", "-z",
+		"--name-only", "--find-renames", "--diff-merges=first-parent",
+		_LOG_FORMAT]
+
+	if since is not None:
+		if isinstance(since, datetime):
+			since = _datetime_to_str(since)
+
+		command.append("--since=" + since)
+
+	command.extend((revision, "--"))
+
+	authors = dict()
+
+	# git log can write many warnings while the commits are read. Since only
+	# the standard output is read, a pipe could fill up and block git.
+	with TemporaryFile() as error_file:
+		process = subprocess.Popen(
+			command, stdout=subprocess.PIPE, stderr=error_file)
+
+		try:
+			for record in _read_log_records(process.stdout):
+				sha, timestamp, author_name, author_email, message_and_files =\
+					record.split(_FIELD_SEPARATOR, 4)
+				message, file_data =\
+					message_and_files.rsplit(_FIELD_SEPARATOR, 1)
+
+				if sha == last_sha:
+					# The rest of the history is already known.
+					return
+
+				author_key = (author_name, author_email)
+				if author_key in authors:
+					author = authors[author_key]
+				else:
+					author = author_resolver(author_name, author_email)
+					authors[author_key] = author
+
+				moment = datetime.fromtimestamp(int(timestamp), timezone.utc)\
+					.replace(tzinfo=None)
+
+				# The file names follow a null character and a new line.
+				files = (file_name.lstrip(_NEW_LINE)
+					for file_name in file_data.split(_FILE_SEPARATOR))
+
+				yield Commit(sha, message.rstrip(_NEW_LINE), repository,
+					moment, author,
+					(file_name for file_name in files if file_name))
+
+			return_code = process.wait()
+
+			if return_code != 0:
+				error_file.seek(0)
+				raise subprocess.CalledProcessError(
+					return_code, command, stderr=error_file.read())
+
+		finally:
+			if process.poll() is None:
+				process.kill()
+
+			process.wait()
+			process.stdout.close()
+
+
+def _read_log_records(log_stream):
+	buffer = b""
+
+	while True:
+		chunk = log_stream.read(_READ_SIZE)
+
+		if len(chunk) == 0:
+			break
+
+		records = (buffer + chunk).split(_RECORD_SEPARATOR)
+		buffer = records.pop()
+
+		for record in records:
+			if len(record) > 0:
+				yield record.decode(_ENCODING, errors="replace")
+
+	if len(buffer) > 0:
+		yield buffer.decode(_ENCODING, errors="replace")
+
+
+def _resolve_author_from_email(author_name, author_email):
+	match = _NOREPLY_EMAIL_PATTERN.match(author_email)
+	if match is None:
+		return None
+
+	user_id, user_login = match.groups()
+
+	github_user = _USER_REPO.get_user(user_login)
+	if github_user is not None:
+		return github_user
+
+	if user_id is not None:
+		user_id = int(user_id)
+
+	# The user is not registered because the name from the profile is missing.
+	return GitHubUser(user_id, user_login, None)
+
+
+__all__ = [get_local_repo_commits.__name__]
@@ -0,0 +1,243 @@
+# __all__ declared at the module's end
+
+from datetime import\
+	timezone
+
+try:
+	import pyarrow
+	import pyarrow.parquet as pyarrow_parquet
+except ImportError:
+	# pyarrow is an optional dependency.
+	pyarrow = None
+	pyarrow_parquet = None
+
+# strath is an indirect dependency of repr_rw.
+from strath import\
+	ensure_path_is_pathlib
+
+from .github_data import\
+	Commit,\
+	GitHubUser,\
+	RepoIdentity
+
+
+_COLUMN_AUTHOR_ID = "author_id"
+_COLUMN_AUTHOR_LOGIN = "author_login"
+_COLUMN_AUTHOR_NAME = "author_name"
+_COLUMN_FILES = "files"
+_COLUMN_MESSAGE = "message"
+_COLUMN_MOMENT = "moment"
+_COLUMN_REPOSITORY = "repository"
+_COLUMN_SHA = "sha"
+
+_COLUMNS = (
+	_COLUMN_SHA,
+	_COLUMN_MESSAGE,
+	_COLUMN_REPOSITORY,
+	_COLUMN_MOMENT,
+	_COLUMN_AUTHOR_ID,
+	_COLUMN_AUTHOR_LOGIN,
+	_COLUMN_AUTHOR_NAME,
+	_COLUMN_FILES
+)
+
+_DEFAULT_BATCH_SIZE = 65536 # rows
+_DEFAULT_COMPRESSION = "zstd"
+_DEFAULT_ROW_GROUP_SIZE = 65536 # rows
+
+
+def _make_schema():
+	return pyarrow.schema((
+		pyarrow.field(_COLUMN_SHA, pyarrow.string(), nullable=False),
+		pyarrow.field(_COLUMN_MESSAGE, pyarrow.string()),
+		pyarrow.field(_COLUMN_REPOSITORY, pyarrow.string()),
+		pyarrow.field(_COLUMN_MOMENT, pyarrow.timestamp("s", tz="UTC")),
+		pyarrow.field(_COLUMN_AUTHOR_ID, pyarrow.int64()),
+		pyarrow.field(_COLUMN_AUTHOR_LOGIN, pyarrow.string()),
+		pyarrow.field(_COLUMN_AUTHOR_NAME, pyarrow.string()),
+		pyarrow.field(_COLUMN_FILES, pyarrow.list_(pyarrow.string()))
+	))
+
+
+def _raise_import_error(function_name):
+	if pyarrow is None:
+		raise ImportError(f"{function_name} requires package pyarrow.")
+
+
+def read_commit_table(file_path, columns=None):
+	"""
+	Reads a Parquet file written by write_commits_parquet into a
+	pyarrow.Table without creating Commit instances. Since the file is
+	columnar, only the selected columns are read. The table can be converted
+	to a dataframe, for instance with method to_pandas.
+
+	The columns are sha, message, repository (full name), moment (timestamp
+	in UTC), author_id, author_login, author_name and files (list of paths).
+
+	Parameters:
+		file_path (str or pathlib.Path): the path to a Parquet file that
+			contains commits.
+		columns (list or tuple): the names (str) of the columns to read.
+			Defaults to None, which means all the columns.
+
+	Returns:
+		pyarrow.Table: the commits' data.
+
+	Raises:
+		FileNotFoundError: if argument file_path does not exist.
+		ImportError: if pyarrow is not installed.
+		TypeError: if argument file_path is not of type str or pathlib.Path.
+	"""
+	_raise_import_error(read_commit_table.__name__)
+	file_path = ensure_path_is_pathlib(file_path, False)
+
+	if columns is not None:
+		columns = list(columns)
+
+	return pyarrow_parquet.read_table(str(file_path), columns=columns)
+
+
+def read_commits_parquet(file_path, batch_size=_DEFAULT_BATCH_SIZE):
+	"""
+	This generator reads a Parquet file written by write_commits_parquet and
+	recreates the Commit instances. Each iteration yields a Commit instance.
+	The file is read in batches of rows, which limits the memory usage. Equal
+	authors and repositories are recreated once and shared by the commits.
+
+	Function read_commit_table is faster if the analysis does not need Commit
+	instances.
+
+	Parameters:
+		file_path (str or pathlib.Path): the path to a Parquet file that
+			contains commits.
+		batch_size (int): the maximum number of rows read at once. Defaults
+			to 65536.
+
+	Yields:
+		Commit: a Commit instance recreated from a row.
+
+	Raises:
+		FileNotFoundError: if argument file_path does not exist.
+		ImportError: if pyarrow is not installed.
+		TypeError: if argument file_path is not of type str or pathlib.Path.
+	"""
+	_raise_import_error(read_commits_parquet.__name__)
+	file_path = ensure_path_is_pathlib(file_path, False)
+
+	github_users = dict()
+	repo_identities = dict()
+	parquet_file = pyarrow_parquet.ParquetFile(str(file_path))
+
+	try:
+		for record_batch in parquet_file.iter_batches(
+				batch_size=batch_size, columns=list(_COLUMNS)):
+			batch_data = record_batch.to_pydict()
+
+			for sha, message, full_name, moment, author_id, author_login,\
+					author_name, files in zip(
+					*(batch_data[column] for column in _COLUMNS)):
+				author = None
+
+				if author_login is not None:
+					author_key = (author_id, author_login, author_name)
+					author = github_users.get(author_key)
+
+					if author is None:
+						author = GitHubUser(*author_key)
+						github_users[author_key] = author
+
+				repo_identity = repo_identities.get(full_name)
+				if repo_identity is None:
+					repo_identity = RepoIdentity.from_full_name(full_name)
+					repo_identities[full_name] = repo_identity
+
+				# The Commit moments are naive datetimes in UTC.
+				moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+				yield Commit(
+					sha, message, repo_identity, moment, author, files)
+
+	finally:
+		parquet_file.close()
+
+
+def write_commits_parquet(file_path, commits,
+		row_group_size=_DEFAULT_ROW_GROUP_SIZE,
+		compression=_DEFAULT_COMPRESSION):
+	"""
+	Writes Commit instances in a columnar Parquet file, which dataframe
+	libraries can load directly. Each row contains a commit. The columns are
+	sha, message, repository (full name), moment (timestamp in UTC),
+	author_id, author_login, author_name and files (list of paths). The author
+	columns are null if a commit has no author. If the file already exists,
+	this function will overwrite it.
+
+	The commits are written in row groups of row_group_size commits. Only one
+	row group is kept in memory, which allows to write the commits while they
+	are obtained from a generator like get_repo_commits.
+
+	Parameters:
+		file_path (str or pathlib.Path): the path to the Parquet file that
+			will contain the commits.
+		commits: the Commit instances to write. It can be any iterable object.
+		row_group_size (int): the number of commits per row group. Defaults
+			to 65536.
+		compression (str): the compression codec, as accepted by pyarrow.
+			Defaults to zstd.
+
+	Returns:
+		int: the number of written commits.
+
+	Raises:
+		ImportError: if pyarrow is not installed.
+		TypeError: if argument file_path is not of type str or pathlib.Path.
+		ValueError: if argument row_group_size is less than 1.
+	"""
+	_raise_import_error(write_commits_parquet.__name__)
+	file_path = ensure_path_is_pathlib(file_path, False)
+
+	if row_group_size < 1:
+		raise ValueError("The row group size must be at least 1.")
+
+	schema = _make_schema()
+	commit_count = 0
+	columns = {column: list() for column in _COLUMNS}
+
+	def write_row_group(writer):
+		writer.write_table(pyarrow.Table.from_pydict(columns, schema=schema))
+
+		for column_values in columns.values():
+			column_values.clear()
+
+	with pyarrow_parquet.ParquetWriter(
+			str(file_path), schema, compression=compression) as writer:
+		for commit in commits:
+			author = commit.author
+
+			columns[_COLUMN_SHA].append(commit.sha)
+			columns[_COLUMN_MESSAGE].append(commit.message)
+			columns[_COLUMN_REPOSITORY].append(str(commit.repository))
+			columns[_COLUMN_MOMENT].append(commit.moment)
+			columns[_COLUMN_AUTHOR_ID].append(
+				None if author is None else author.id)
+			columns[_COLUMN_AUTHOR_LOGIN].append(
+				None if author is None else author.login)
+			columns[_COLUMN_AUTHOR_NAME].append(
+				None if author is None else author.name)
+			columns[_COLUMN_FILES].append(list(commit.files))
+			commit_count += 1
+
+			if len(columns[_COLUMN_SHA]) >= row_group_size:
+				write_row_group(writer)
+
+		if len(columns[_COLUMN_SHA]) > 0:
+			write_row_group(writer)
+
+	return commit_count
+
+
+__all__ = [
+	read_commit_table.__name__,
+	read_commits_parquet.__name__,
+	write_commits_parquet.__name__
+]
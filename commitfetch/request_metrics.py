@@ -0,0 +1,289 @@
+# __all__ declared at the module's end
+
+from bisect import\
+	bisect_left
+from threading import\
+	Lock
+
+from .request_observer import\
+	RequestObserver
+
+
+_DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10) # seconds
+
+_DEFAULT_PROMETHEUS_PREFIX = "commitfetch"
+
+_KEY_BYTES = "bytes"
+_KEY_CACHE_HITS = "cache_hits"
+_KEY_CREDENTIAL_SWITCHES = "credential_switches"
+_KEY_ERRORS = "errors"
+_KEY_LATENCY_MAX = "latency_max"
+_KEY_LATENCY_MEAN = "latency_mean"
+_KEY_RATE_LIMIT_WAIT_TIME = "rate_limit_wait_time"
+_KEY_RATE_LIMIT_WAITS = "rate_limit_waits"
+_KEY_REQUESTS = "requests"
+_KEY_RETRIES = "retries"
+_KEY_STATUSES = "statuses"
+_KEY_USER_CACHE_HIT_RATE = "user_cache_hit_rate"
+_KEY_USER_CACHE_HITS = "user_cache_hits"
+_KEY_USER_CACHE_MISSES = "user_cache_misses"
+
+_MIN_ERROR_STATUS = 400
+
+
+class _KindMetrics:
+	"""
+	The measurements of the requests of one kind.
+	"""
+
+	__slots__ = ("bucket_counts", "byte_count", "cache_hit_count",
+		"error_count", "latency_max", "latency_sum", "request_count",
+		"retry_count", "status_counts")
+
+	def __init__(self, bucket_count):
+		# The last bucket holds the latencies above the greatest bound.
+		self.bucket_counts = [0] * (bucket_count + 1)
+		self.byte_count = 0
+		self.cache_hit_count = 0
+		self.error_count = 0
+		self.latency_max = 0
+		self.latency_sum = 0
+		self.request_count = 0
+		self.retry_count = 0
+		self.status_counts = dict()
+
+
+class RequestMetrics(RequestObserver):
+	"""
+	This RequestObserver aggregates the events that it receives. It counts the
+	requests by kind and by status code, the retries, the bytes transferred,
+	the responses taken from a cache, the rate limit waits, the credential
+	switches and the user lookups, and records a histogram of the request
+	latencies. Method get_summary provides these metrics as a dictionary, and
+	method to_prometheus formats them in the Prometheus text exposition
+	format.
+
+	An instance can observe several transports and be read while they send
+	requests.
+	"""
+
+	def __init__(self, latency_buckets=_DEFAULT_LATENCY_BUCKETS):
+		"""
+		The constructor creates empty metrics.
+
+		Parameters:
+			latency_buckets (iterable): the upper bounds, in seconds, of the
+				latency histogram's buckets. Defaults to 0.05, 0.1, 0.25, 0.5,
+				1, 2.5, 5 and 10.
+
+		Raises:
+			ValueError: if argument latency_buckets is empty.
+		"""
+		self._latency_buckets = tuple(sorted(latency_buckets))
+
+		if len(self._latency_buckets) == 0:
+			raise ValueError("At least one latency bucket is required.")
+
+		self._lock = Lock()
+		self._kind_metrics = dict()
+		self._credential_switch_count = 0
+		self._rate_limit_wait_count = 0
+		self._rate_limit_wait_time = 0
+		self._user_cache_hit_count = 0
+		self._user_cache_miss_count = 0
+
+	def get_summary(self):
+		"""
+		Provides the current metrics. The statistics of the requests are
+		grouped by kind. For each kind, the dictionary gives the number of
+		requests, the number of requests whose status code indicates an error,
+		the number of retries, the bytes transferred, the mean and maximal
+		latencies in seconds, the number of requests by status code and the
+		number of responses taken from a cache, which are not requests. The
+		latencies are None if no response was received.
+
+		Returns:
+			dict: the metrics, by name. Key requests maps the request kinds to
+				their statistics. The other keys are rate_limit_waits,
+				rate_limit_wait_time, credential_switches, user_cache_hits,
+				user_cache_misses and user_cache_hit_rate, which is None if no
+				user was looked up.
+		"""
+		with self._lock:
+			request_summary = {kind: {
+				_KEY_REQUESTS: km.request_count,
+				_KEY_ERRORS: km.error_count,
+				_KEY_RETRIES: km.retry_count,
+				_KEY_BYTES: km.byte_count,
+				_KEY_LATENCY_MEAN: km.latency_sum / km.request_count
+					if km.request_count > 0 else None,
+				_KEY_LATENCY_MAX: km.latency_max
+					if km.request_count > 0 else None,
+				_KEY_STATUSES: dict(km.status_counts),
+				_KEY_CACHE_HITS: km.cache_hit_count
+			} for kind, km in sorted(self._kind_metrics.items())}
+
+			user_lookup_count =\
+				self._user_cache_hit_count + self._user_cache_miss_count
+			user_cache_hit_rate = None if user_lookup_count == 0\
+				else self._user_cache_hit_count / user_lookup_count
+
+			return {
+				_KEY_REQUESTS: request_summary,
+				_KEY_RATE_LIMIT_WAITS: self._rate_limit_wait_count,
+				_KEY_RATE_LIMIT_WAIT_TIME: self._rate_limit_wait_time,
+				_KEY_CREDENTIAL_SWITCHES: self._credential_switch_count,
+				_KEY_USER_CACHE_HITS: self._user_cache_hit_count,
+				_KEY_USER_CACHE_MISSES: self._user_cache_miss_count,
+				_KEY_USER_CACHE_HIT_RATE: user_cache_hit_rate
+			}
+
+	def _get_kind_metrics(self, request_kind):
+		# The caller must hold the lock.
+		kind_metrics = self._kind_metrics.get(request_kind)
+
+		if kind_metrics is None:
+			kind_metrics = _KindMetrics(len(self._latency_buckets))
+			self._kind_metrics[request_kind] = kind_metrics
+
+		return kind_metrics
+
+	def on_cache_hit(self, request_kind, url):
+		with self._lock:
+			self._get_kind_metrics(request_kind).cache_hit_count += 1
+
+	def on_credential_switch(self, username):
+		with self._lock:
+			self._credential_switch_count += 1
+
+	def on_rate_limit_wait(self, wait_time):
+		with self._lock:
+			self._rate_limit_wait_count += 1
+			self._rate_limit_wait_time += wait_time
+
+	def on_request(self, request_kind, url, status_code, latency, byte_count):
+		bucket_index = bisect_left(self._latency_buckets, latency)
+
+		with self._lock:
+			kind_metrics = self._get_kind_metrics(request_kind)
+			kind_metrics.request_count += 1
+			kind_metrics.byte_count += byte_count
+			kind_metrics.latency_sum += latency
+			kind_metrics.bucket_counts[bucket_index] += 1
+
+			if latency > kind_metrics.latency_max:
+				kind_metrics.latency_max = latency
+
+			if status_code >= _MIN_ERROR_STATUS:
+				kind_metrics.error_count += 1
+
+			kind_metrics.status_counts[status_code] =\
+				kind_metrics.status_counts.get(status_code, 0) + 1
+
+	def on_retry(self, request_kind, url, retry_num, delay):
+		with self._lock:
+			self._get_kind_metrics(request_kind).retry_count += 1
+
+	def on_user_lookup(self, login, is_cached):
+		with self._lock:
+			if is_cached:
+				self._user_cache_hit_count += 1
+			else:
+				self._user_cache_miss_count += 1
+
+	def to_prometheus(self, prefix=_DEFAULT_PROMETHEUS_PREFIX):
+		"""
+		Formats the current metrics in the Prometheus text exposition format.
+		The request counts are labeled with the request kind and the status
+		code. The latencies form a histogram labeled with the request kind.
+
+		Parameters:
+			prefix (str): the beginning of the metrics' names. Defaults to
+				commitfetch.
+
+		Returns:
+			str: the metrics in the Prometheus text exposition format.
+		"""
+		lines = list()
+
+		def add_metric(name, metric_type, description, samples):
+			lines.append(f"# HELP {prefix}_{name} {description}")
+			lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+
+			for sample_suffix, labels, value in samples:
+				label_text = ",".join(
+					f"{label}=\"{label_value}\""
+					for label, label_value in labels)
+
+				if len(label_text) > 0:
+					label_text = "{" + label_text + "}"
+
+				lines.append(
+					f"{prefix}_{name}{sample_suffix}{label_text} {value}")
+
+		with self._lock:
+			kind_metrics = sorted(self._kind_metrics.items())
+
+			add_metric("requests_total", "counter",
+				"Requests sent to the GitHub API.",
+				[(str(), (("kind", kind), ("status", status)), count)
+					for kind, km in kind_metrics
+					for status, count in sorted(km.status_counts.items())])
+
+			latency_samples = list()
+			for kind, km in kind_metrics:
+				cumulative_count = 0
+
+				for bound, count in zip(
+						self._latency_buckets, km.bucket_counts):
+					cumulative_count += count
+					bucket_labels = (("kind", kind), ("le", float(bound)))
+					latency_samples.append(
+						("_bucket", bucket_labels, cumulative_count))
+
+				latency_samples.append(("_bucket",
+					(("kind", kind), ("le", "+Inf")), km.request_count))
+				latency_samples.append(
+					("_sum", (("kind", kind),), km.latency_sum))
+				latency_samples.append(
+					("_count", (("kind", kind),), km.request_count))
+
+			add_metric("request_duration_seconds", "histogram",
+				"Latency of the requests to the GitHub API.", latency_samples)
+
+			add_metric("retries_total", "counter",
+				"Retries of the requests to the GitHub API.",
+				[(str(), (("kind", kind),), km.retry_count)
+					for kind, km in kind_metrics])
+
+			add_metric("response_bytes_total", "counter",
+				"Bytes received from the GitHub API.",
+				[(str(), (("kind", kind),), km.byte_count)
+					for kind, km in kind_metrics])
+
+			add_metric("cache_hits_total", "counter",
+				"Responses taken from a cache without sending a request.",
+				[(str(), (("kind", kind),), km.cache_hit_count)
+					for kind, km in kind_metrics])
+
+			add_metric("rate_limit_waits_total", "counter",
+				"Waits for a rate limit reset.",
+				[(str(), (), self._rate_limit_wait_count)])
+
+			add_metric("rate_limit_wait_seconds_total", "counter",
+				"Time spent waiting for a rate limit reset.",
+				[(str(), (), self._rate_limit_wait_time)])
+
+			add_metric("credential_switches_total", "counter",
+				"Changes of the credential used to send the requests.",
+				[(str(), (), self._credential_switch_count)])
+
+			add_metric("user_lookups_total", "counter",
+				"Lookups of commit authors among the users already obtained.",
+				[(str(), (("result", "hit"),), self._user_cache_hit_count),
+				(str(), (("result", "miss"),), self._user_cache_miss_count)])
+
+		return "\n".join(lines) + "\n"
+
+
+__all__ = [RequestMetrics.__name__]
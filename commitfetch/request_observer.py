@@ -0,0 +1,101 @@
+# __all__ declared at the module's end
+
+
+class RequestObserver:
+	"""
+	This class is notified of the events that occur while commits are obtained
+	from the GitHub API. It does nothing; subclasses override the methods for
+	the events that they need. An observer is given to GitHubTransport or
+	AsyncGitHubTransport, and every function that uses the transport reports
+	to it. If a transport has no observer, the events are not measured.
+
+	The requests are classified in kinds: commit_list for the pages of commit
+	lists, commit for the commits and the pages of their files, user for the
+	GitHub users and graphql for the GraphQL queries.
+
+	The responses that a transport takes from its cache without sending a
+	request are not reported as requests, but as cache hits.
+
+	The methods can be called from several threads at once. The credentials
+	are identified by their username so that the tokens are never exposed.
+	"""
+
+	def on_cache_hit(self, request_kind, url):
+		"""
+		Called when a transport provides a cached response without sending a
+		request.
+
+		Parameters:
+			request_kind (str): commit_list, commit, user or graphql.
+			url (str): the requested URL.
+		"""
+		pass
+
+	def on_credential_switch(self, username):
+		"""
+		Called when the requests start being sent with another credential,
+		because it has at least 100 more remaining requests than the current
+		one or the current one has none left.
+
+		Parameters:
+			username (str): the username of the newly selected credential.
+		"""
+		pass
+
+	def on_rate_limit_wait(self, wait_time):
+		"""
+		Called before waiting for a rate limit reset, because no credential
+		has remaining requests.
+
+		Parameters:
+			wait_time (float): the number of seconds to wait.
+		"""
+		pass
+
+	def on_request(self, request_kind, url, status_code, latency, byte_count):
+		"""
+		Called when the response to a request is received.
+
+		Parameters:
+			request_kind (str): commit_list, commit, user or graphql.
+			url (str): the requested URL.
+			status_code (int): the response's HTTP status code.
+			latency (float): the number of seconds that the transport took to
+				provide the response, including any wait for a connection.
+				If the content is streamed, its reading is not included.
+			byte_count (int): the size of the response's content as
+				transferred, as indicated by header Content-Length. If this
+				header is absent, the size of the decoded content. If the
+				content is streamed, the number of bytes read from the
+				connection.
+		"""
+		pass
+
+	def on_retry(self, request_kind, url, retry_num, delay):
+		"""
+		Called before waiting to send a request again after a connection
+		error, a timeout or a server error (status 5xx).
+
+		Parameters:
+			request_kind (str): commit_list, commit, user or graphql.
+			url (str): the requested URL.
+			retry_num (int): the number of the upcoming retry, from 1.
+			delay (float): the number of seconds to wait before the retry.
+		"""
+		pass
+
+	def on_user_lookup(self, login, is_cached):
+		"""
+		Called when a commit's author is looked up in the users already
+		obtained, before a request for the user if it is not found. With the
+		GraphQL API, a user not found is made from the query's data instead.
+
+		Parameters:
+			login (str): the user's login name.
+			is_cached (bool): True if the user was already obtained, False if
+				the user must be requested or made from the GraphQL data.
+		"""
+		pass
+
+
+__all__ = [RequestObserver.__name__]
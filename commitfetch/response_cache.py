@@ -0,0 +1,199 @@
+# __all__ declared at the module's end
+
+import json
+import sqlite3
+from threading import\
+	Lock
+from time import\
+	time
+
+# strath is an indirect dependency of repr_rw.
+from strath import\
+	ensure_path_is_pathlib
+
+
+_DEFAULT_MAX_SIZE = 1 << 30 # bytes
+
+_SQL_CREATE_TABLE = "CREATE TABLE IF NOT EXISTS responses ("\
+	+ "url TEXT PRIMARY KEY, headers TEXT NOT NULL, "\
+	+ "content BLOB NOT NULL, size INTEGER NOT NULL, "\
+	+ "last_access REAL NOT NULL)"
+_SQL_CREATE_INDEX = "CREATE INDEX IF NOT EXISTS responses_last_access "\
+	+ "ON responses (last_access)"
+_SQL_DELETE_OLDEST = "DELETE FROM responses WHERE url IN "\
+	+ "(SELECT url FROM responses ORDER BY last_access LIMIT ?)"
+_SQL_SELECT = "SELECT headers, content FROM responses WHERE url = ?"
+_SQL_SELECT_SIZE = "SELECT size FROM responses WHERE url = ?"
+_SQL_SUM_SIZES = "SELECT COALESCE(SUM(size), 0) FROM responses"
+_SQL_TOUCH = "UPDATE responses SET last_access = ? WHERE url = ?"
+_SQL_UPSERT = "INSERT OR REPLACE INTO responses "\
+	+ "(url, headers, content, size, last_access) VALUES (?, ?, ?, ?, ?)"
+
+# The number of entries deleted at once when the cache is too large.
+_EVICTION_BATCH = 64
+
+# The number of access times kept in memory before they are written.
+_MAX_PENDING_ACCESSES = 1000
+
+
+class ResponseCache:
+	"""
+	This class stores the content of responses from the GitHub API in an
+	SQLite database file. Each entry is identified by the request's URL and
+	keeps some of the response's headers, like ETag and Last-Modified, which
+	allow to revalidate the entry with a conditional request. When the stored
+	content exceeds the maximum size, the least recently used entries are
+	evicted. To keep reading cheap, the access times are kept in memory and
+	written with the next stored response, every 1000 accesses and when the
+	cache is closed.
+
+	GitHubTransport uses this cache if it is given one. Responses to immutable
+	requests, like a commit identified by its SHA, are then served from the
+	cache without a request. The other cached responses are revalidated, and
+	GitHub does not count the responses to unchanged resources (status 304)
+	against the rate limit.
+
+	This class is thread-safe. Method close releases the database file. This
+	class can also be used as a context manager, which calls close upon exit.
+	"""
+
+	def __init__(self, file_path, max_size=_DEFAULT_MAX_SIZE):
+		"""
+		The constructor opens or creates the cache file.
+
+		Parameters:
+			file_path (str or pathlib.Path): the path to the SQLite database
+				file that contains the cache.
+			max_size (int): the maximum total size in bytes of the cached
+				contents. Defaults to 1 GiB.
+
+		Raises:
+			TypeError: if argument file_path is not of type str or
+				pathlib.Path.
+			ValueError: if argument max_size is less than 1.
+		"""
+		if max_size < 1:
+			raise ValueError("The maximum cache size must be at least 1.")
+
+		self._file_path = ensure_path_is_pathlib(file_path, False)
+		self._max_size = max_size
+		self._lock = Lock()
+
+		self._connection = sqlite3.connect(
+			self._file_path, check_same_thread=False)
+		self._connection.execute("PRAGMA journal_mode=WAL")
+		self._connection.execute(_SQL_CREATE_TABLE)
+		self._connection.execute(_SQL_CREATE_INDEX)
+		self._connection.commit()
+
+		self._size = self._connection.execute(_SQL_SUM_SIZES).fetchone()[0]
+		# Each URL read from the cache is associated with its access time.
+		self._pending_accesses = dict()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def close(self):
+		"""
+		Writes the pending access times, then closes the database file. The
+		cache cannot be used afterwards.
+		"""
+		with self._lock:
+			self._write_accesses()
+			self._connection.commit()
+			self._connection.close()
+
+	def _evict(self):
+		while self._size > self._max_size:
+			self._connection.execute(_SQL_DELETE_OLDEST, (_EVICTION_BATCH,))
+			self._size = self._connection.execute(_SQL_SUM_SIZES).fetchone()[0]
+
+	def get(self, url):
+		"""
+		Provides the cached response to a request.
+
+		Parameters:
+			url (str): the request's URL.
+
+		Returns:
+			tuple: the response's cached headers (dict, index 0) and content
+				(bytes, index 1), None if the response is not cached.
+		"""
+		with self._lock:
+			entry = self._connection.execute(_SQL_SELECT, (url,)).fetchone()
+
+			if entry is None:
+				return None
+
+			self._pending_accesses[url] = time()
+
+			if len(self._pending_accesses) >= _MAX_PENDING_ACCESSES:
+				self._write_accesses()
+				self._connection.commit()
+
+		headers, content = entry
+		return json.loads(headers), content
+
+	def put(self, url, headers, content):
+		"""
+		Stores a response in this cache, then evicts the least recently used
+		entries if the cache exceeds its maximum size.
+
+		Parameters:
+			url (str): the request's URL.
+			headers (dict): the response's headers (str) to keep, identified
+				by their name (str).
+			content (bytes): the response's content.
+		"""
+		size = len(content)
+		headers = json.dumps(headers)
+
+		with self._lock:
+			# The eviction must consider the recent accesses.
+			self._pending_accesses.pop(url, None)
+			self._write_accesses()
+
+			former_entry =\
+				self._connection.execute(_SQL_SELECT_SIZE, (url,)).fetchone()
+			if former_entry is not None:
+				self._size -= former_entry[0]
+
+			self._connection.execute(_SQL_UPSERT,
+				(url, headers, content, size, time()))
+			self._size += size
+
+			self._evict()
+			self._connection.commit()
+
+	def _write_accesses(self):
+		self._connection.executemany(_SQL_TOUCH, ((access_time, url)
+			for url, access_time in self._pending_accesses.items()))
+		self._pending_accesses.clear()
+
+	@property
+	def file_path(self):
+		"""
+		pathlib.Path: the path to the SQLite database file that contains the
+			cache.
+		"""
+		return self._file_path
+
+	@property
+	def max_size(self):
+		"""
+		int: the maximum total size in bytes of the cached contents.
+		"""
+		return self._max_size
+
+	@property
+	def size(self):
+		"""
+		int: the total size in bytes of the cached contents.
+		"""
+		return self._size
+
+
+__all__ = [ResponseCache.__name__]
@@ -37,7 +37,7 @@ def make_arg_parser():
 	parser.add_argument("-c", "--cred-file", type=Path, required=True,
 		help="This file must list GitHub credentials one per line.")
 	parser.add_argument("-w", "--can-wait", action="store_true",
-		help="Wait one hour if request rate exceeded and no token left.")
+		help="Wait for a rate limit reset if no token has requests left.")
 
 	return parser
 
@@ -0,0 +1,45 @@
+from datetime import\
+	datetime
+from pathlib import\
+	Path
+
+# syspathmodif is a dependency of repr_rw.
+from syspathmodif import\
+	sp_append,\
+	sp_remove
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+sp_append(_REPO_ROOT)
+from commitfetch import\
+	Commit,\
+	CommitStore,\
+	GitHubUser,\
+	RepoIdentity
+sp_remove(_REPO_ROOT)
+
+
+_SHA = "0123456789abcdef0123456789abcdef01234567"
+
+
+def _make_commit(full_name, files):
+	return Commit(_SHA, "Fix the parser",
+		RepoIdentity.from_full_name(full_name), datetime(2024, 5, 1, 12, 30),
+		GitHubUser(1, "octocat", "The Octocat"), files)
+
+
+def test_add_commits_same_sha_in_one_batch(tmp_path):
+	commits = [
+		_make_commit("octocat/parser", ("src/parser.py", "README.md")),
+		_make_commit("fork/parser", ("src/parser.py",))
+	]
+
+	with CommitStore(tmp_path / "commits.db") as store:
+		assert store.add_commits(commits) == 2
+		assert len(store) == 1
+
+		stored_commit = store.get_commit(_SHA)
+		assert str(stored_commit.repository) == "fork/parser"
+		assert list(stored_commit.files) == ["src/parser.py"]
+
+		assert len(list(store.find_commits(repository="fork/parser"))) == 1
+		assert len(list(store.find_commits(repository="octocat/parser"))) == 0